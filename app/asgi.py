@@ -0,0 +1,220 @@
+# app/asgi.py
+
+import json
+import asyncio
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable
+
+from usecase import ChatService
+from usecase import build_chat_service
+
+Receive = Callable[[], Awaitable[dict]]
+Send = Callable[[dict], Awaitable[None]]
+
+
+def _json_body(obj: Any) -> bytes:
+    # Flask jsonify 랑 바이트까지 같게 (JSON_AS_ASCII=False, 키 정렬, 끝에 줄바꿈)
+    return (
+        json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        + "\n"
+    ).encode("utf-8")
+
+
+class AsgiApp:
+    """
+    Flask 라우트(app/routes.py)랑 같은 POST / , POST /batch, GET /metrics 를
+    프레임워크 없이 ASGI 로. 처리 흐름은 ChatService 를 그대로 씀.
+    - 이벤트 루프는 본문 읽고 답장 보내기만 하고, DB 를 건드리는 처리는
+      db_workers 개짜리 전용 스레드풀에서 돌림 → 느린 sqlite 쓰기가 있어도
+      새 메시지는 계속 받음
+    - 스레드풀에 걸려 있는 요청이 max_pending 개 넘으면 기다리게 하지 않고 503
+    """
+
+    def __init__(
+        self, service: ChatService, db_workers: int = 4, max_pending: int = 256
+    ) -> None:
+        if db_workers < 1:
+            raise ValueError(f"db_workers must be >= 1, got {db_workers}")
+
+        self.service = service
+        self.max_pending = max_pending
+        self._pending = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=db_workers, thread_name_prefix="asgi-db"
+        )
+
+    async def __call__(self, scope: dict, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        route = (scope["method"], scope["path"])
+        if route == ("POST", "/"):
+            await self._handle_message(scope, receive, send)
+        elif route == ("POST", "/batch"):
+            await self._handle_batch(scope, receive, send)
+        elif route == ("GET", "/metrics"):
+            await self._export_metrics(send)
+        elif scope["path"] in ("/", "/batch", "/metrics"):
+            await self._respond(send, 405, {"error": "method not allowed"})
+        else:
+            await self._respond(send, 404, {"error": "not found"})
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                # 걸려 있는 DB 작업은 끝까지 하고 내려감. 커넥션은 atexit 에서 닫힘
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self._executor.shutdown
+                )
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _respond(
+        self,
+        send: Send,
+        status: int,
+        obj: Any = None,
+        body: bytes | None = None,
+        content_type: bytes = b"application/json",
+    ) -> None:
+        if body is None:
+            body = _json_body(obj)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", content_type),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    def _content_length(scope: dict) -> int | None:
+        for name, value in scope.get("headers", []):
+            if name == b"content-length":
+                try:
+                    return int(value)
+                except ValueError:
+                    return None
+        return None
+
+    async def _read_body(self, receive: Receive, limit: int) -> bytes:
+        """limit 넘으면 거기서 그만 읽음 (limit + 1 바이트 이상이면 너무 큰 것)"""
+        chunks: list[bytes] = []
+        size = 0
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                break
+            chunk = message.get("body", b"")
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > limit or not message.get("more_body", False):
+                break
+        return b"".join(chunks)
+
+    async def _offload(self, fn: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        self._pending += 1
+        try:
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            self._pending -= 1
+
+    async def _busy(self, send: Send) -> bool:
+        if self._pending < self.max_pending:
+            return False
+        self.service.metrics.inc("busy_rejections_total")
+        await self._respond(send, 503, {"error": "server busy, retry later"})
+        return True
+
+    async def _read_limited(
+        self, scope: dict, receive: Receive, send: Send
+    ) -> bytes | None:
+        # 본문 읽기 전에 Content-Length 로 먼저 거르고, 없어도 max_bytes 까지만 읽음
+        max_bytes = self.service.batch_max_bytes
+        length = self._content_length(scope)
+        if length is None or length <= max_bytes:
+            body = await self._read_body(receive, max_bytes)
+            if len(body) <= max_bytes:
+                return body
+
+        status, error = self.service.too_large()
+        await self._respond(send, status, error)
+        return None
+
+    async def _handle_message(self, scope: dict, receive: Receive, send: Send) -> None:
+        body = await self._read_limited(scope, receive, send)
+        if body is None or await self._busy(send):
+            return
+
+        # Flask 의 get_json(force=True, silent=True) or {} 처럼
+        try:
+            data = json.loads(body) or {}
+        except ValueError:
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+
+        reply = await self._offload(self.service.reply, data)
+        await self._respond(send, 200, reply)
+
+    async def _handle_batch(self, scope: dict, receive: Receive, send: Send) -> None:
+        body = await self._read_limited(scope, receive, send)
+        if body is None:
+            return
+
+        data, rejected = self.service.parse_batch(body)
+        if rejected is not None:
+            status, error = rejected
+            await self._respond(send, status, error)
+            return
+        if await self._busy(send):
+            return
+
+        replies = await self._offload(self.service.reply_many, data)
+        await self._respond(send, 200, replies)
+
+    async def _export_metrics(self, send: Send) -> None:
+        self.service.metrics.set_gauge("asgi_pending_requests", self._pending)
+        text = self.service.metrics_text()
+        if text is None:
+            await self._respond(
+                send, 404, body=b"metrics disabled\n", content_type=b"text/plain"
+            )
+            return
+        await self._respond(
+            send,
+            200,
+            body=text.encode("utf-8"),
+            content_type=b"text/plain; version=0.0.4",
+        )
+
+
+def create_asgi_app(settings=None, prefork: bool = False) -> AsgiApp:
+    """
+    create_flask_app 의 ASGI 판. settings 는 똑같고, 추가로
+    - ASGI_DB_WORKERS: DB 작업 돌릴 스레드 수 (기본 DB_POOL_SIZE)
+    - ASGI_MAX_PENDING: 스레드풀에 걸어둘 수 있는 최대 요청 수, 넘으면 503 (기본 256)
+    """
+    if settings is None:
+        import config as settings
+
+    service = build_chat_service(settings, prefork=prefork)
+    return AsgiApp(
+        service,
+        db_workers=getattr(
+            settings, "ASGI_DB_WORKERS", getattr(settings, "DB_POOL_SIZE", 4)
+        ),
+        max_pending=getattr(settings, "ASGI_MAX_PENDING", 256),
+    )
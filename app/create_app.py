@@ -1,45 +1,28 @@
-import logging
-
 from flask import Flask
 
-from config import DB_PATH, TOTAL_DAYS, START_DATE
-
-from db import Repository
-
 from .routes import init_app
 
-from usecase import Formatter
-from usecase import MessageHandler
-from usecase import MessageClassifier
+from usecase import build_chat_service
 
-from utilities import DayParser
-from utilities import AbsoluteDayCounter
 
+def create_flask_app(settings=None, prefork: bool = False):
+    """
+    settings: DB_PATH, START_DATE, TOTAL_DAYS 같은 값을 속성으로 가진 객체.
+    안 넘기면 config.py. 벤치마크/테스트에선 SimpleNamespace 를 넘김.
+    prefork: gunicorn 워커처럼 여러 프로세스가 같은 DB 를 쓸 때 (wsgi.py 가 켬).
+    만드는 건 전부 build_chat_service 가 함 (ASGI 앱이랑 같이 씀).
+    """
+    service = build_chat_service(settings, prefork=prefork)
 
-def create_flask_app():
     app = Flask(__name__)
     app.config["JSON_AS_ASCII"] = False
 
-    clock = AbsoluteDayCounter(start_date=START_DATE, tz_offset_hours=3)
-
-    repo = Repository(
-        db_path=DB_PATH,
-        day_counter=clock,
-        total_days=TOTAL_DAYS,
-        logger_stream=True,
-        logging_level=logging.WARNING,
-    )
-
-    handler = MessageHandler(repo, clock)
-
-    parser = DayParser()
-    classifer = MessageClassifier(parser)
-
-    formatter = Formatter()
-
-    app.config["CLASSIFIER"] = classifer
-    app.config["HANDLER"] = handler
-    app.config["FORMATTER"] = formatter
+    app.config["SERVICE"] = service
+    app.config["CLASSIFIER"] = service.classifier
+    app.config["HANDLER"] = service.handler
+    app.config["FORMATTER"] = service.formatter
+    app.config["METRICS"] = service.metrics
+    app.config["DEDUPLICATOR"] = service.dedup
 
     init_app(app)
 
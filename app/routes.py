@@ -1,29 +1,46 @@
-from flask import request, jsonify, current_app
+from flask import Response, request, jsonify, current_app
 
-from usecase import Formatter
-from usecase import MessageHandler
-from usecase import MessageClassifier
+from usecase import ChatService
 
 
 def init_app(app):
     @app.route("/", methods=["POST"])
     def handle_message():
         data = request.get_json(force=True, silent=True) or {}
-
-        classifier: MessageClassifier = current_app.config["CLASSIFIER"]
-        handler: MessageHandler = current_app.config["HANDLER"]
-        formatter: Formatter = current_app.config["FORMATTER"]
-
-        message = classifier.classify(data)
-
-        progress = handler.handle_message(message)
-
-        reply: dict[str, list[str]]
-
-        if isinstance(progress, list):
-            reply = formatter.send_to_kakao_api_all_senders(progress)
-        else:
-            reply = formatter.send_to_kakao_api_one_sender(progress)
+        service: ChatService = current_app.config["SERVICE"]
 
         # Kakao / 외부 API가 원하는 형식으로 응답
-        return jsonify(reply)
+        return jsonify(service.reply(data))
+
+    @app.route("/batch", methods=["POST"])
+    def handle_batch():
+        """
+        [{"sender": ..., "msg": ...}, ...] 를 받아서 한 번에 처리하고
+        같은 순서로 [reply, ...] 를 돌려줌. 기록은 트랜잭션 하나로 들어감
+        (중간에 명령이 있으면 그 앞에서 한 번 끊김).
+        """
+        service: ChatService = current_app.config["SERVICE"]
+        max_bytes = service.batch_max_bytes
+
+        # 본문 읽기 전에 Content-Length 로 먼저 거름
+        if request.content_length is not None and request.content_length > max_bytes:
+            status, error = service.too_large()
+            return jsonify(error), status
+
+        # Content-Length 없이 들어와도 max_bytes 까지만 읽음
+        data, rejected = service.parse_batch(request.stream.read(max_bytes + 1))
+        if rejected is not None:
+            status, error = rejected
+            return jsonify(error), status
+
+        return jsonify(service.reply_many(data))
+
+    @app.route("/metrics", methods=["GET"])
+    def export_metrics():
+        """Prometheus text. METRICS_ENABLED=False 면 404"""
+        service: ChatService = current_app.config["SERVICE"]
+        text = service.metrics_text()
+        if text is None:
+            return Response("metrics disabled\n", status=404, mimetype="text/plain")
+
+        return Response(text, mimetype="text/plain; version=0.0.4")
@@ -0,0 +1,17 @@
+# asgi.py
+"""
+비동기 서버용 ASGI 진입점. 답장 형식은 wsgi.py (Flask) 랑 같음.
+
+    uvicorn asgi:app --port 5000
+    gunicorn -c gunicorn.conf.py -k uvicorn.workers.UvicornWorker asgi:app
+
+gunicorn 으로 띄우면 gunicorn.conf.py 가 BIBLE_PREFORK=1 을 켜고 마이그레이션도
+master 에서 한 번 돌림. uvicorn --workers 로 여러 개 띄울 거면
+python -m db.maintenance migrate 먼저 돌리고 BIBLE_PREFORK=1 을 직접 켤 것.
+"""
+
+import os
+
+from app.asgi import create_asgi_app
+
+app = create_asgi_app(prefork=os.environ.get("BIBLE_PREFORK") == "1")
@@ -0,0 +1,89 @@
+# benchmarks/bench_batch.py
+"""
+기록 메시지 여러 개: classify + handle_message 하나씩 vs classify_many + handle_many.
+
+    python -m benchmarks.bench_batch [--n 2000] [--batch 1 10 100 1000]
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from db import Repository
+
+from usecase import MessageHandler
+from usecase import MessageClassifier
+
+from utilities import DayParser
+
+from .common import FixedClock, fresh_db, print_table
+from .corpus import chat_messages
+
+
+def _handler(path: str) -> MessageHandler:
+    clock = FixedClock(300)
+    repo = Repository(
+        fresh_db(path),
+        day_counter=clock,
+        logging_level=logging.ERROR,
+        storage_profile="wal",
+    )
+    return MessageHandler(repo, clock)
+
+
+def run(n: int = 2000, batches: list[int] = [1, 10, 100, 1000]) -> list[dict]:
+    classifier = MessageClassifier(DayParser())
+    # 기록 메시지만 (명령이 끼면 그 앞에서 batch 가 끊김)
+    raws = [m for m in chat_messages(n * 10) if classifier.parser.parse(m["msg"])][:n]
+    results = []
+
+    with tempfile.TemporaryDirectory() as workdir:
+        handler = _handler(os.path.join(workdir, "single.db"))
+        start = time.perf_counter()
+        for raw in raws:
+            handler.handle_message(classifier.classify(raw))
+        single = time.perf_counter() - start
+        handler.repo.close()
+
+        for size in batches:
+            handler = _handler(os.path.join(workdir, f"batch_{size}.db"))
+            start = time.perf_counter()
+            for i in range(0, len(raws), size):
+                handler.handle_many(classifier.classify_many(raws[i : i + size]))
+            elapsed = time.perf_counter() - start
+            handler.repo.close()
+
+            results.append(
+                {
+                    "messages": len(raws),
+                    "batch": size,
+                    "one_by_one_msg_per_s": round(len(raws) / single),
+                    "handle_many_msg_per_s": round(len(raws) / elapsed),
+                    "speedup": round(single / elapsed, 2),
+                }
+            )
+    return results
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=2000)
+    ap.add_argument("--batch", type=int, nargs="+", default=[1, 10, 100, 1000])
+    args = ap.parse_args()
+
+    print_table(
+        run(args.n, args.batch),
+        [
+            "messages",
+            "batch",
+            "one_by_one_msg_per_s",
+            "handle_many_msg_per_s",
+            "speedup",
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# benchmarks/bench_day_parser.py
+"""
+DayParser.parse: 기본 룰 4개를 순서대로 돌리는 예전 방식 vs 빠른 경로 vs 빠른 경로 + 캐시.
+
+    python -m benchmarks.bench_day_parser [--n 20000]
+"""
+
+import argparse
+import time
+
+from utilities import DayParser
+
+from .common import print_table
+from .corpus import chat_messages
+
+
+def _throughput(parser: DayParser, texts: list[str], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            parser.parse(text)
+        best = min(best, time.perf_counter() - start)
+    return len(texts) / best
+
+
+def run(n: int = 20000) -> list[dict]:
+    texts = [m["msg"] for m in chat_messages(n)]
+    records = [t for t in texts if DayParser().parse(t)]
+    chatter = [t for t in texts if not DayParser().parse(t)]
+
+    legacy = DayParser(rules=DayParser._default_rules())
+    fast = DayParser()
+
+    results = []
+    for name, corpus in (("mixed", texts), ("records", records), ("chatter", chatter)):
+        before = _throughput(legacy, corpus)
+        after = _throughput(fast, corpus)
+        # 첫 바퀴에 캐시가 차고 나머지 바퀴는 거의 다 hit
+        cached = _throughput(DayParser(cache_size=1024), corpus)
+        results.append(
+            {
+                "corpus": name,
+                "messages": len(corpus),
+                "rule_chain_msg_per_s": round(before),
+                "fast_path_msg_per_s": round(after),
+                "speedup": round(after / before, 2),
+                "cached_msg_per_s": round(cached),
+            }
+        )
+    return results
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=20000)
+    args = ap.parse_args()
+
+    print_table(
+        run(args.n),
+        [
+            "corpus",
+            "messages",
+            "rule_chain_msg_per_s",
+            "fast_path_msg_per_s",
+            "speedup",
+            "cached_msg_per_s",
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
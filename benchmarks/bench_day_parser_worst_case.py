@@ -0,0 +1,96 @@
+# benchmarks/bench_day_parser_worst_case.py
+"""
+DayParser 최악 입력: 숫자/쉼표만 잔뜩 붙여넣은 줄 뒤에 완료가 오는 메시지 같은 거.
+예전 mixed 정규식(lazy *?)은 길이에 세제곱으로 늘어나서 작은 n 까지만 돌림.
+
+    python -m benchmarks.bench_day_parser_worst_case [--sizes 50,100,200,400]
+"""
+
+import argparse
+import re
+import time
+
+from utilities import DayParser
+
+from .common import print_table
+
+# 예전 기본 룰의 mixed_days_complete 그대로
+LEGACY_MIXED = re.compile(
+    r"((?:\d+(?:\s*[-~]\s*\d+)?)(?:\s*,\s*\d+(?:\s*[-~]\s*\d+)?)*?)"
+    r"(?:\s*일차)?(?:[^\n\r]*?)(?:완료|클리어)"
+)
+# 이보다 오래 걸리면 그 뒤 크기는 안 돌림
+LEGACY_BUDGET = 2.0
+
+INPUTS = {
+    "comma_flood": lambda n: "1," * n + "x\n3일차 완료",
+    "digit_space_flood": lambda n: "1 " * n + "x\n3일차 완료",
+    "scripture_paste": lambda n: "창 1:1, 2, 3 " * n + "\n완료",
+    "long_record": lambda n: "1," * n + "일차 완료",
+}
+
+
+def _best(fn, text: str, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes: list[int]) -> list[dict]:
+    parser = DayParser()
+    results = []
+    for name, make in INPUTS.items():
+        legacy_prev = fast_prev = None
+        legacy_skip = False
+        for n in sizes:
+            text = make(n)
+            fast = _best(parser.parse, text)
+
+            legacy = None
+            if not legacy_skip:
+                legacy = _best(LEGACY_MIXED.search, text, repeat=1)
+                legacy_skip = legacy > LEGACY_BUDGET
+
+            results.append(
+                {
+                    "input": name,
+                    "n": n,
+                    "chars": len(text),
+                    "legacy_us": "-" if legacy is None else round(legacy * 1e6),
+                    "legacy_growth": (
+                        round(legacy / legacy_prev, 1)
+                        if legacy is not None and legacy_prev
+                        else "-"
+                    ),
+                    "fast_us": round(fast * 1e6, 1),
+                    "fast_growth": round(fast / fast_prev, 1) if fast_prev else "-",
+                }
+            )
+            legacy_prev, fast_prev = legacy, fast
+    return results
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--sizes", default="50,100,200,400")
+    args = ap.parse_args()
+
+    print_table(
+        run([int(s) for s in args.sizes.split(",")]),
+        [
+            "input",
+            "n",
+            "chars",
+            "legacy_us",
+            "legacy_growth",
+            "fast_us",
+            "fast_growth",
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
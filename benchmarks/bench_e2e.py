@@ -0,0 +1,82 @@
+# benchmarks/bench_e2e.py
+"""
+Flask test client 로 POST / 전체 경로 (classify -> handle -> format -> jsonify).
+네트워크는 안 타고 WSGI 까지만.
+
+    python -m benchmarks.bench_e2e [--senders 100] [--n 500]
+"""
+
+import argparse
+import os
+import tempfile
+
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from .common import fresh_db, measure, print_table
+from .corpus import CHATTER
+
+PLAN_DAYS = 365
+
+
+def make_app(db_path: str, **overrides):
+    # Flask 가 없는 환경에서도 run_all 이 import 는 되게 여기서 import
+    from app import create_flask_app
+
+    settings = SimpleNamespace(
+        DB_PATH=fresh_db(db_path),
+        # 오늘이 PLAN_DAYS 일차가 되게
+        START_DATE=date.today() - timedelta(days=PLAN_DAYS - 1),
+        TOTAL_DAYS=PLAN_DAYS,
+        LOG_LEVELS={"db": "ERROR", "msg_handler": "ERROR", "classifier": "ERROR"},
+        **overrides,
+    )
+    return create_flask_app(settings)
+
+
+def run(senders: int = 100, n: int = 500) -> list[dict]:
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        app = make_app(os.path.join(workdir, "e2e.db"))
+        client = app.test_client()
+
+        def post(sender: str, msg: str):
+            return client.post("/", json={"sender": sender, "msg": msg})
+
+        # 다들 1..100 일차까지는 읽은 상태
+        for s in range(senders):
+            post(f"s{s}", "1-100일차 완료")
+
+        scenarios = {
+            "record": lambda i: post(f"s{i % senders}", f"{101 + i // senders}일차 완료"),
+            "chatter": lambda i: post(f"s{i % senders}", CHATTER[i % len(CHATTER)]),
+            "progress_one": lambda i: post(f"s{i % senders}", "/진행상황"),
+            "progress_all": lambda i: post(f"s{i % senders}", "/집계"),
+        }
+        for name, fn in scenarios.items():
+            count = n if name != "progress_all" else max(10, n // 10)
+            results.append({"request": name, "senders": senders, **measure(fn, count)})
+
+        batch = [
+            {"sender": f"s{i % senders}", "msg": CHATTER[i % len(CHATTER)]}
+            for i in range(100)
+        ]
+        stats = measure(lambda i: client.post("/batch", json=batch), max(10, n // 10))
+        results.append({"request": "batch_100_chatter", "senders": senders, **stats})
+    return results
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--senders", type=int, default=100)
+    ap.add_argument("--n", type=int, default=500)
+    args = ap.parse_args()
+
+    print_table(
+        run(args.senders, args.n),
+        ["request", "senders", "n", "mean_us", "p50_us", "p95_us", "max_us"],
+    )
+
+
+if __name__ == "__main__":
+    main()
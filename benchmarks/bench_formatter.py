@@ -0,0 +1,78 @@
+# benchmarks/bench_formatter.py
+"""
+Formatter: /집계 답장 (sender 수별) 이랑 빠진 일차가 많은 /진행상황 답장.
+
+    python -m benchmarks.bench_formatter [--senders 10 100 1000 10000] [--n 200]
+"""
+
+import argparse
+import random
+
+from entities import ProgressSummary
+
+from usecase import Formatter
+
+from utilities import compress_spans, spans_of
+
+from .common import measure, print_table
+
+PLAN_DAYS = 365
+
+
+def _summaries(senders: int) -> list[ProgressSummary]:
+    rng = random.Random(senders)
+    return [
+        ProgressSummary(f"sender{s}", rng.randint(0, PLAN_DAYS), PLAN_DAYS, [])
+        for s in range(senders)
+    ]
+
+
+def _one_sender(missing_ratio: float, precomputed: bool) -> ProgressSummary:
+    rng = random.Random(1)
+    missing = [d for d in range(1, PLAN_DAYS + 1) if rng.random() < missing_ratio]
+    return ProgressSummary(
+        "sender",
+        PLAN_DAYS - len(missing),
+        PLAN_DAYS,
+        missing,
+        missing_ranges=compress_spans(spans_of(missing)) if precomputed else None,
+    )
+
+
+def run(senders: list[int] = [10, 100, 1000, 10000], n: int = 200) -> list[dict]:
+    formatter = Formatter()
+    results = []
+
+    for count in senders:
+        summaries = _summaries(count)
+        stats = measure(lambda i: formatter.send_to_kakao_api(summaries), n)
+        results.append({"reply": "all_senders", "size": count, **stats})
+
+    for ratio in (0.1, 0.5):
+        for precomputed in (False, True):
+            summary = _one_sender(ratio, precomputed)
+            stats = measure(lambda i: formatter.send_to_kakao_api(summary), n)
+            results.append(
+                {
+                    "reply": "one_sender" + ("_ranges" if precomputed else ""),
+                    "size": len(summary.missing_days),
+                    **stats,
+                }
+            )
+    return results
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--senders", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    ap.add_argument("--n", type=int, default=200)
+    args = ap.parse_args()
+
+    print_table(
+        run(args.senders, args.n),
+        ["reply", "size", "n", "mean_us", "p50_us", "p95_us", "max_us"],
+    )
+
+
+if __name__ == "__main__":
+    main()
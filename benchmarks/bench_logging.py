@@ -0,0 +1,86 @@
+# benchmarks/bench_logging.py
+"""
+로그 한 줄 찍는 데 요청 스레드가 쓰는 시간: 예전 FileHandler(+StreamHandler) 직접
+vs QueueHandler (파일/콘솔은 listener 스레드).
+
+    python -m benchmarks.bench_logging [--n 20000] [--stream]
+"""
+
+import io
+import logging
+import argparse
+import tempfile
+import contextlib
+
+from utilities import configure_logging, set_logger, shutdown_logging
+
+from .common import measure, print_table
+
+_FORMAT = "%(asctime)s\t%(levelname)-8s\t%(name)-12s\t%(message)s"
+
+
+def _legacy_logger(path: str, stream: bool) -> logging.Logger:
+    logger = logging.getLogger("bench_legacy")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    handler = logging.FileHandler(path, encoding="utf-8")
+    handler.setFormatter(logging.Formatter(_FORMAT))
+    logger.addHandler(handler)
+    if stream:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter("[STDOUT] " + _FORMAT))
+        logger.addHandler(stream_handler)
+    return logger
+
+
+def run(n: int = 20000, stream: bool = False) -> list[dict]:
+    message = "The message failed to parse, message = {%s}"
+    results = []
+
+    # 콘솔 출력은 버려서 터미널 속도는 안 잼
+    with tempfile.TemporaryDirectory() as workdir, contextlib.redirect_stderr(
+        io.StringIO()
+    ):
+        legacy = _legacy_logger(f"{workdir}/legacy.log", stream)
+        results.append(
+            {"logger": "file_handler", **measure(lambda i: legacy.debug(message, i), n)}
+        )
+        for handler in list(legacy.handlers):
+            handler.close()
+            legacy.removeHandler(handler)
+
+        configure_logging(log_dir=workdir)
+        queued = set_logger("bench_queued", s=stream, level=logging.DEBUG)
+        results.append(
+            {
+                "logger": "queue_handler",
+                **measure(lambda i: queued.debug(message, i), n),
+            }
+        )
+
+        configure_logging(sample_rates={"bench_sampled": 0.01})
+        sampled = set_logger("bench_sampled", s=stream, level=logging.DEBUG)
+        results.append(
+            {
+                "logger": "queue_handler_1%",
+                **measure(lambda i: sampled.debug(message, i), n),
+            }
+        )
+        shutdown_logging()
+    return results
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=20000)
+    ap.add_argument("--stream", action="store_true")
+    args = ap.parse_args()
+
+    print_table(
+        run(args.n, args.stream),
+        ["logger", "n", "mean_us", "p50_us", "p95_us", "max_us"],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# benchmarks/bench_missing_days.py
+"""
+/진행상황 의 빠진 일차 계산: 예전 reading_plan LEFT JOIN 쿼리 vs
+완료 일차 한 번 읽고 sorted-merge 하는 지금 방식.
+
+    python -m benchmarks.bench_missing_days [--plans 365 1000 10000] [--senders 200]
+"""
+
+import argparse
+import logging
+import os
+import random
+import tempfile
+
+from db import Repository
+from db.senders import get_or_create_sender
+
+from usecase import Formatter
+
+from .common import FixedClock, fresh_db, measure, print_table
+
+LEGACY_COUNT_SQL = """
+    SELECT COUNT(*) as completed
+    FROM progress
+    WHERE sender_id = ?
+"""
+
+LEGACY_MISSING_SQL = """
+    SELECT r.day
+    FROM reading_plan AS r
+    LEFT JOIN progress as p
+    ON p.sender_id = ?
+    AND r.day = p.day
+    WHERE r.day <= ?
+    AND p.day IS NULL
+    ORDER BY r.day
+"""
+
+
+def build(path: str, plan: int, senders: int, done_ratio: float) -> Repository:
+    repo = Repository(
+        fresh_db(path),
+        day_counter=FixedClock(plan),
+        total_days=plan,
+        logging_level=logging.ERROR,
+        # 캐시 켜두면 같은 sender 를 다시 읽을 때 merge 가 아니라 LRU 를 재게 됨
+        cache_size=0,
+    )
+    rng = random.Random(plan)
+    with repo._get_connection() as conn:
+        # reading_plan 은 이제 안 채우니까 예전 쿼리용으로 여기서 채움
+        conn.executemany(
+            "INSERT OR IGNORE INTO reading_plan(day) VALUES (?)",
+            [(d,) for d in range(1, plan + 1)],
+        )
+        for s in range(senders):
+            sender_id = get_or_create_sender(conn.cursor(), f"s{s}")
+            days = [d for d in range(1, plan + 1) if rng.random() < done_ratio]
+            conn.executemany(
+                "INSERT INTO progress(sender_id, day) VALUES (?,?)",
+                [(sender_id, d) for d in days],
+            )
+    return repo
+
+
+def legacy_get_progress(repo: Repository, formatter: Formatter, sender: str) -> None:
+    sender = repo.sender_id(sender)
+    with repo._get_connection() as conn:
+        conn.execute(LEGACY_COUNT_SQL, (sender,)).fetchone()
+        max_day = repo.day_counter.current_day()
+        missing = [
+            int(r["day"])
+            for r in conn.execute(LEGACY_MISSING_SQL, (sender, max_day)).fetchall()
+        ]
+    formatter._compress_day_list(missing)
+
+
+def run(
+    plans: list[int], senders: int = 200, n: int = 200, done_ratio: float = 0.9
+) -> list[dict]:
+    formatter = Formatter()
+    results = []
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for plan in plans:
+            repo = build(
+                os.path.join(workdir, f"plan_{plan}.db"), plan, senders, done_ratio
+            )
+
+            legacy = measure(
+                lambda i: legacy_get_progress(repo, formatter, f"s{i % senders}"), n
+            )
+            current = measure(lambda i: repo.get_progress(f"s{i % senders}"), n)
+            repo.close()
+
+            results.append(
+                {
+                    "plan_days": plan,
+                    "senders": senders,
+                    "legacy_p50_us": legacy["p50_us"],
+                    "legacy_p95_us": legacy["p95_us"],
+                    "merge_p50_us": current["p50_us"],
+                    "merge_p95_us": current["p95_us"],
+                    "speedup": round(legacy["p50_us"] / current["p50_us"], 2),
+                }
+            )
+    return results
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--plans", type=int, nargs="+", default=[365, 1000, 10000])
+    ap.add_argument("--senders", type=int, default=200)
+    ap.add_argument("--n", type=int, default=200)
+    args = ap.parse_args()
+
+    print_table(
+        run(args.plans, args.senders, args.n),
+        [
+            "plan_days",
+            "senders",
+            "legacy_p50_us",
+            "legacy_p95_us",
+            "merge_p50_us",
+            "merge_p95_us",
+            "speedup",
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
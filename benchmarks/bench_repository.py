@@ -0,0 +1,98 @@
+# benchmarks/bench_repository.py
+"""
+Repository.post_progress / get_progress / get_all_progresses latency,
+sender 수(10 ~ 10000)별로. sender 마다 앞쪽 일차를 대충 채워둔 DB 에서 잼.
+get_progress 는 캐시 끈 쿼리 경로, get_progress_cached 는 /진행상황 캐시 켠 것.
+
+    python -m benchmarks.bench_repository [--senders 10 100 1000 10000] [--n 500]
+"""
+
+import argparse
+import logging
+import os
+import random
+import tempfile
+
+from db import Repository
+
+from .common import FixedClock, fresh_db, measure, print_table
+
+PLAN_DAYS = 365
+
+
+def _open(path: str, layout: str, cache_size: int) -> Repository:
+    return Repository(
+        path,
+        day_counter=FixedClock(PLAN_DAYS),
+        total_days=PLAN_DAYS,
+        logging_level=logging.ERROR,
+        storage_profile="wal",
+        storage_layout=layout,
+        cache_size=cache_size,
+    )
+
+
+def build(path: str, senders: int, layout: str = "rows") -> Repository:
+    # sender 10 명이면 읽기가 전부 캐시 hit 이라 쿼리를 못 잼. 여기선 캐시 끔
+    repo = _open(fresh_db(path), layout, cache_size=0)
+    rng = random.Random(senders)
+    # 다들 200일 전후까지 읽고 중간중간 빠짐
+    records = []
+    for s in range(senders):
+        last = rng.randint(150, 250)
+        days = [d for d in range(1, last + 1) if rng.random() < 0.9]
+        records.append((f"s{s}", "완료", days))
+    for i in range(0, len(records), 500):
+        repo.post_progress_batch(records[i : i + 500])
+    return repo
+
+
+def run(
+    senders: list[int] = [10, 100, 1000, 10000], n: int = 500, layout: str = "rows"
+) -> list[dict]:
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for count in senders:
+            path = os.path.join(workdir, f"repo_{count}.db")
+            repo = build(path, count, layout)
+
+            # 아직 안 채운 300일차 이후만 써서 매번 새 기록
+            write = measure(
+                lambda i: repo.post_progress(f"s{i % count}", "완료", 300 + i // count),
+                n,
+            )
+            read = measure(lambda i: repo.get_progress(f"s{(i * 7) % count}"), n)
+            read_all = measure(lambda i: repo.get_all_progresses(), max(5, n // 50))
+            repo.close()
+
+            cached_repo = _open(path, layout, cache_size=1024)
+            cached = measure(
+                lambda i: cached_repo.get_progress(f"s{(i * 7) % count}"), n
+            )
+            cached_repo.close()
+
+            for op, stats in (
+                ("post_progress", write),
+                ("get_progress", read),
+                ("get_progress_cached", cached),
+                ("get_all_progresses", read_all),
+            ):
+                results.append({"senders": count, "layout": layout, "op": op, **stats})
+    return results
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--senders", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    ap.add_argument("--n", type=int, default=500)
+    ap.add_argument("--layout", choices=["rows", "bitmap"], default="rows")
+    args = ap.parse_args()
+
+    print_table(
+        run(args.senders, args.n, args.layout),
+        ["senders", "layout", "op", "n", "mean_us", "p50_us", "p95_us", "max_us"],
+    )
+
+
+if __name__ == "__main__":
+    main()
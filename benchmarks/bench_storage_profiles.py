@@ -0,0 +1,126 @@
+# benchmarks/bench_storage_profiles.py
+"""
+StorageProfile 별로 post_progress / get_progress latency 랑
+/집계(get_all_progresses) 읽기가 도는 동안의 쓰기 처리량을 잼.
+
+    python -m benchmarks.bench_storage_profiles [--n 2000] [--seconds 2]
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from db import PROFILES, Repository
+
+from entities import Errors
+
+from .common import FixedClock, fresh_db, measure, print_table
+
+SENDERS = 50
+
+
+def _open(path: str, profile: str, days: int) -> Repository:
+    return Repository(
+        fresh_db(path),
+        day_counter=FixedClock(days),
+        total_days=days,
+        logging_level=logging.ERROR,
+        storage_profile=profile,
+    )
+
+
+def bench_latency(profile: str, workdir: str, n: int) -> dict:
+    days = n // SENDERS + 1
+    repo = _open(os.path.join(workdir, f"latency_{profile}.db"), profile, days)
+
+    write = measure(
+        lambda i: repo.post_progress(f"s{i % SENDERS}", "완료", i // SENDERS + 1), n
+    )
+    read = measure(lambda i: repo.get_progress(f"s{i % SENDERS}"), n)
+    repo.close()
+
+    return {
+        "profile": profile,
+        "write_p50_us": write["p50_us"],
+        "write_p95_us": write["p95_us"],
+        "read_p50_us": read["p50_us"],
+        "read_p95_us": read["p95_us"],
+    }
+
+
+def bench_mixed(profile: str, workdir: str, seconds: float) -> dict:
+    """
+    읽기 스레드가 /집계 를 계속 돌리는 동안 쓰기 스레드가 얼마나 기록하는지.
+    """
+    repo = _open(os.path.join(workdir, f"mixed_{profile}.db"), profile, 100_000)
+    stop = threading.Event()
+    counts = {"writes": 0, "write_fail": 0, "reads": 0}
+
+    def writer() -> None:
+        i = 0
+        while not stop.is_set():
+            status = repo.post_progress(f"s{i % SENDERS}", "완료", i // SENDERS + 1)
+            if status == Errors.SUCCESS:
+                counts["writes"] += 1
+            else:
+                counts["write_fail"] += 1
+            i += 1
+
+    def reader() -> None:
+        while not stop.is_set():
+            repo.get_all_progresses()
+            counts["reads"] += 1
+
+    threads = [threading.Thread(target=writer), threading.Thread(target=reader)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    repo.close()
+
+    return {
+        "profile": profile,
+        "writes_per_s": round(counts["writes"] / seconds),
+        "reads_per_s": round(counts["reads"] / seconds),
+        "write_fail": counts["write_fail"],
+    }
+
+
+def run(n: int = 2000, seconds: float = 2.0) -> list[dict]:
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for profile in PROFILES:
+            row = bench_latency(profile, workdir, n)
+            row.update(bench_mixed(profile, workdir, seconds))
+            results.append(row)
+    return results
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=2000)
+    ap.add_argument("--seconds", type=float, default=2.0)
+    args = ap.parse_args()
+
+    print_table(
+        run(args.n, args.seconds),
+        [
+            "profile",
+            "write_p50_us",
+            "write_p95_us",
+            "read_p50_us",
+            "read_p95_us",
+            "writes_per_s",
+            "reads_per_s",
+            "write_fail",
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# benchmarks/common.py
+
+import os
+import glob
+import time
+import statistics
+from typing import Callable, Iterable
+
+
+class FixedClock:
+    """
+    벤치마크용 day counter. tests 의 MockClock 이랑 같은 모양.
+    """
+
+    def __init__(self, day: int) -> None:
+        self._day = day
+
+    def current_day(self) -> int:
+        return self._day
+
+
+def fresh_db(path: str) -> str:
+    """
+    path 에 있는 DB (와 -wal, -shm) 를 지우고 경로를 그대로 돌려줌.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    for f in glob.glob(path + "*"):
+        os.remove(f)
+    return path
+
+
+def measure(fn: Callable[[int], object], n: int) -> dict[str, float]:
+    """
+    fn(i) 를 n 번 호출해서 호출 하나당 latency 통계(마이크로초)를 돌려줌.
+    """
+    samples = []
+    for i in range(n):
+        start = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - start) * 1e6)
+
+    samples.sort()
+    return {
+        "n": n,
+        "mean_us": round(statistics.fmean(samples), 2),
+        "p50_us": round(samples[len(samples) // 2], 2),
+        "p95_us": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 2),
+        "max_us": round(samples[-1], 2),
+    }
+
+
+def print_table(rows: Iterable[dict], columns: list[str]) -> None:
+    rows = list(rows)
+    widths = {
+        c: max([len(c)] + [len(str(r.get(c, ""))) for r in rows]) for c in columns
+    }
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    print("  ".join("-" * widths[c] for c in columns))
+    for r in rows:
+        print("  ".join(str(r.get(c, "")).ljust(widths[c]) for c in columns))
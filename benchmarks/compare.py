@@ -0,0 +1,97 @@
+# benchmarks/compare.py
+"""
+run_all 결과 JSON 두 개를 비교. 같은 suite 의 같은 줄(숫자 아닌 칸들이 같은 줄)끼리
+*_us 는 작을수록, *_per_s 는 클수록 좋은 걸로 보고 변화율을 보여줌.
+
+    python -m benchmarks.compare results/old.json results/new.json
+    python -m benchmarks.compare old.json new.json --threshold 0.2
+    (--threshold 0.2: 20% 넘게 나빠진 줄이 있으면 exit 1)
+"""
+
+import argparse
+import json
+
+from .common import print_table
+
+# 줄 맞출 때 안 보는 칸 (측정값)
+_MEASURED_SUFFIXES = ("_us", "_per_s", "_growth", "speedup", "seconds")
+
+
+def _key(row: dict) -> tuple:
+    return tuple(
+        (k, v)
+        for k, v in sorted(row.items())
+        if not k.endswith(_MEASURED_SUFFIXES) and k != "n"
+    )
+
+
+def compare(old: dict, new: dict) -> list[dict]:
+    out = []
+    for suite, new_suite in new["suites"].items():
+        old_rows = {_key(r): r for r in old["suites"].get(suite, {}).get("rows", [])}
+        for row in new_suite.get("rows", []):
+            before = old_rows.get(_key(row))
+            if before is None:
+                continue
+            label = " ".join(f"{v}" for _, v in _key(row))
+            for field, value in row.items():
+                if not isinstance(value, (int, float)):
+                    continue
+                if field.endswith("_us"):
+                    lower_is_better = True
+                elif field.endswith("_per_s"):
+                    lower_is_better = False
+                else:
+                    continue
+                old_value = before.get(field)
+                if not isinstance(old_value, (int, float)) or not old_value:
+                    continue
+                change = (value - old_value) / old_value
+                worse = change if lower_is_better else -change
+                out.append(
+                    {
+                        "suite": suite,
+                        "row": label,
+                        "field": field,
+                        "old": old_value,
+                        "new": value,
+                        "change": f"{change:+.1%}",
+                        "regression": round(worse, 3),
+                    }
+                )
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("old")
+    ap.add_argument("new")
+    ap.add_argument("--threshold", type=float, default=None)
+    ap.add_argument("--field", default="p50_us", help="이 칸만 (all 이면 전부)")
+    args = ap.parse_args()
+
+    with open(args.old, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+
+    rows = compare(old, new)
+    if args.field != "all":
+        rows = [
+            r
+            for r in rows
+            if r["field"] == args.field or r["field"].endswith("_per_s")
+        ]
+
+    print(f"{old['commit'][:12]} -> {new['commit'][:12]}")
+    print_table(rows, ["suite", "row", "field", "old", "new", "change"])
+
+    if args.threshold is not None:
+        bad = [r for r in rows if r["regression"] > args.threshold]
+        if bad:
+            print(f"{len(bad)} rows regressed more than {args.threshold:.0%}")
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
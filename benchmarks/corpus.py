@@ -0,0 +1,62 @@
+# benchmarks/corpus.py
+
+import random
+
+# 단톡방에 실제로 올라오는 모양을 흉내낸 메시지들
+CHATTER = [
+    "안녕하세요~",
+    "오늘도 화이팅입니다!",
+    "다들 좋은 아침이에요",
+    "이번주 토요일 3시에 모여요",
+    "ㅋㅋㅋㅋㅋ",
+    "아멘🙏",
+    "혹시 12장 해석 아시는 분?",
+    "저 오늘은 좀 늦게 읽을 것 같아요",
+    "주보 사진 올립니다",
+    "감사합니다",
+    "내일 예배 10시 30분입니다",
+    "사진",
+    "이모티콘",
+    "완료하신 분들 수고하셨어요",
+    "요한복음 3장 16절 말씀 나눕니다",
+]
+
+RECORDS = [
+    "{d}일차 완료",
+    "{d}일차 완료했습니다",
+    "오늘 {d}일차 완료!",
+    "성경읽기 {d}일차 클리어",
+    "{d}일차 통독 완료",
+    "{a}-{d}일차 완료",
+    "{a}, {d}일차 완료",
+    "{d}일차 완료.\n창세기 1장\n[1]태초에 하나님이 천지를 창조하시니라",
+]
+
+COMMANDS = ["/진행상황", "/집계"]
+
+
+def chat_messages(
+    n: int,
+    senders: int = 30,
+    record_ratio: float = 0.15,
+    command_ratio: float = 0.03,
+    max_day: int = 300,
+    seed: int = 0,
+) -> list[dict[str, str]]:
+    """
+    {"sender", "msg"} n 개. 대부분 일반 대화고 record_ratio 만큼 기록 메시지.
+    """
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        sender = f"user{rng.randrange(senders)}"
+        r = rng.random()
+        if r < record_ratio:
+            d = rng.randint(2, max_day)
+            msg = rng.choice(RECORDS).format(a=rng.randint(1, d - 1), d=d)
+        elif r < record_ratio + command_ratio:
+            msg = rng.choice(COMMANDS)
+        else:
+            msg = rng.choice(CHATTER)
+        out.append({"sender": sender, "msg": msg})
+    return out
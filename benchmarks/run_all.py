@@ -0,0 +1,130 @@
+# benchmarks/run_all.py
+"""
+벤치마크 전부 돌리고 결과를 JSON 하나로 남김. 커밋끼리 비교는 benchmarks.compare.
+
+    python -m benchmarks.run_all                       # benchmarks/results/<커밋>.json
+    python -m benchmarks.run_all --quick --out a.json  # 작은 크기로 빨리
+    python -m benchmarks.run_all --only parser repository
+
+Flask 가 없으면 e2e 는 skipped 로 남기고 넘어감.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Callable
+
+from . import (
+    bench_batch,
+    bench_day_parser,
+    bench_day_parser_worst_case,
+    bench_e2e,
+    bench_formatter,
+    bench_logging,
+    bench_missing_days,
+    bench_repository,
+    bench_storage_profiles,
+)
+
+# 이름 -> (기본 크기로 돌리기, --quick 으로 돌리기)
+SUITES: dict[str, tuple[Callable[[], list[dict]], Callable[[], list[dict]]]] = {
+    "parser": (
+        lambda: bench_day_parser.run(20000),
+        lambda: bench_day_parser.run(2000),
+    ),
+    "parser_worst_case": (
+        lambda: bench_day_parser_worst_case.run([50, 100, 200]),
+        lambda: bench_day_parser_worst_case.run([25, 50]),
+    ),
+    "repository": (
+        lambda: bench_repository.run([10, 100, 1000, 10000], 500),
+        lambda: bench_repository.run([10, 100], 100),
+    ),
+    "missing_days": (
+        lambda: bench_missing_days.run([365, 1000], 200, 200),
+        lambda: bench_missing_days.run([365], 50, 50),
+    ),
+    "storage_profiles": (
+        lambda: bench_storage_profiles.run(2000, 2.0),
+        lambda: bench_storage_profiles.run(200, 0.5),
+    ),
+    "batch": (
+        lambda: bench_batch.run(2000, [1, 100, 1000]),
+        lambda: bench_batch.run(200, [1, 100]),
+    ),
+    "formatter": (
+        lambda: bench_formatter.run([10, 100, 1000, 10000], 200),
+        lambda: bench_formatter.run([10, 100], 50),
+    ),
+    "logging": (
+        lambda: bench_logging.run(20000),
+        lambda: bench_logging.run(2000),
+    ),
+    "e2e": (
+        lambda: bench_e2e.run(100, 500),
+        lambda: bench_e2e.run(10, 50),
+    ),
+}
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run(only: list[str] | None = None, quick: bool = False) -> dict:
+    report = {
+        "commit": _git("rev-parse", "HEAD") or "unknown",
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "quick": quick,
+        "suites": {},
+    }
+
+    for name, (full, small) in SUITES.items():
+        if only and name not in only:
+            continue
+        print(f"[{name}] ...", file=sys.stderr, flush=True)
+        start = time.perf_counter()
+        try:
+            rows = (small if quick else full)()
+            suite = {"rows": rows}
+        except ImportError as e:
+            suite = {"skipped": str(e)}
+        suite["seconds"] = round(time.perf_counter() - start, 2)
+        report["suites"][name] = suite
+    return report
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--out", help="결과 JSON 경로 (기본 benchmarks/results/<커밋>.json)")
+    ap.add_argument("--only", nargs="+", choices=sorted(SUITES))
+    ap.add_argument("--quick", action="store_true")
+    args = ap.parse_args()
+
+    report = run(args.only, args.quick)
+
+    out = args.out
+    if out is None:
+        name = report["commit"][:12] + ("-dirty" if report["dirty"] else "")
+        out = os.path.join(os.path.dirname(__file__), "results", f"{name}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(out)
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,6 @@
 from .repository import Repository
+from .connection import ConnectionPool
+from .profiles import StorageProfile, PROFILES, get_profile
+from .migrations import MIGRATIONS, LATEST_VERSION, migrate
+from .progress_store import RowProgressStore, BitmapProgressStore
+from .cache import ProgressCache
@@ -0,0 +1,68 @@
+# db/cache.py
+
+import threading
+
+from entities import ProgressSummary
+
+from utilities import LRUCache
+
+
+class ProgressCache:
+    """
+    /진행상황 결과(ProgressSummary)를 (plan_id, sender_id) 별로 들고 있는 LRU.
+    - 값은 계산할 때의 current_day 랑 같이 저장해서, 날이 바뀌면 알아서 miss
+    - 기록이 commit 되면 invalidate(key) 로 그 사람 것만 지움
+      (id 로 잡아서 닉네임이 바뀌어도 예전 이름으로 쓴 기록까지 같이 지워짐)
+    - 읽는 도중에 기록이 끝나서 옛날 값이 다시 들어가는 걸 막으려고
+      읽기 시작할 때 generation 을 받아두고, 그 사이 invalidate 가 있었으면 안 넣음
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self._lru = LRUCache(maxsize)
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: tuple, current_day: int) -> ProgressSummary | None:
+        # LRUCache 도 hits/misses 를 세지만 날 지난 값도 hit 로 셈.
+        # 여기 숫자가 /metrics 에 나가는 거라 여러 스레드가 불러도 안 빠지게 lock 안에서
+        with self._lock:
+            cached = self._lru.get(key)
+            if cached is None or cached[0] != current_day:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return cached[1]
+
+    def put(
+        self, key: tuple, current_day: int, summary: ProgressSummary, generation: int
+    ) -> None:
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._lru.put(key, (current_day, summary))
+
+    def invalidate(self, key: tuple) -> None:
+        with self._lock:
+            self._generation += 1
+            self._lru.pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._lru.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._lru),
+                "maxsize": self._lru.maxsize,
+            }
@@ -0,0 +1,165 @@
+# db/connection.py
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from .profiles import StorageProfile
+
+
+class ConnectionPool:
+    """
+    sqlite3 커넥션을 매 요청마다 새로 열지 않고 재사용하기 위한 bounded pool.
+    - max_size: 동시에 빌려갈 수 있는 최대 커넥션 수 (넘으면 timeout 까지 대기)
+    - health_check_interval: 이 시간(초) 이상 놀던 커넥션은 꺼낼 때 SELECT 1 로 확인
+    - profile: 새 커넥션마다 걸어줄 PRAGMA 묶음 (db/profiles.py)
+    - close(): 놀고 있는 커넥션은 바로 닫고, 빌려간 커넥션은 반납될 때 닫음
+    - fork 된 자식 프로세스(gunicorn 워커 등)에서 처음 acquire 하면 부모한테 받은
+      커넥션은 버리고 새로 엶 (sqlite 커넥션은 fork 를 넘어가면 안 됨)
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_size: int = 4,
+        timeout: float = 5.0,
+        health_check_interval: float = 30.0,
+        profile: StorageProfile | None = None,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError(f"max_size must be >= 1, got {max_size}")
+
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.profile = profile or StorageProfile()
+
+        # 가장 최근에 반납된 커넥션부터 꺼내 쓰도록 LIFO (페이지 캐시가 따뜻한 놈)
+        self._idle: "queue.LifoQueue[tuple[sqlite3.Connection, float]]" = (
+            queue.LifoQueue()
+        )
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._closed = False
+        self._pid = os.getpid()
+        # 부모 프로세스에서 열린 커넥션. 자식에서 close 하면 부모 쪽 WAL/락을
+        # 건드릴 수 있어서 닫지 않고 참조만 들고 있음
+        self._inherited: list[sqlite3.Connection] = []
+
+    def _after_fork(self) -> None:
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._inherited.append(conn)
+        # 부모에서 빌려간 채로 fork 됐으면 슬롯이 안 돌아오니까 새로 만듦
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._pid = os.getpid()
+
+    def _connect(self) -> sqlite3.Connection:
+        # 스레드 간에 돌려쓰니까 check_same_thread 는 끔. 동시에 두 스레드가
+        # 같은 커넥션을 쓰는 일은 pool 이 막아줌.
+        connection = sqlite3.connect(
+            self.db_path, timeout=self.timeout, check_same_thread=False
+        )
+        connection.row_factory = sqlite3.Row
+        try:
+            self.profile.apply(connection)
+        except sqlite3.Error:
+            connection.close()
+            raise
+        return connection
+
+    def dedicated(self) -> sqlite3.Connection:
+        """
+        pool 밖에서 혼자 오래 쓸 커넥션 (writer 스레드 같은 데서 씀). 닫는 건 쓰는 쪽 책임.
+        """
+        return self._connect()
+
+    def _is_healthy(self, conn: sqlite3.Connection, last_used: float) -> bool:
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    @staticmethod
+    def _discard(conn: sqlite3.Connection) -> None:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def acquire(self) -> sqlite3.Connection:
+        if self._closed:
+            raise sqlite3.ProgrammingError("Connection pool is closed")
+
+        if self._pid != os.getpid():
+            self._after_fork()
+
+        if not self._slots.acquire(timeout=self.timeout):
+            raise sqlite3.OperationalError(
+                f"Connection pool exhausted (max_size={self.max_size})"
+            )
+
+        try:
+            while True:
+                try:
+                    conn, last_used = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._connect()
+
+                if self._is_healthy(conn, last_used):
+                    return conn
+                self._discard(conn)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        if self._pid != os.getpid():
+            # fork 전에 빌려간 커넥션이 자식에서 반납되는 경우. 슬롯도 새 거라 안 건드림
+            self._inherited.append(conn)
+            return
+        try:
+            if self._closed:
+                self._discard(conn)
+                return
+
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            except sqlite3.Error:
+                self._discard(conn)
+                return
+
+            self._idle.put((conn, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def idle_count(self) -> int:
+        return self._idle.qsize()
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
@@ -0,0 +1,25 @@
+# db/deliveries.py
+
+import sqlite3
+
+# (key, 받은 시각). 기록하는 트랜잭션에 같이 넣음
+Delivery = tuple[str, float]
+
+
+def claim_delivery(cursor: sqlite3.Cursor, key: str, now: float) -> bool:
+    """
+    처음 보는 key 면 기록하고 True, 이미 있으면 False.
+    PRIMARY KEY 충돌로 판단해서 동시에 두 번 들어와도 한쪽만 True.
+    기록이랑 같은 트랜잭션 안에서 불러야 rollback 될 때 key 도 같이 사라짐.
+    """
+    cursor.execute(
+        "INSERT OR IGNORE INTO deliveries(key, received_at) VALUES (?,?)",
+        (key, now),
+    )
+    return cursor.rowcount == 1
+
+
+def sweep_deliveries(cursor: sqlite3.Cursor, before: float) -> int:
+    """received_at 이 before 보다 오래된 key 를 지우고 지운 수를 돌려줌"""
+    cursor.execute("DELETE FROM deliveries WHERE received_at < ?", (before,))
+    return cursor.rowcount
@@ -0,0 +1,137 @@
+# db/maintenance.py
+"""
+DB 관리용 커맨드.
+
+    python -m db.maintenance migrate
+    python -m db.maintenance --db ./bible.db to-bitmap
+    python -m db.maintenance --db ./bible.db stats-verify
+    python -m db.maintenance --db ./bible.db stats-rebuild
+    python -m db.maintenance --db ./bible.db rename-sender 옛닉네임 새닉네임
+"""
+
+import argparse
+import sqlite3
+
+from .migrations import Migration, migrate
+from .progress_store import convert_rows_to_bitmap, get_store
+from .senders import add_alias, find_sender
+from .sender_stats import rebuild_stats, verify_stats
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path)
+    # 새 DB 면 기본 계획이 0일로 만들어지지만, Repository 가 열 때
+    # sync_default_plan 으로 config 의 TOTAL_DAYS 에 맞춤
+    migrate(conn, total_days=0)
+    return conn
+
+
+def migrate_database(db_path: str, total_days: int) -> list[Migration]:
+    """
+    스키마만 최신으로 올림. 여러 워커 띄우기 전에 한 번 (gunicorn.conf.py 의 on_starting)
+    돌려두면 워커들은 Repository(run_migrations=False) 로 버전 확인만 함.
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        return migrate(conn, total_days)
+    finally:
+        conn.close()
+
+
+def cmd_to_bitmap(conn: sqlite3.Connection, args: argparse.Namespace) -> None:
+    converted = convert_rows_to_bitmap(conn, plan_id=args.plan_id)
+    print(f"converted {converted} senders into progress_bitmap")
+
+
+def cmd_stats_verify(conn: sqlite3.Connection, args: argparse.Namespace) -> None:
+    store = get_store(args.layout, args.plan_id)
+    drifts = verify_stats(conn.cursor(), store, args.plan_id)
+    for drift in drifts:
+        print(f"{drift.sender}\texpected={drift.expected}\tactual={drift.actual}")
+    print(f"{len(drifts)} senders drifted")
+    if drifts:
+        raise SystemExit(1)
+
+
+def cmd_stats_rebuild(conn: sqlite3.Connection, args: argparse.Namespace) -> None:
+    rebuilt = rebuild_stats(conn, get_store(args.layout, args.plan_id), args.plan_id)
+    print(f"rebuilt sender_stats for {rebuilt} senders")
+
+
+def cmd_rename_sender(conn: sqlite3.Connection, args: argparse.Namespace) -> None:
+    # Repository.rename_sender 랑 같음. 떠 있는 서버의 /진행상황 캐시는
+    # 그 사람이 다음에 기록하거나 자정이 지나면 새로 읽음
+    with conn:
+        cursor = conn.cursor()
+        sender_id = find_sender(cursor, args.old)
+        if sender_id is None:
+            raise SystemExit(f"unknown sender {args.old!r}")
+        if find_sender(cursor, args.new) not in (None, sender_id):
+            raise SystemExit(f"{args.new!r} already has its own records")
+        add_alias(cursor, sender_id, args.new)
+    print(f"renamed {args.old} -> {args.new} (sender_id={sender_id})")
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(prog="python -m db.maintenance")
+    ap.add_argument("--db", help="sqlite 파일 경로 (기본: config.DB_PATH)")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    migrate_cmd = sub.add_parser("migrate", help="스키마를 최신으로 올리고 끝냄")
+    migrate_cmd.add_argument(
+        "--total-days",
+        type=int,
+        help="새 DB 면 기본 계획(plans 1번) 일수 (기본: config.TOTAL_DAYS)",
+    )
+
+    to_bitmap = sub.add_parser(
+        "to-bitmap", help="progress 행을 sender 별 비트맵으로 옮김 (storage_layout='bitmap')"
+    )
+    to_bitmap.add_argument("--plan-id", type=int, default=1)
+    to_bitmap.set_defaults(func=cmd_to_bitmap)
+
+    for name, func, help_text in (
+        ("stats-verify", cmd_stats_verify, "sender_stats 가 실제 기록이랑 맞는지 확인"),
+        ("stats-rebuild", cmd_stats_rebuild, "실제 기록으로 sender_stats 다시 만들기"),
+    ):
+        cmd = sub.add_parser(name, help=help_text)
+        cmd.add_argument("--layout", choices=["rows", "bitmap"], default="rows")
+        cmd.add_argument("--plan-id", type=int, default=1)
+        cmd.set_defaults(func=func)
+
+    rename = sub.add_parser(
+        "rename-sender", help="닉네임 변경. 예전 기록을 새 닉네임으로 이어서 씀"
+    )
+    rename.add_argument("old")
+    rename.add_argument("new")
+    rename.set_defaults(func=cmd_rename_sender)
+
+    args = ap.parse_args(argv)
+
+    db_path = args.db
+    if db_path is None:
+        from config import DB_PATH
+
+        db_path = DB_PATH
+
+    if args.command == "migrate":
+        total_days = args.total_days
+        if total_days is None:
+            from config import TOTAL_DAYS
+
+            total_days = TOTAL_DAYS
+        applied = migrate_database(db_path, total_days)
+        for migration in applied:
+            print(f"applied migration {migration.version} {migration.name}")
+        print(f"{len(applied)} migrations applied")
+        return
+
+    conn = _connect(db_path)
+    try:
+        args.func(conn, args)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
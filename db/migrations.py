@@ -0,0 +1,354 @@
+# db/migrations.py
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Callable
+
+MigrationFn = Callable[[sqlite3.Cursor, int], None]
+
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    스키마 변경 하나.
+    - version: PRAGMA user_version 에 기록될 번호 (1부터 순서대로)
+    - name: 로그용 이름
+    - apply: (cursor, total_days) 받아서 스키마 바꾸는 함수
+      (total_days 는 plans 의 기본 계획 일수로 들어감)
+    """
+
+    version: int
+    name: str
+    apply: MigrationFn
+
+
+def _initial_schema(cursor: sqlite3.Cursor, total_days: int) -> None:
+    # user_version 도입 전에 만든 DB 도 그대로 받아들이도록 IF NOT EXISTS
+    # reading_plan 은 legacy: 빠진 일차를 merge 로 계산하고부터 아무도 안 읽음.
+    # 예전 DB 랑 스키마만 맞추려고 만들고, 새 DB 에선 채우지 않음
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS reading_plan(
+            day INTEGER PRIMARY KEY
+        )
+        """
+    )
+
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS raw_messages(
+            id      INTEGER PRIMARY KEY AUTOINCREMENT,
+            sender  TEXT NOT NULL,
+            msg     TEXT NOT NULL,
+            time    TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS progress(
+            id      INTEGER PRIMARY KEY AUTOINCREMENT,
+            sender  TEXT NOT NULL,
+            day     INTEGER NOT NULL,
+            msg_id  INTEGER,
+            time    TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(sender, day)
+        )
+        """
+    )
+
+
+def _progress_bitmap(cursor: sqlite3.Cursor, total_days: int) -> None:
+    # storage_layout="bitmap" 일 때 쓰는 테이블 (db/progress_store.py)
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS progress_bitmap(
+            sender  TEXT NOT NULL,
+            plan_id INTEGER NOT NULL DEFAULT 1,
+            bits    BLOB NOT NULL,
+            time    TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY(sender, plan_id)
+        )
+        """
+    )
+
+
+def _sender_stats(cursor: sqlite3.Cursor, total_days: int) -> None:
+    # /집계 용 요약 테이블. 기록할 때 같이 갱신됨 (db/sender_stats.py)
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS sender_stats(
+            plan_id         INTEGER NOT NULL DEFAULT 1,
+            sender          TEXT NOT NULL,
+            completed_count INTEGER NOT NULL DEFAULT 0,
+            last_day        INTEGER NOT NULL DEFAULT 0,
+            last_update     TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY(plan_id, sender)
+        )
+        """
+    )
+
+    # rows 레이아웃 기준으로 채워둠. bitmap 레이아웃이면 Repository 가 다시 만듦
+    cursor.execute(
+        """
+        INSERT OR IGNORE INTO sender_stats(plan_id, sender, completed_count, last_day)
+        SELECT 1, sender, COUNT(*), MAX(day)
+        FROM progress
+        GROUP BY sender
+        """
+    )
+
+
+def _deliveries(cursor: sqlite3.Cursor, total_days: int) -> None:
+    # 재전송된 webhook 걸러내는 용도 (db/deliveries.py). TTL 지나면 지움
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS deliveries(
+            key         TEXT PRIMARY KEY,
+            received_at REAL NOT NULL
+        )
+        """
+    )
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_deliveries_received_at
+        ON deliveries(received_at)
+        """
+    )
+
+
+def _plans(cursor: sqlite3.Cursor, total_days: int) -> None:
+    # 읽기 계획 여러 개. 1번은 config 의 START_DATE/TOTAL_DAYS 를 따르는 기본 계획
+    # (start_date 가 NULL 이면 Repository 에 넘긴 day_counter 를 씀)
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS plans(
+            id              INTEGER PRIMARY KEY,
+            name            TEXT NOT NULL UNIQUE,
+            start_date      TEXT,
+            total_days      INTEGER NOT NULL,
+            tz_offset_hours INTEGER NOT NULL DEFAULT 3
+        )
+        """
+    )
+    cursor.execute(
+        "INSERT OR IGNORE INTO plans(id, name, total_days) VALUES (1, 'default', ?)",
+        (total_days,),
+    )
+
+    # progress 에 plan_id 추가. UNIQUE 제약을 바꿔야 해서 테이블을 새로 만들어 옮김
+    # (기존 기록은 전부 1번 계획). 계획 하나 안에서의 조회는 그대로 인덱스만 탐
+    cursor.execute(
+        """
+        CREATE TABLE progress_new(
+            id      INTEGER PRIMARY KEY AUTOINCREMENT,
+            plan_id INTEGER NOT NULL DEFAULT 1,
+            sender  TEXT NOT NULL,
+            day     INTEGER NOT NULL,
+            msg_id  INTEGER,
+            time    TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(plan_id, sender, day)
+        )
+        """
+    )
+    cursor.execute(
+        """
+        INSERT INTO progress_new(id, plan_id, sender, day, msg_id, time)
+        SELECT id, 1, sender, day, msg_id, time FROM progress
+        """
+    )
+    cursor.execute("DROP TABLE progress")
+    cursor.execute("ALTER TABLE progress_new RENAME TO progress")
+
+    # bitmap 레이아웃에서 계획 하나 전체를 읽을 때 (sender_stats 다시 만들기 등)
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_progress_bitmap_plan
+        ON progress_bitmap(plan_id, sender)
+        """
+    )
+
+
+def _senders(cursor: sqlite3.Cursor, total_days: int) -> None:
+    # 닉네임 대신 정수 id 로 기록. 이름(예전 닉네임 포함) -> id 는 sender_aliases,
+    # 지금 표시 이름은 senders.name. 닉네임이 바뀌면 별칭 한 줄만 추가하면 됨
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS senders(
+            id      INTEGER PRIMARY KEY,
+            name    TEXT NOT NULL,
+            time    TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS sender_aliases(
+            name        TEXT PRIMARY KEY,
+            sender_id   INTEGER NOT NULL REFERENCES senders(id)
+        )
+        """
+    )
+
+    # 지금까지 나온 이름마다 id 하나씩
+    cursor.execute(
+        """
+        INSERT INTO senders(name)
+        SELECT sender FROM raw_messages
+        UNION SELECT sender FROM progress
+        UNION SELECT sender FROM progress_bitmap
+        UNION SELECT sender FROM sender_stats
+        ORDER BY 1
+        """
+    )
+    cursor.execute(
+        "INSERT INTO sender_aliases(name, sender_id) SELECT name, id FROM senders"
+    )
+
+    # sender TEXT 를 sender_id 로 바꾼 테이블을 새로 만들어 옮김 (migration 5 와 같은 방식)
+    cursor.execute(
+        """
+        CREATE TABLE raw_messages_new(
+            id          INTEGER PRIMARY KEY AUTOINCREMENT,
+            sender_id   INTEGER NOT NULL,
+            msg         TEXT NOT NULL,
+            time        TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    cursor.execute(
+        """
+        INSERT INTO raw_messages_new(id, sender_id, msg, time)
+        SELECT r.id, a.sender_id, r.msg, r.time
+        FROM raw_messages AS r
+        JOIN sender_aliases AS a ON a.name = r.sender
+        """
+    )
+
+    cursor.execute(
+        """
+        CREATE TABLE progress_new(
+            id          INTEGER PRIMARY KEY AUTOINCREMENT,
+            plan_id     INTEGER NOT NULL DEFAULT 1,
+            sender_id   INTEGER NOT NULL,
+            day         INTEGER NOT NULL,
+            msg_id      INTEGER,
+            time        TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(plan_id, sender_id, day)
+        )
+        """
+    )
+    cursor.execute(
+        """
+        INSERT INTO progress_new(id, plan_id, sender_id, day, msg_id, time)
+        SELECT p.id, p.plan_id, a.sender_id, p.day, p.msg_id, p.time
+        FROM progress AS p
+        JOIN sender_aliases AS a ON a.name = p.sender
+        """
+    )
+
+    cursor.execute(
+        """
+        CREATE TABLE progress_bitmap_new(
+            sender_id   INTEGER NOT NULL,
+            plan_id     INTEGER NOT NULL DEFAULT 1,
+            bits        BLOB NOT NULL,
+            time        TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY(sender_id, plan_id)
+        )
+        """
+    )
+    cursor.execute(
+        """
+        INSERT INTO progress_bitmap_new(sender_id, plan_id, bits, time)
+        SELECT a.sender_id, b.plan_id, b.bits, b.time
+        FROM progress_bitmap AS b
+        JOIN sender_aliases AS a ON a.name = b.sender
+        """
+    )
+
+    cursor.execute(
+        """
+        CREATE TABLE sender_stats_new(
+            plan_id         INTEGER NOT NULL DEFAULT 1,
+            sender_id       INTEGER NOT NULL,
+            completed_count INTEGER NOT NULL DEFAULT 0,
+            last_day        INTEGER NOT NULL DEFAULT 0,
+            last_update     TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY(plan_id, sender_id)
+        )
+        """
+    )
+    cursor.execute(
+        """
+        INSERT INTO sender_stats_new(
+            plan_id, sender_id, completed_count, last_day, last_update
+        )
+        SELECT s.plan_id, a.sender_id, s.completed_count, s.last_day, s.last_update
+        FROM sender_stats AS s
+        JOIN sender_aliases AS a ON a.name = s.sender
+        """
+    )
+
+    for table in ("raw_messages", "progress", "progress_bitmap", "sender_stats"):
+        cursor.execute(f"DROP TABLE {table}")
+        cursor.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_progress_bitmap_plan
+        ON progress_bitmap(plan_id, sender_id)
+        """
+    )
+
+
+# 새 스키마 변경은 여기 맨 뒤에 version 하나 올려서 추가. 이미 나간 건 고치지 말 것.
+MIGRATIONS: list[Migration] = [
+    Migration(1, "initial_schema", _initial_schema),
+    Migration(2, "progress_bitmap", _progress_bitmap),
+    Migration(3, "sender_stats", _sender_stats),
+    Migration(4, "deliveries", _deliveries),
+    Migration(5, "plans", _plans),
+    Migration(6, "senders", _senders),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection, total_days: int) -> list[Migration]:
+    """
+    아직 안 돌린 migration 들을 순서대로 트랜잭션 하나로 적용하고, 적용한 목록을 돌려줌.
+    이미 최신이면 PRAGMA user_version 한 번 읽고 끝.
+    여러 프로세스가 동시에 떠도 BEGIN IMMEDIATE 로 한 놈만 돌리고,
+    락 잡은 다음 버전을 다시 읽어서 남이 이미 해둔 건 건너뜀.
+    """
+    if current_version(conn) >= LATEST_VERSION:
+        return []
+
+    isolation_level = conn.isolation_level
+    conn.isolation_level = None  # 트랜잭션은 직접 관리
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            version = current_version(conn)
+            applied = []
+            cursor = conn.cursor()
+            for migration in MIGRATIONS:
+                if migration.version <= version:
+                    continue
+                migration.apply(cursor, total_days)
+                cursor.execute(f"PRAGMA user_version = {migration.version}")
+                applied.append(migration)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.isolation_level = isolation_level
+
+    return applied
@@ -0,0 +1,71 @@
+# db/plans.py
+
+import sqlite3
+
+from datetime import date
+
+from entities import Plan
+
+from .progress_store import DEFAULT_PLAN_ID
+
+
+def _plan(row) -> Plan:
+    plan_id, name, start_date, total_days, tz_offset_hours = row
+    return Plan(
+        id=plan_id,
+        name=name,
+        total_days=total_days,
+        start_date=date.fromisoformat(start_date) if start_date else None,
+        tz_offset_hours=tz_offset_hours,
+    )
+
+
+def read_plans(cursor: sqlite3.Cursor) -> list[Plan]:
+    cursor.execute(
+        """
+        SELECT id, name, start_date, total_days, tz_offset_hours
+        FROM plans
+        ORDER BY id
+        """
+    )
+    return [_plan(r) for r in cursor.fetchall()]
+
+
+def save_plan(
+    cursor: sqlite3.Cursor,
+    name: str,
+    start_date: date,
+    total_days: int,
+    tz_offset_hours: int = 3,
+) -> int:
+    """
+    이름으로 계획을 만들거나 (이미 있으면) 날짜/길이를 바꿈. 계획 id 를 돌려줌.
+    """
+    cursor.execute(
+        """
+        INSERT INTO plans(
+            name, start_date, total_days, tz_offset_hours
+        ) VALUES (?,?,?,?)
+        ON CONFLICT(name) DO UPDATE SET
+            start_date = excluded.start_date,
+            total_days = excluded.total_days,
+            tz_offset_hours = excluded.tz_offset_hours
+        """,
+        (name, start_date.isoformat(), total_days, tz_offset_hours),
+    )
+    cursor.execute("SELECT id FROM plans WHERE name = ?", (name,))
+    return cursor.fetchone()[0]
+
+
+def sync_default_plan(cursor: sqlite3.Cursor, total_days: int) -> None:
+    """
+    기본 계획 길이를 config 의 TOTAL_DAYS 에 맞춤. 먼저 읽어보고 바뀌었을 때만 씀
+    (UPDATE 는 고칠 행이 없어도 write lock 을 잡음).
+    """
+    cursor.execute("SELECT total_days FROM plans WHERE id = ?", (DEFAULT_PLAN_ID,))
+    row = cursor.fetchone()
+    if row is None or row[0] == total_days:
+        return
+    cursor.execute(
+        "UPDATE plans SET total_days = ? WHERE id = ?", (total_days, DEFAULT_PLAN_ID)
+    )
@@ -0,0 +1,113 @@
+# db/profiles.py
+
+import sqlite3
+from dataclasses import dataclass, replace
+from typing import Any
+
+_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+_SYNCHRONOUS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+_TEMP_STORES = {"DEFAULT", "FILE", "MEMORY"}
+
+
+@dataclass(frozen=True)
+class StorageProfile:
+    """
+    커넥션 열 때마다 거는 PRAGMA 묶음. None 인 항목은 SQLite 기본값 그대로 둠.
+    - journal_mode: WAL 이면 /집계 같은 읽기가 기록(쓰기)을 막지 않음
+    - synchronous: WAL + NORMAL 이면 commit 마다 fsync 안 함 (checkpoint 때만)
+    - cache_size: 양수면 페이지 수, 음수면 KiB
+    - mmap_size: 바이트
+    - temp_store: DEFAULT / FILE / MEMORY
+    - busy_timeout: 밀리초. 락 잡혀있으면 이만큼 기다렸다가 실패
+    """
+
+    journal_mode: str | None = None
+    synchronous: str | None = None
+    cache_size: int | None = None
+    mmap_size: int | None = None
+    temp_store: str | None = None
+    busy_timeout: int | None = None
+
+    def __post_init__(self) -> None:
+        _check_choice("journal_mode", self.journal_mode, _JOURNAL_MODES)
+        _check_choice("synchronous", self.synchronous, _SYNCHRONOUS)
+        _check_choice("temp_store", self.temp_store, _TEMP_STORES)
+        for name in ("cache_size", "mmap_size", "busy_timeout"):
+            value = getattr(self, name)
+            if value is not None and not isinstance(value, int):
+                raise ValueError(f"{name} must be an int, got {value!r}")
+
+    def pragmas(self) -> list[str]:
+        out = []
+        # journal_mode 는 DB 파일에 남는 설정이라 제일 먼저 걸어둠
+        if self.journal_mode is not None:
+            out.append(f"PRAGMA journal_mode={self.journal_mode.upper()}")
+        if self.synchronous is not None:
+            out.append(f"PRAGMA synchronous={self.synchronous.upper()}")
+        if self.cache_size is not None:
+            out.append(f"PRAGMA cache_size={self.cache_size}")
+        if self.mmap_size is not None:
+            out.append(f"PRAGMA mmap_size={self.mmap_size}")
+        if self.temp_store is not None:
+            out.append(f"PRAGMA temp_store={self.temp_store.upper()}")
+        if self.busy_timeout is not None:
+            out.append(f"PRAGMA busy_timeout={self.busy_timeout}")
+        return out
+
+    def apply(self, conn: sqlite3.Connection) -> None:
+        for pragma in self.pragmas():
+            conn.execute(pragma).fetchall()
+
+
+def _check_choice(name: str, value: str | None, choices: set[str]) -> None:
+    if value is not None and value.upper() not in choices:
+        raise ValueError(f"{name} must be one of {sorted(choices)}, got {value!r}")
+
+
+PROFILES: dict[str, StorageProfile] = {
+    # 예전이랑 똑같이 (rollback journal, synchronous=FULL)
+    "default": StorageProfile(),
+    # 읽기/쓰기 안 막히게 WAL 만 켠 것
+    "wal": StorageProfile(
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        busy_timeout=5000,
+    ),
+    # WAL + 캐시/mmap 넉넉하게. 램 여유 있는 서버용
+    "fast": StorageProfile(
+        journal_mode="WAL",
+        synchronous="NORMAL",
+        cache_size=-16000,  # 16MB
+        mmap_size=64 * 1024 * 1024,
+        temp_store="MEMORY",
+        busy_timeout=5000,
+    ),
+}
+
+
+def get_profile(
+    profile: str | StorageProfile | dict[str, Any] | None,
+) -> StorageProfile:
+    """
+    config 에서 넘어온 값을 StorageProfile 로 바꿔줌.
+    - None / "default" → 기본 프로필
+    - "wal", "fast" → 미리 정해둔 프로필
+    - dict → {"base": "wal", "cache_size": -8000} 처럼 base 위에 덮어쓰기
+    """
+    if profile is None:
+        return PROFILES["default"]
+
+    if isinstance(profile, StorageProfile):
+        return profile
+
+    if isinstance(profile, str):
+        try:
+            return PROFILES[profile.lower()]
+        except KeyError:
+            raise ValueError(
+                f"Unknown storage profile {profile!r}, choose from {sorted(PROFILES)}"
+            ) from None
+
+    overrides = dict(profile)
+    base = get_profile(overrides.pop("base", None))
+    return replace(base, **overrides)
@@ -0,0 +1,271 @@
+# db/progress_store.py
+
+import sqlite3
+
+from entities import Errors
+
+DEFAULT_PLAN_ID = 1
+
+
+def _mark(days: list[int], seen) -> tuple[list[Errors], list[int]]:
+    """
+    days 순서대로 보면서 이미 seen 에 있거나 앞에서 나온 일차는 중복 처리.
+    """
+    statuses: list[Errors] = []
+    new_days: list[int] = []
+    for day in days:
+        if day in seen:
+            statuses.append(Errors.DB_DUPLICATE_DAY)
+            continue
+        seen.add(day)
+        new_days.append(day)
+        statuses.append(Errors.SUCCESS)
+    return statuses, new_days
+
+
+class RowProgressStore:
+    """
+    progress 테이블에 (plan_id, sender_id, day) 한 줄씩 저장하는 기본 방식.
+    조회는 전부 UNIQUE(plan_id, sender_id, day) 인덱스 범위 안에서 끝남.
+    """
+
+    name = "rows"
+
+    def __init__(self, plan_id: int = DEFAULT_PLAN_ID) -> None:
+        self.plan_id = plan_id
+
+    def insert_days(
+        self, cursor: sqlite3.Cursor, sender_id: int, days: list[int], msg_id: int
+    ) -> tuple[list[Errors], list[int]]:
+        # UNIQUE(plan_id, sender_id, day) 인덱스 범위 스캔으로 이미 있는 일차만 가져옴
+        cursor.execute(
+            """
+            SELECT day
+            FROM progress
+            WHERE plan_id = ?
+            AND sender_id = ?
+            AND day BETWEEN ? AND ?
+            """,
+            (self.plan_id, sender_id, min(days), max(days)),
+        )
+        statuses, new_days = _mark(days, {int(r[0]) for r in cursor.fetchall()})
+
+        cursor.executemany(
+            """
+            INSERT OR IGNORE INTO progress(
+                plan_id, sender_id, day, msg_id
+            ) VALUES (?,?,?,?)
+            """,
+            [(self.plan_id, sender_id, day, msg_id) for day in new_days],
+        )
+        return statuses, new_days
+
+    def completed_days(self, cursor: sqlite3.Cursor, sender_id: int) -> list[int]:
+        # 행 9천 개를 Row 로 만드는 대신 문자열 하나로 받아서 쪼갬
+        # (Row 생성 비용이 쿼리보다 큼)
+        cursor.execute(
+            """
+            SELECT group_concat(day)
+            FROM (
+                SELECT day
+                FROM progress
+                WHERE plan_id = ?
+                AND sender_id = ?
+                ORDER BY day
+            )
+            """,
+            (self.plan_id, sender_id),
+        )
+        row = cursor.fetchone()
+        days = [int(d) for d in row[0].split(",")] if row and row[0] else []
+        # group_concat 순서는 보장 안 되니까 한 번 더. 이미 정렬돼 있으면 O(n)
+        days.sort()
+        return days
+
+    def completed_stats(self, cursor: sqlite3.Cursor) -> list[tuple[int, int, int]]:
+        """
+        [(sender_id, 완료 수, 마지막 일차), ...] sender_id 순. 전체 스캔이라 집계용 아님
+        (sender_stats 다시 만들거나 검증할 때만 씀).
+        """
+        cursor.execute(
+            """
+            SELECT
+                sender_id,
+                COUNT(*) as completed,
+                MAX(day) as last_day
+            FROM progress
+            WHERE plan_id = ?
+            GROUP BY sender_id
+            ORDER BY sender_id
+            """,
+            (self.plan_id,),
+        )
+        return [(r[0], r[1], r[2]) for r in cursor.fetchall()]
+
+
+def bitmap_from_days(days) -> int:
+    bits = 0
+    for day in days:
+        bits |= 1 << (day - 1)
+    return bits
+
+
+def days_from_bitmap(bits: int) -> list[int]:
+    days = []
+    day = 1
+    while bits:
+        # 비어있는 바이트는 통째로 건너뜀
+        if not bits & 0xFF:
+            bits >>= 8
+            day += 8
+            continue
+        if bits & 1:
+            days.append(day)
+        bits >>= 1
+        day += 1
+    return days
+
+
+def _to_blob(bits: int) -> bytes:
+    return bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+
+
+def _from_blob(blob: bytes | None) -> int:
+    return int.from_bytes(blob, "little") if blob else 0
+
+
+class BitmapProgressStore:
+    """
+    sender_id(+plan) 하나당 비트맵 BLOB 하나. day N 은 (N-1) 번째 비트 (little-endian).
+    - 기록: 기존 비트맵에 OR. 같은 트랜잭션 안에서 먼저 행을 잡고(write lock) 읽어서
+      다른 writer 랑 섞이지 않음
+    - 완료 수: popcount
+    - 빠진 일차: 꺼진 비트
+    progress 테이블 대신 progress_bitmap 테이블을 씀. 기존 행은
+    `python -m db.maintenance to-bitmap` 으로 옮길 수 있음.
+    """
+
+    name = "bitmap"
+
+    def __init__(self, plan_id: int = DEFAULT_PLAN_ID) -> None:
+        self.plan_id = plan_id
+
+    def insert_days(
+        self, cursor: sqlite3.Cursor, sender_id: int, days: list[int], msg_id: int
+    ) -> tuple[list[Errors], list[int]]:
+        # 없는 행이면 먼저 만들어서 트랜잭션이 처음부터 write lock 을 잡게 함
+        cursor.execute(
+            """
+            INSERT OR IGNORE INTO progress_bitmap(
+                sender_id, plan_id, bits
+            ) VALUES (?,?,X'')
+            """,
+            (sender_id, self.plan_id),
+        )
+        bits = self._bits(cursor, sender_id)
+
+        statuses: list[Errors] = []
+        new_days: list[int] = []
+        for day in days:
+            mask = 1 << (day - 1)
+            if bits & mask:
+                statuses.append(Errors.DB_DUPLICATE_DAY)
+                continue
+            bits |= mask
+            new_days.append(day)
+            statuses.append(Errors.SUCCESS)
+
+        if new_days:
+            cursor.execute(
+                """
+                UPDATE progress_bitmap
+                SET bits = ?, time = CURRENT_TIMESTAMP
+                WHERE sender_id = ? AND plan_id = ?
+                """,
+                (_to_blob(bits), sender_id, self.plan_id),
+            )
+        return statuses, new_days
+
+    def _bits(self, cursor: sqlite3.Cursor, sender_id: int) -> int:
+        cursor.execute(
+            "SELECT bits FROM progress_bitmap WHERE sender_id = ? AND plan_id = ?",
+            (sender_id, self.plan_id),
+        )
+        row = cursor.fetchone()
+        return _from_blob(row[0]) if row else 0
+
+    def completed_days(self, cursor: sqlite3.Cursor, sender_id: int) -> list[int]:
+        return days_from_bitmap(self._bits(cursor, sender_id))
+
+    def completed_stats(self, cursor: sqlite3.Cursor) -> list[tuple[int, int, int]]:
+        cursor.execute(
+            """
+            SELECT sender_id, bits
+            FROM progress_bitmap
+            WHERE plan_id = ?
+            ORDER BY sender_id
+            """,
+            (self.plan_id,),
+        )
+        stats = []
+        for sender_id, blob in cursor.fetchall():
+            bits = _from_blob(blob)
+            if bits:
+                stats.append((sender_id, bits.bit_count(), bits.bit_length()))
+        return stats
+
+
+STORES = {
+    RowProgressStore.name: RowProgressStore,
+    BitmapProgressStore.name: BitmapProgressStore,
+}
+
+
+def get_store(
+    layout: str, plan_id: int = DEFAULT_PLAN_ID
+) -> RowProgressStore | BitmapProgressStore:
+    try:
+        return STORES[layout](plan_id)
+    except KeyError:
+        raise ValueError(
+            f"Unknown storage layout {layout!r}, choose from {sorted(STORES)}"
+        ) from None
+
+
+def convert_rows_to_bitmap(
+    conn: sqlite3.Connection, plan_id: int = DEFAULT_PLAN_ID
+) -> int:
+    """
+    progress 행들을 sender 별 비트맵으로 옮김. 기존 비트맵이 있으면 OR 로 합쳐서
+    여러 번 돌려도 결과는 같음. progress 행은 지우지 않음. 옮긴 sender 수를 돌려줌.
+    """
+    with conn:
+        rows = conn.execute(
+            """
+            SELECT sender_id, group_concat(day)
+            FROM progress
+            WHERE plan_id = ?
+            GROUP BY sender_id
+            """,
+            (plan_id,),
+        ).fetchall()
+
+        for sender_id, days in rows:
+            bits = bitmap_from_days(int(d) for d in days.split(","))
+            old = conn.execute(
+                "SELECT bits FROM progress_bitmap WHERE sender_id = ? AND plan_id = ?",
+                (sender_id, plan_id),
+            ).fetchone()
+            if old is not None:
+                bits |= _from_blob(old[0])
+
+            conn.execute(
+                """
+                INSERT INTO progress_bitmap(sender_id, plan_id, bits)
+                VALUES (?,?,?)
+                ON CONFLICT(sender_id, plan_id)
+                DO UPDATE SET bits = excluded.bits, time = CURRENT_TIMESTAMP
+                """,
+                (sender_id, plan_id, _to_blob(bits)),
+            )
+    return len(rows)
@@ -1,12 +1,51 @@
 # db.py
+import os
+import dataclasses
 import sqlite3
 import logging
+import functools
+import threading
+
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+from datetime import date
 
 from utilities import set_logger
 from utilities import AbsoluteDayCounter
+from utilities import missing_spans, expand_spans, compress_spans
+from utilities import Metrics
 
 from entities import Errors
+from entities import RecordResult
 from entities import ProgressSummary
+from entities import Plan
+
+from .writer import GroupCommitWriter
+from .profiles import StorageProfile, get_profile
+from .connection import ConnectionPool
+from .cache import ProgressCache
+from .progress_store import DEFAULT_PLAN_ID, get_store
+from .plans import read_plans, save_plan, sync_default_plan
+from .senders import add_alias, find_sender, get_or_create_sender
+from .sender_stats import StatsDrift, read_stats, record_stats
+from .sender_stats import rebuild_stats, verify_stats
+from .deliveries import Delivery, claim_delivery, sweep_deliveries
+from .migrations import LATEST_VERSION, current_version, migrate
+
+
+def _timed(op: str):
+    # 메서드 하나 걸린 시간을 db_query_seconds{op=...} 로 남김
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.timer("db_query_seconds", op=op):
+                return fn(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
 
 
 class Repository:
@@ -17,200 +56,600 @@ class Repository:
         total_days: int = 365,
         logger_stream: bool = False,
         logging_level: logging = logging.DEBUG,
+        pool_size: int = 4,
+        pool_timeout: float = 5.0,
+        health_check_interval: float = 30.0,
+        write_behind: bool = False,
+        write_batch_size: int = 256,
+        write_max_delay: float = 0.005,
+        storage_profile: str | StorageProfile | dict | None = None,
+        storage_layout: str = "rows",
+        cache_size: int = 1024,
+        metrics: Metrics | None = None,
+        multiprocess: bool = False,
+        run_migrations: bool = True,
     ) -> None:
 
         self.db_path = db_path
         self.day_counter = day_counter
         self.logger = set_logger("db", logger_stream, logging_level)
+        # 안 넘기면 아무것도 안 세는 걸로
+        self.metrics: Metrics = metrics or Metrics(enabled=False)
+        # "rows": progress 테이블 (sender_id, day) 한 줄씩 / "bitmap": sender 당 BLOB 하나
+        self._layout = storage_layout
+        self._store = get_store(storage_layout)
+        self.total_days = total_days
+        self._pool = ConnectionPool(
+            db_path,
+            max_size=pool_size,
+            timeout=pool_timeout,
+            health_check_interval=health_check_interval,
+            profile=get_profile(storage_profile),
+        )
 
-        with self._get_connection() as conn:
-            cursor: sqlite3.Cursor = conn.cursor()
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS reading_plan(
-                    day INTEGER PRIMARY KEY
-                )
-                """
-            )
+        # plan_id -> (Plan, 일차 계산기, store). 처음 쓸 때 plans 테이블에서 읽어둠.
+        # 기본 계획(1번)은 넘겨받은 day_counter 를 그대로 씀
+        self._plans: dict[int, tuple[Plan, AbsoluteDayCounter, object]] = {}
+        self._plan_names: dict[str, int] = {}
+        self._plans_lock = threading.Lock()
 
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS raw_messages(
-                    id      INTEGER PRIMARY KEY AUTOINCREMENT,
-                    sender  TEXT NOT NULL,
-                    msg     TEXT NOT NULL,
-                    time    TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-                """
+        # 이름(별칭 포함) -> sender id. commit 된 것만 올라감.
+        # 별칭은 지우지 않으니까 한 번 올라간 건 계속 맞음 (다른 프로세스가 바꿔도)
+        self._sender_ids: dict[str, int] = {}
+
+        # /진행상황 결과 캐시. key 는 (plan_id, sender). 0 이면 안 씀
+        self._cache: ProgressCache | None = (
+            ProgressCache(cache_size) if cache_size > 0 else None
+        )
+        # 자정 지나면 캐시 통째로 비움 (MockClock 처럼 hook 이 없는 counter 도 됨)
+        on_rollover = getattr(day_counter, "on_rollover", None)
+        if self._cache is not None and on_rollover is not None:
+            on_rollover(lambda day: self._cache.clear())
+
+        # 여러 프로세스가 같은 DB 에 쓰면 (gunicorn 워커 등) 다른 프로세스의 commit 은
+        # _on_commit 으로 안 들어옴. 캐시 읽기 전에 PRAGMA data_version 으로
+        # 누가 썼는지 보고 바뀌었으면 캐시를 통째로 비움
+        self.multiprocess = multiprocess
+        self._version_conn: sqlite3.Connection | None = None
+        self._version_pid = 0
+        self._data_version: int | None = None
+        self._version_lock = threading.Lock()
+
+        # write_behind 면 progress 기록은 전부 writer 스레드 하나가 묶어서 commit
+        self._writer: GroupCommitWriter | None = None
+        if write_behind:
+            self._writer = GroupCommitWriter(
+                self._pool.dedicated,
+                max_batch=write_batch_size,
+                max_delay=write_max_delay,
+                on_commit=self._on_commit,
             )
 
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS progress(
-                    id      INTEGER PRIMARY KEY AUTOINCREMENT,
-                    sender  TEXT NOT NULL,
-                    day     INTEGER NOT NULL,
-                    msg_id  INTEGER,
-                    time    TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(sender, day)
+        # 최신 DB 면 PRAGMA user_version 한 번 읽고 끝남.
+        # run_migrations=False 면 (gunicorn master 가 미리 돌린 경우) 확인만 함
+        with self._pool.connection() as conn:
+            version = current_version(conn)
+            if version < LATEST_VERSION and not run_migrations:
+                raise RuntimeError(
+                    f"The database schema version {version} is older than"
+                    f" {LATEST_VERSION}; run `python -m db.maintenance migrate` first"
                 )
-                """
+            applied = migrate(conn, total_days) if version < LATEST_VERSION else []
+            if version <= LATEST_VERSION:
+                with conn:
+                    sync_default_plan(conn.cursor(), total_days)
+
+        for migration in applied:
+            self.logger.info(
+                "Applied migration version:%s, name:%s",
+                migration.version,
+                migration.name,
             )
-
-            cursor.executemany(
-                "INSERT OR IGNORE INTO reading_plan(day) VALUES (?)",
-                [(d,) for d in range(1, total_days + 1)],
+        if self._store.name != "rows" and any(
+            m.name == "sender_stats" for m in applied
+        ):
+            self.rebuild_sender_stats()
+
+        if version > LATEST_VERSION:
+            self.logger.warning(
+                "The database schema version %s is newer than this code (%s)",
+                version,
+                LATEST_VERSION,
             )
 
-    def _get_connection(self) -> sqlite3.Connection:
+    @contextmanager
+    def _get_connection(self) -> Iterator[sqlite3.Connection]:
         """
-        make connection with database
+        pool 에서 커넥션을 빌려와서 트랜잭션으로 감싸줌.
+        with 블록이 끝나면 commit(예외면 rollback) 하고 pool 에 반납.
         """
 
-        connection = sqlite3.connect(self.db_path)
-        connection.row_factory = sqlite3.Row
-        return connection
+        with self._pool.connection() as conn:
+            with conn:
+                yield conn
 
-    def _post_raw(self, sender: str, raw: str) -> Errors | int:
+    def close(self) -> None:
+        """
+        writer 큐에 남은 기록을 다 commit 하고, pool 에 있는 커넥션 전부 정리.
+        서버 내려갈 때 호출.
+        """
+        if self._writer is not None:
+            self._writer.close()
+        with self._version_lock:
+            if self._version_conn is not None and self._version_pid == os.getpid():
+                self._version_conn.close()
+            self._version_conn = None
+        self._pool.close()
+
+    def _sync_cache_with_other_processes(self) -> None:
+        # data_version 은 "이 커넥션 말고 다른 커넥션이 commit 하면" 바뀜.
+        # 그래서 캐시 확인 전용 커넥션을 프로세스마다 하나 따로 둠
+        changed = False
+        with self._version_lock:
+            try:
+                if self._version_pid != os.getpid():
+                    self._version_conn = self._pool.dedicated()
+                    self._version_pid = os.getpid()
+                    self._data_version = None
+                cursor = self._version_conn.execute("PRAGMA data_version")
+                version = cursor.fetchone()[0]
+            except sqlite3.Error as e:
+                # 확인을 못 하면 캐시를 믿을 수 없으니 비우고 다음에 다시 엶
+                self.logger.warning("Failed to read data_version error:%s", e)
+                self._version_pid = 0
+                version = None
+            if version is None or version != self._data_version:
+                self._data_version = version
+                changed = True
+        if changed:
+            self._cache.clear()
+
+    def _load_plans(self) -> None:
+        with self._pool.connection() as conn:
+            plans = read_plans(conn.cursor())
+
+        with self._plans_lock:
+            for plan in plans:
+                old = self._plans.get(plan.id)
+                if old is not None and old[0] == plan:
+                    continue
+                if plan.start_date is None:
+                    counter = self.day_counter
+                else:
+                    counter = AbsoluteDayCounter(
+                        start_date=plan.start_date,
+                        tz_offset_hours=plan.tz_offset_hours,
+                    )
+                store = get_store(self._layout, plan.id)
+                self._plans[plan.id] = (plan, counter, store)
+                self._plan_names[plan.name] = plan.id
+
+    def _plan(self, plan_id: int) -> tuple[Plan, AbsoluteDayCounter, object]:
+        """캐시에 없으면 plans 테이블을 다시 읽음. 그래도 없으면 KeyError"""
+        state = self._plans.get(plan_id)
+        if state is None:
+            self._load_plans()
+            state = self._plans[plan_id]
+        return state
+
+    def has_plan(self, plan_id: int) -> bool:
+        try:
+            self._plan(plan_id)
+        except KeyError:
+            return False
+        return True
+
+    def plan_id(self, name_or_id: str | int) -> int | None:
+        """계획 이름이나 id (문자열이어도 됨) 로 plan_id. 없으면 None"""
+        if isinstance(name_or_id, int) or str(name_or_id).isdecimal():
+            plan_id = int(name_or_id)
+            return plan_id if self.has_plan(plan_id) else None
+
+        if name_or_id not in self._plan_names:
+            self._load_plans()
+        return self._plan_names.get(name_or_id)
+
+    def plans(self) -> list[Plan]:
+        self._load_plans()
+        return sorted((plan for plan, _, _ in self._plans.values()), key=lambda p: p.id)
+
+    def add_plan(
+        self, name: str, start_date: date, total_days: int, tz_offset_hours: int = 3
+    ) -> Plan:
+        """
+        계획을 만들거나 (같은 이름이 있으면) 날짜/길이를 바꿈.
+        시작일이 바뀌면 그 계획의 일차 계산기도 새로 만듦.
+        이미 똑같으면 안 씀 (워커마다 뜰 때 PLANS 로 부르니까).
+        """
+        self._load_plans()
+        plan_id = self._plan_names.get(name)
+        if plan_id is not None:
+            plan = self._plans[plan_id][0]
+            if (plan.start_date, plan.total_days, plan.tz_offset_hours) == (
+                start_date,
+                total_days,
+                tz_offset_hours,
+            ):
+                return plan
 
         with self._get_connection() as conn:
-            try:
-                cursor: sqlite3.Cursor = conn.cursor()
-                cursor.execute(
-                    """
-                    INSERT INTO raw_messages(
-                        sender, msg
-                    ) VALUES (?,?)
-                    """,
-                    (sender, raw),
-                )
+            plan_id = save_plan(
+                conn.cursor(), name, start_date, total_days, tz_offset_hours
+            )
+        self._load_plans()
+        if self._cache is not None:
+            self._cache.clear()
+        return self._plans[plan_id][0]
 
-                msg_id = cursor.lastrowid
+    def day_counter_for(self, plan_id: int = DEFAULT_PLAN_ID) -> AbsoluteDayCounter:
+        return self._plan(plan_id)[1]
 
-            except Exception as e:
-                self.logger.error(
-                    "Failed to post in raw_messages table sender:%s, error:%s",
-                    sender,
-                    e,
-                )
-                return Errors.DB_FAIL
-        self.logger.debug(
-            "The raw information has been posted msg_id:%s sender:%s, message:%s",
-            msg_id,
-            sender,
-            raw,
+    def max_day(self, plan_id: int = DEFAULT_PLAN_ID) -> int:
+        """
+        그 계획에서 오늘까지 읽었어야 하는 마지막 일차. 기본 계획은 예전처럼
+        day_counter 그대로, 다른 계획은 계획 길이를 넘지 않음.
+        시작일 전이면 0.
+        """
+        plan, counter, _ = self._plan(plan_id)
+        if plan.start_date is None:
+            return max(counter.current_day(), 0)
+        return max(min(counter.current_day(), plan.total_days), 0)
+
+    def _find_sender_id(self, cursor: sqlite3.Cursor, sender: str) -> int | None:
+        # 읽기 전용. 쓰는 트랜잭션 안에서 부르면 rollback 될 id 가 캐시에 남을 수 있음
+        sender_id = self._sender_ids.get(sender)
+        if sender_id is None:
+            sender_id = find_sender(cursor, sender)
+            if sender_id is not None:
+                self._sender_ids[sender] = sender_id
+        return sender_id
+
+    def _sender_id_for_write(self, cursor: sqlite3.Cursor, sender: str) -> int:
+        # 처음 보는 이름이면 이 트랜잭션에서 만듦. 캐시는 commit 뒤에 _on_commit 에서
+        sender_id = self._sender_ids.get(sender)
+        if sender_id is None:
+            sender_id = get_or_create_sender(cursor, sender)
+        return sender_id
+
+    def sender_id(self, sender: str) -> int | None:
+        """이름(예전 닉네임 포함)으로 sender id. 기록이 없는 이름이면 None"""
+        with self._get_connection() as conn:
+            return self._find_sender_id(conn.cursor(), sender)
+
+    def _insert_raw(self, cursor: sqlite3.Cursor, sender_id: int, raw: str) -> int:
+        cursor.execute(
+            """
+            INSERT INTO raw_messages(
+                sender_id, msg
+            ) VALUES (?,?)
+            """,
+            (sender_id, raw),
         )
-        return msg_id
+        return cursor.lastrowid
 
-    def post_progress(self, sender: str, raw: str, day: int) -> Errors:
-        msg_id = self._post_raw(sender, raw)
+    def _insert_progress(
+        self,
+        cursor: sqlite3.Cursor,
+        sender: str,
+        raw: str,
+        days: list[int],
+        plan_id: int = DEFAULT_PLAN_ID,
+        delivery: Delivery | None = None,
+    ) -> RecordResult:
+        """
+        raw 메시지는 한 번만 저장하고, days 는 store 에 한 번에 넘김.
+        delivery 가 있으면 그 key 도 같은 트랜잭션에 넣고, 이미 있으면 아무것도 안 넣음.
+        commit 은 호출하는 쪽 트랜잭션에 맡김.
+        """
+        if delivery is not None and not claim_delivery(cursor, *delivery):
+            return RecordResult(sender, list(days), [], plan_id, redelivered=True)
+
+        sender_id = self._sender_id_for_write(cursor, sender)
+        msg_id = self._insert_raw(cursor, sender_id, raw)
+
+        if not days:
+            return RecordResult(
+                sender=sender,
+                days=[],
+                statuses=[],
+                plan_id=plan_id,
+                sender_id=sender_id,
+            )
 
-        with self._get_connection() as conn:
-            try:
-                cursor: sqlite3.Cursor = conn.cursor()
+        store = self._plan(plan_id)[2]
+        statuses, new_days = store.insert_days(cursor, sender_id, days, msg_id)
+        # /집계 용 요약도 같은 트랜잭션에서 갱신
+        record_stats(cursor, sender_id, new_days, plan_id)
 
-                cursor.execute(
-                    """
-                    INSERT INTO progress(
-                        sender, day, msg_id
-                    ) VALUES (?,?,?)
-                    """,
-                    (sender, day, msg_id),
+        return RecordResult(
+            sender=sender,
+            days=list(days),
+            statuses=statuses,
+            plan_id=plan_id,
+            sender_id=sender_id,
+        )
+
+    def _insert_progress_batch(
+        self,
+        cursor: sqlite3.Cursor,
+        records: list[tuple[str, str, list[int]]],
+        plan_id: int = DEFAULT_PLAN_ID,
+        deliveries: list[Delivery | None] | None = None,
+    ) -> list[RecordResult]:
+        """
+        (sender, raw, days) 여러 개를 한 트랜잭션 안에서 기록. 결과는 records 순서.
+        sender 별로 묶어서 넣고 sender_stats 도 sender 당 한 번만 갱신.
+        같은 sender 안에서는 들어온 순서 그대로라 중복 판정은 하나씩 넣을 때랑 같음.
+        deliveries (records 랑 같은 순서) 의 key 가 이미 있으면 그건 건너뜀.
+        """
+        results: list[RecordResult | None] = [None] * len(records)
+        by_sender: dict[str, list[int]] = {}
+        for i, (sender, _, days) in enumerate(records):
+            delivery = deliveries[i] if deliveries is not None else None
+            if delivery is not None and not claim_delivery(cursor, *delivery):
+                results[i] = RecordResult(
+                    sender, list(days), [], plan_id, redelivered=True
                 )
-            except sqlite3.IntegrityError:
-                # UNIQUE(sender, day) 위반 → 이미 그 day는 등록됨
-                self.logger.warning(
-                    "Duplicated progress ignored sender:%s, day:%s", sender, day
+                continue
+            by_sender.setdefault(sender, []).append(i)
+
+        store = self._plan(plan_id)[2]
+        for sender, indexes in by_sender.items():
+            sender_id = self._sender_id_for_write(cursor, sender)
+            new_days: list[int] = []
+            for i in indexes:
+                _, raw, days = records[i]
+                msg_id = self._insert_raw(cursor, sender_id, raw)
+                statuses: list[Errors] = []
+                if days:
+                    statuses, inserted = store.insert_days(
+                        cursor, sender_id, days, msg_id
+                    )
+                    new_days.extend(inserted)
+                results[i] = RecordResult(
+                    sender=sender,
+                    days=list(days),
+                    statuses=statuses,
+                    plan_id=plan_id,
+                    sender_id=sender_id,
                 )
-                return Errors.DB_DUPLICATE_DAY
+            record_stats(cursor, sender_id, new_days, plan_id)
+
+        return results
+
+    def _on_commit(self, result: RecordResult | list[RecordResult]) -> None:
+        # 기록이 commit 되면 새로 만든 sender id 를 캐시에 올리고
+        # 그 sender 의 /진행상황 캐시는 버림
+        for r in result if isinstance(result, list) else [result]:
+            if r.redelivered:
+                continue
+            if self._cache is not None:
+                self._cache.invalidate((r.plan_id, r.sender_id))
+                if r.sender not in self._sender_ids:
+                    # 첫 기록이면 기록 없는 이름용 빈 요약도 버림
+                    self._cache.invalidate((r.plan_id, None))
+            if r.sender_id is not None:
+                self._sender_ids[r.sender] = r.sender_id
+
+    def submit_progress(
+        self,
+        sender: str,
+        raw: str,
+        days: list[int],
+        plan_id: int = DEFAULT_PLAN_ID,
+        delivery: Delivery | None = None,
+    ) -> Future:
+        """
+        기록 작업을 넣고 Future 를 바로 돌려줌. 결과는 RecordResult.
+        write_behind 가 아니면 그 자리에서 commit 하고 끝난 Future 를 돌려줌.
+        어느 쪽이든 commit 이 끝나면 그 sender 의 캐시를 지움.
+        """
+        if self._writer is not None:
+            return self._writer.submit(
+                self._insert_progress, sender, raw, days, plan_id, delivery
+            )
 
-            except Exception as e:
-                self.logger.error(
-                    "Failed to post in progress table sender:%s, days:%s, error:%s",
-                    sender,
-                    day,
-                    e,
+        future: Future = Future()
+        try:
+            with self._get_connection() as conn:
+                result = self._insert_progress(
+                    conn.cursor(), sender, raw, days, plan_id, delivery
                 )
-                return Errors.DB_FAIL
+        except Exception as e:
+            future.set_exception(e)
+            return future
 
+        self._on_commit(result)
+        future.set_result(result)
+        return future
+
+    @_timed("post_progress")
+    def post_progress_many(
+        self,
+        sender: str,
+        raw: str,
+        days: list[int],
+        plan_id: int = DEFAULT_PLAN_ID,
+        delivery: Delivery | None = None,
+    ) -> RecordResult | Errors:
+        """
+        "1-300일차 완료" 같은 메시지를 트랜잭션 하나(commit 한 번)로 기록.
+        실패하면 raw 메시지까지 통째로 rollback 하고 Errors.DB_FAIL.
+        없는 계획이면 Errors.UNKNOWN_PLAN.
+        delivery (key, 받은 시각) 가 있으면 deliveries 에도 같이 넣음.
+        이미 있는 key 면 기록 안 하고 redelivered=True 인 결과를 돌려줌.
+        """
+        if not self.has_plan(plan_id):
+            return Errors.UNKNOWN_PLAN
+
+        try:
+            result = self.submit_progress(
+                sender, raw, days, plan_id, delivery
+            ).result()
+        except Exception as e:
+            self.logger.error(
+                "Failed to post in progress table sender:%s, days:%s, error:%s",
+                sender,
+                days,
+                e,
+            )
+            return Errors.DB_FAIL
+
+        if result.redelivered:
+            self.logger.info("Duplicated delivery ignored key:%s", delivery[0])
+            return result
+        if result.duplicate_count:
+            self.logger.warning(
+                "Duplicated progress ignored sender:%s, days:%s",
+                sender,
+                [d for d, s in zip(days, result.statuses) if s != Errors.SUCCESS],
+            )
         self.logger.info(
-            "The progress posted successfully, sender:%s, days:%s", sender, day
+            "The progress posted successfully, sender:%s, inserted:%s, duplicated:%s",
+            sender,
+            result.inserted_count,
+            result.duplicate_count,
         )
-        return Errors.SUCCESS
+        return result
+
+    @_timed("post_progress_batch")
+    def post_progress_batch(
+        self,
+        records: Iterable[tuple[str, str, list[int]]],
+        plan_id: int = DEFAULT_PLAN_ID,
+        deliveries: list[Delivery | None] | None = None,
+    ) -> list[RecordResult] | Errors:
+        """
+        (sender, raw, days) 묶음을 트랜잭션 하나(commit 한 번)로 기록하고
+        RecordResult 들을 넣은 순서대로 돌려줌.
+        하나라도 실패하면 전부 rollback 하고 Errors.DB_FAIL.
+        deliveries 는 post_progress_many 의 delivery 를 records 순서대로.
+        """
+        records = [(sender, raw, list(days)) for sender, raw, days in records]
+        if not records:
+            return []
+        if not self.has_plan(plan_id):
+            return Errors.UNKNOWN_PLAN
+
+        try:
+            if self._writer is not None:
+                results = self._writer.submit(
+                    self._insert_progress_batch, records, plan_id, deliveries
+                ).result()
+            else:
+                with self._get_connection() as conn:
+                    results = self._insert_progress_batch(
+                        conn.cursor(), records, plan_id, deliveries
+                    )
+                self._on_commit(results)
+        except Exception as e:
+            self.logger.error(
+                "Failed to post a batch of %s records, error:%s", len(records), e
+            )
+            return Errors.DB_FAIL
 
-    def get_progress(self, sender: str) -> ProgressSummary | Errors:
+        self.logger.info(
+            "The batch posted successfully, records:%s, inserted:%s, duplicated:%s",
+            len(results),
+            sum(r.inserted_count for r in results),
+            sum(r.duplicate_count for r in results),
+        )
+        return results
+
+    def post_progress(
+        self, sender: str, raw: str, day: int, plan_id: int = DEFAULT_PLAN_ID
+    ) -> Errors:
+        result = self.post_progress_many(sender, raw, [day], plan_id)
+        if isinstance(result, Errors):
+            return result
+        return result.status
+
+    @_timed("get_progress")
+    def get_progress(
+        self, sender: str, plan_id: int = DEFAULT_PLAN_ID
+    ) -> ProgressSummary | Errors:
+        if not self.has_plan(plan_id):
+            return Errors.UNKNOWN_PLAN
+        max_day = self.max_day(plan_id)
+        if max_day < 1:
+            # 아직 시작 안 한 계획
+            return Errors.DATE_ERROR
+        try:
+            # 캐시는 (plan_id, sender_id) 로 잡음. 예전 닉네임으로 와도 같은 칸
+            sender_id = self._sender_ids.get(sender)
+            if sender_id is None:
+                sender_id = self.sender_id(sender)
+        except Exception as e:
+            self.logger.error(
+                "Failed to get from senders table sender:%s, error:%s", sender, e
+            )
+            return Errors.DB_FAIL
+        key = (plan_id, sender_id)
+
+        # 기록 없는 이름은 전부 빈 요약이라 (plan_id, None) 한 칸을 같이 씀
+        if self._cache is not None:
+            if self.multiprocess:
+                self._sync_cache_with_other_processes()
+            cached = self._cache.get(key, max_day)
+            if cached is not None:
+                if cached.sender != sender:
+                    cached = dataclasses.replace(cached, sender=sender)
+                return cached
+            generation = self._cache.generation
 
         with self._get_connection() as conn:
             try:
                 cursor: sqlite3.Cursor = conn.cursor()
 
-                cursor.execute(
-                    """
-                    SELECT 
-                    COUNT(*) as completed
-                    FROM progress
-                    WHERE sender = ?
-                    """,
-                    (sender,),
-                )
-
-                row = cursor.fetchone()
-                completed = (
-                    row["completed"] if row and row["completed"] is not None else 0
-                )
-
-                max_day = self.day_counter.current_day()
-
-                cursor.execute(
-                    """
-                    SELECT r.day 
-                    FROM reading_plan AS r
-                    LEFT JOIN progress as p 
-                    ON p.sender = ?
-                    AND r.day = p.day
-                    WHERE r.day <= ?
-                    AND p.day IS NULL
-                    ORDER BY r.day
-                    """,
-                    (sender, max_day),
+                done_days = (
+                    []
+                    if sender_id is None
+                    else self._plan(plan_id)[2].completed_days(cursor, sender_id)
                 )
-                missing_days = [int(r["day"]) for r in cursor.fetchall()]
             except Exception as e:
                 self.logger.error(
                     "Failed to get from progress table sender:%s, error:%s", sender, e
                 )
                 return Errors.DB_FAIL
 
-        return ProgressSummary(
+        spans = missing_spans(done_days, max_day)
+
+        summary = ProgressSummary(
             sender=sender,
-            completed_count=completed,
+            completed_count=len(done_days),
             max_day=max_day,
-            missing_days=missing_days,
+            missing_days=expand_spans(spans),
+            missing_ranges=compress_spans(spans),
         )
 
-    def get_all_progresses(self) -> list[ProgressSummary] | Errors:
+        if self._cache is not None:
+            self._cache.put(key, max_day, summary, generation)
+        return summary
+
+    def cache_stats(self) -> dict[str, int]:
+        if self._cache is None:
+            return {"hits": 0, "misses": 0, "size": 0, "maxsize": 0}
+        return self._cache.stats()
+
+    @_timed("get_all_progresses")
+    def get_all_progresses(
+        self, plan_id: int = DEFAULT_PLAN_ID
+    ) -> list[ProgressSummary] | Errors:
+        if not self.has_plan(plan_id):
+            return Errors.UNKNOWN_PLAN
+        if self.max_day(plan_id) < 1:
+            return Errors.DATE_ERROR
+
         with self._get_connection() as conn:
             try:
                 cursor: sqlite3.Cursor = conn.cursor()
 
-                cursor.execute(
-                    """
-                    SELECT 
-                        sender,
-                        COUNT(*) as completed
-                    FROM progress
-                    GROUP BY sender
-                    ORDER BY sender
-                    """
-                )
+                # 기록할 때 갱신해둔 요약 테이블을 이름 순서로 읽기만 함
+                rows = read_stats(cursor, plan_id)
 
                 progresses = []
-                rows = cursor.fetchall()
-                max_day = self.day_counter.current_day()
-                for row in rows:
-                    sender = row["sender"]
-                    completed = row["completed"]
-
+                max_day = self.max_day(plan_id)
+                for sender, completed, _ in rows:
                     prog = ProgressSummary(sender, completed, max_day, [])
 
                     progresses.append(prog)
@@ -220,3 +659,73 @@ class Repository:
                 return Errors.DB_FAIL
 
         return progresses
+
+    def verify_sender_stats(
+        self, plan_id: int = DEFAULT_PLAN_ID
+    ) -> list[StatsDrift] | Errors:
+        """
+        sender_stats 가 실제 기록이랑 안 맞는 sender 목록. 비어있으면 정상.
+        """
+        with self._get_connection() as conn:
+            try:
+                store = get_store(self._layout, plan_id)
+                return verify_stats(conn.cursor(), store, plan_id)
+            except Exception as e:
+                self.logger.error("Failed to verify sender_stats error:%s", e)
+                return Errors.DB_FAIL
+
+    def rebuild_sender_stats(self, plan_id: int = DEFAULT_PLAN_ID) -> int | Errors:
+        """
+        실제 기록을 다시 세서 sender_stats 를 새로 채움. 채운 sender 수를 돌려줌.
+        """
+        try:
+            with self._pool.connection() as conn:
+                store = get_store(self._layout, plan_id)
+                rebuilt = rebuild_stats(conn, store, plan_id)
+        except Exception as e:
+            self.logger.error("Failed to rebuild sender_stats error:%s", e)
+            return Errors.DB_FAIL
+
+        self.logger.info("The sender_stats rebuilt, senders:%s", rebuilt)
+        return rebuilt
+
+    def rename_sender(self, old: str, new: str) -> Errors:
+        """
+        닉네임 변경. new 를 old 와 같은 사람의 별칭으로 넣고 표시 이름을 new 로 바꿈.
+        기록 행은 sender id 를 들고 있어서 그대로 둠 (예전 이름으로 와도 같은 사람).
+        - old 로 기록한 적이 없으면 Errors.UNKNOWN_SENDER
+        - new 로 따로 기록한 사람이 이미 있으면 Errors.DUPLICATE_SENDER (합치진 않음)
+        """
+        with self._get_connection() as conn:
+            try:
+                cursor = conn.cursor()
+                sender_id = find_sender(cursor, old)
+                if sender_id is None:
+                    return Errors.UNKNOWN_SENDER
+                if find_sender(cursor, new) not in (None, sender_id):
+                    return Errors.DUPLICATE_SENDER
+                add_alias(cursor, sender_id, new)
+            except Exception as e:
+                self.logger.error(
+                    "Failed to rename sender old:%s, new:%s, error:%s", old, new, e
+                )
+                return Errors.DB_FAIL
+
+        self._sender_ids[old] = sender_id
+        self._sender_ids[new] = sender_id
+        # /집계 에 나오는 이름이 바뀌니까 캐시도 비움
+        if self._cache is not None:
+            self._cache.clear()
+        self.logger.info("The sender renamed old:%s, new:%s", old, new)
+        return Errors.SUCCESS
+
+    def sweep_deliveries(self, before: float) -> int | Errors:
+        with self._get_connection() as conn:
+            try:
+                swept = sweep_deliveries(conn.cursor(), before)
+            except Exception as e:
+                self.logger.error("Failed to sweep deliveries error:%s", e)
+                return Errors.DB_FAIL
+
+        self.logger.info("Swept %s delivery keys", swept)
+        return swept
@@ -0,0 +1,116 @@
+# db/sender_stats.py
+
+import sqlite3
+from dataclasses import dataclass
+
+from .progress_store import DEFAULT_PLAN_ID
+from .senders import sender_names
+
+
+@dataclass
+class StatsDrift:
+    """
+    sender_stats 랑 실제 기록(store)이 안 맞는 sender 하나. sender 는 지금 표시 이름.
+    expected / actual 은 (완료 수, 마지막 일차), 행이 없으면 None.
+    """
+
+    sender: str
+    expected: tuple[int, int] | None
+    actual: tuple[int, int] | None
+
+
+def record_stats(
+    cursor: sqlite3.Cursor,
+    sender_id: int,
+    new_days: list[int],
+    plan_id: int = DEFAULT_PLAN_ID,
+) -> None:
+    """
+    기록하는 트랜잭션 안에서 새로 들어간 일차만큼 sender_stats 를 올림.
+    """
+    if not new_days:
+        return
+
+    cursor.execute(
+        """
+        INSERT INTO sender_stats(
+            plan_id, sender_id, completed_count, last_day
+        ) VALUES (?,?,?,?)
+        ON CONFLICT(plan_id, sender_id) DO UPDATE SET
+            completed_count = completed_count + excluded.completed_count,
+            last_day = MAX(last_day, excluded.last_day),
+            last_update = CURRENT_TIMESTAMP
+        """,
+        (plan_id, sender_id, len(new_days), max(new_days)),
+    )
+
+
+def read_stats(
+    cursor: sqlite3.Cursor, plan_id: int = DEFAULT_PLAN_ID
+) -> list[tuple[str, int, int]]:
+    """
+    [(표시 이름, 완료 수, 마지막 일차), ...] 이름 순. 닉네임이 바뀐 사람은 지금 이름으로 나옴.
+    """
+    cursor.execute(
+        """
+        SELECT s.name, t.completed_count, t.last_day
+        FROM sender_stats AS t
+        JOIN senders AS s ON s.id = t.sender_id
+        WHERE t.plan_id = ?
+        ORDER BY s.name
+        """,
+        (plan_id,),
+    )
+    return [(r[0], r[1], r[2]) for r in cursor.fetchall()]
+
+
+def _read_stats_by_id(
+    cursor: sqlite3.Cursor, plan_id: int
+) -> dict[int, tuple[int, int]]:
+    cursor.execute(
+        """
+        SELECT sender_id, completed_count, last_day
+        FROM sender_stats
+        WHERE plan_id = ?
+        """,
+        (plan_id,),
+    )
+    return {r[0]: (r[1], r[2]) for r in cursor.fetchall()}
+
+
+def verify_stats(
+    cursor: sqlite3.Cursor, store, plan_id: int = DEFAULT_PLAN_ID
+) -> list[StatsDrift]:
+    expected = {s: (c, d) for s, c, d in store.completed_stats(cursor)}
+    actual = _read_stats_by_id(cursor, plan_id)
+    names = sender_names(cursor)
+
+    drifts = [
+        StatsDrift(names.get(i, str(i)), expected.get(i), actual.get(i))
+        for i in expected.keys() | actual.keys()
+        if expected.get(i) != actual.get(i)
+    ]
+    return sorted(drifts, key=lambda d: d.sender)
+
+
+def rebuild_stats(
+    conn: sqlite3.Connection, store, plan_id: int = DEFAULT_PLAN_ID
+) -> int:
+    """
+    store 전체를 다시 세서 sender_stats 를 새로 채움. 채운 sender 수를 돌려줌.
+    """
+    with conn:
+        cursor = conn.cursor()
+        # 세는 동안 다른 기록이 끼어들지 않게 처음부터 write lock
+        cursor.execute("BEGIN IMMEDIATE")
+        stats = store.completed_stats(cursor)
+        cursor.execute("DELETE FROM sender_stats WHERE plan_id = ?", (plan_id,))
+        cursor.executemany(
+            """
+            INSERT INTO sender_stats(
+                plan_id, sender_id, completed_count, last_day
+            ) VALUES (?,?,?,?)
+            """,
+            [(plan_id, s, c, d) for s, c, d in stats],
+        )
+    return len(stats)
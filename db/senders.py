@@ -0,0 +1,46 @@
+# db/senders.py
+
+import sqlite3
+
+
+def find_sender(cursor: sqlite3.Cursor, name: str) -> int | None:
+    """이름(예전 닉네임 포함)으로 sender id. 처음 보는 이름이면 None"""
+    cursor.execute("SELECT sender_id FROM sender_aliases WHERE name = ?", (name,))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def get_or_create_sender(cursor: sqlite3.Cursor, name: str) -> int:
+    """
+    기록하는 트랜잭션 안에서 부름. 처음 보는 이름이면 senders 에 새로 만들고
+    그 이름을 별칭으로 등록함.
+    """
+    sender_id = find_sender(cursor, name)
+    if sender_id is not None:
+        return sender_id
+
+    cursor.execute("INSERT INTO senders(name) VALUES (?)", (name,))
+    sender_id = cursor.lastrowid
+    cursor.execute(
+        "INSERT INTO sender_aliases(name, sender_id) VALUES (?,?)", (name, sender_id)
+    )
+    return sender_id
+
+
+def add_alias(cursor: sqlite3.Cursor, sender_id: int, name: str) -> None:
+    """
+    닉네임 변경. 새 이름을 별칭으로 하나 넣고 표시 이름만 바꿈.
+    기록 행은 전부 id 를 들고 있어서 건드릴 필요 없음 (예전 이름으로 와도 같은 사람).
+    예전에 쓰던 이름으로 돌아가는 거면 별칭은 이미 있어서 표시 이름만 바뀜.
+    """
+    cursor.execute(
+        "INSERT OR IGNORE INTO sender_aliases(name, sender_id) VALUES (?,?)",
+        (name, sender_id),
+    )
+    cursor.execute("UPDATE senders SET name = ? WHERE id = ?", (name, sender_id))
+
+
+def sender_names(cursor: sqlite3.Cursor) -> dict[int, str]:
+    """sender id -> 지금 표시 이름"""
+    cursor.execute("SELECT id, name FROM senders")
+    return {r[0]: r[1] for r in cursor.fetchall()}
@@ -0,0 +1,184 @@
+# db/writer.py
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable
+
+WriteFn = Callable[..., Any]
+
+_STOP = object()
+
+
+class GroupCommitWriter:
+    """
+    쓰기 작업을 큐에 모았다가 전용 writer 스레드 하나가 묶어서 commit 하는 놈.
+    - submit(fn, *args): fn(cursor, *args) 를 큐에 넣고 Future 를 돌려줌
+      (commit 이 끝나야 Future 가 풀림 → 호출하는 쪽은 그걸 ack 로 쓰면 됨)
+    - max_batch: 한 트랜잭션에 묶을 최대 작업 수
+    - max_delay: 첫 작업이 들어온 뒤 더 모으려고 기다리는 최대 시간(초)
+    - on_commit: commit 직후, Future 를 풀기 전에 작업 결과마다 불림 (캐시 지우기 등)
+    - close(): 큐에 남은 거 다 commit 하고 스레드 종료
+    작업 하나가 터져도 SAVEPOINT 로 그 작업만 rollback 되고 나머지는 commit 됨.
+    fork 된 자식 프로세스에선 스레드가 안 따라오니까, 자식에서 처음 submit 할 때
+    큐/스레드를 새로 만듦 (부모 큐에 남은 건 부모가 commit).
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], sqlite3.Connection],
+        max_batch: int = 256,
+        max_delay: float = 0.005,
+        on_commit: Callable[[Any], None] | None = None,
+    ) -> None:
+        if max_batch < 1:
+            raise ValueError(f"max_batch must be >= 1, got {max_batch}")
+
+        self._connect = connect
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._on_commit = on_commit
+
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self._pid = os.getpid()
+
+    def _after_fork(self) -> None:
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = os.getpid()
+
+    def submit(self, fn: WriteFn, *args: Any) -> Future:
+        if self._pid != os.getpid():
+            self._after_fork()
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The writer is closed")
+
+            # 스레드는 처음 쓸 때 띄움
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="sqlite-writer", daemon=True
+                )
+                self._thread.start()
+
+            future: Future = Future()
+            self._queue.put((fn, args, future))
+        return future
+
+    def _collect(self, first: Any) -> tuple[list, bool]:
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+
+        while len(batch) < self.max_batch:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    job = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+
+            if job is _STOP:
+                return batch, True
+            batch.append(job)
+
+        return batch, False
+
+    def _commit(self, conn: sqlite3.Connection, batch: list) -> None:
+        results: list[tuple[Future, Any, BaseException | None]] = []
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            for fn, args, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                cursor.execute("SAVEPOINT job")
+                try:
+                    value = fn(cursor, *args)
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO job")
+                    cursor.execute("RELEASE job")
+                    results.append((future, None, e))
+                    continue
+                cursor.execute("RELEASE job")
+                results.append((future, value, None))
+            cursor.execute("COMMIT")
+        except Exception as e:
+            if conn.in_transaction:
+                conn.rollback()
+            for fn, args, future in batch:
+                if not future.done():
+                    if not future.running():
+                        future.set_running_or_notify_cancel()
+                    future.set_exception(e)
+            return
+
+        # commit 이 끝난 다음에만 결과를 알려줌
+        for future, value, error in results:
+            if error is not None:
+                future.set_exception(error)
+                continue
+            if self._on_commit is not None:
+                try:
+                    self._on_commit(value)
+                except Exception as e:
+                    future.set_exception(e)
+                    continue
+            future.set_result(value)
+
+    def _fail_pending(self, error: BaseException) -> None:
+        while True:
+            job = self._queue.get()
+            if job is _STOP:
+                return
+            _, _, future = job
+            if future.set_running_or_notify_cancel():
+                future.set_exception(error)
+
+    def _run(self) -> None:
+        try:
+            conn = self._connect()
+        except Exception as e:
+            # 커넥션도 못 열면 기다리는 애들한테 에러를 돌려주고 끝냄
+            self._fail_pending(e)
+            return
+
+        conn.isolation_level = None  # 트랜잭션은 직접 관리
+        try:
+            stop = False
+            while not stop:
+                job = self._queue.get()
+                if job is _STOP:
+                    break
+                batch, stop = self._collect(job)
+                self._commit(conn, batch)
+        finally:
+            conn.close()
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def close(self, timeout: float | None = None) -> None:
+        if self._pid != os.getpid():
+            self._after_fork()
+
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+
+        if self._thread is not None:
+            self._thread.join(timeout)
@@ -3,3 +3,5 @@ from .errors import Errors
 from .message_kind import MessageKind
 from .progress_summary import ProgressSummary
 from .commands import Commands
+from .record_result import RecordResult
+from .plan import Plan
@@ -10,3 +10,10 @@ class Errors(str, Enum):
 
     DB_FAIL = auto()
     DB_DUPLICATE_DAY = auto()
+    # 릴레이가 다시 보낸 기록 메시지 (delivery key 가 이미 있음)
+    DUPLICATE_DELIVERY = auto()
+
+    UNKNOWN_PLAN = auto()
+
+    UNKNOWN_SENDER = auto()
+    DUPLICATE_SENDER = auto()
@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+from datetime import date
+
+
+@dataclass(frozen=True)
+class Plan:
+    id: int
+    name: str
+    total_days: int
+    # None 이면 기본 계획: config 의 START_DATE (Repository 에 넘긴 day_counter) 를 따름
+    start_date: date | None = None
+    tz_offset_hours: int = 3
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -7,3 +7,5 @@ class ProgressSummary:
     completed_count: int
     max_day: int
     missing_days: list[int]
+    # Formatter 가 바로 쓸 수 있게 미리 묶어둔 빠진 구간 [(d,), (s, e), ...]
+    missing_ranges: list[tuple[int, ...]] | None = field(default=None, compare=False)
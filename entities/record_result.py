@@ -0,0 +1,33 @@
+from dataclasses import dataclass
+
+from .errors import Errors
+
+
+@dataclass
+class RecordResult:
+    sender: str
+    days: list[int]
+    statuses: list[Errors]  # days 와 같은 순서로 SUCCESS / DB_DUPLICATE_DAY
+    plan_id: int = 1
+    sender_id: int | None = None  # senders 테이블 id (기록한 쪽에서 채움)
+    # delivery key 가 이미 있어서 아무것도 안 넣은 재전송
+    redelivered: bool = False
+
+    @property
+    def inserted_count(self) -> int:
+        return sum(1 for s in self.statuses if s == Errors.SUCCESS)
+
+    @property
+    def duplicate_count(self) -> int:
+        return sum(1 for s in self.statuses if s == Errors.DB_DUPLICATE_DAY)
+
+    @property
+    def status(self) -> Errors:
+        """
+        메시지 하나에 대한 대표 상태. 예전처럼 마지막 일차의 결과를 따름.
+        """
+        if self.redelivered:
+            return Errors.DUPLICATE_DELIVERY
+        if not self.statuses:
+            return Errors.DATE_ERROR
+        return self.statuses[-1]
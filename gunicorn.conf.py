@@ -0,0 +1,37 @@
+# gunicorn.conf.py
+"""
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+- 워커 수는 WEB_CONCURRENCY (기본: 코어 수), 워커당 스레드는 GUNICORN_THREADS
+- preload_app 은 끔: 워커가 fork 된 다음에 wsgi.py 를 읽어서 커넥션/캐시/로그
+  스레드를 워커마다 새로 만듦 (켜도 pool/writer/로그는 fork 뒤에 다시 만들긴 함)
+- 스키마 마이그레이션은 워커 뜨기 전에 master 에서 한 번만 돌림
+- 로그 파일은 워커들이 같이 씀. 크기로 돌리는 건 프로세스마다 따로 돌아서
+  꼬이니까 config.py 에서 LOG_MAX_BYTES = 0 으로 끄고 logrotate 같은 걸 쓸 것
+"""
+
+import os
+import multiprocessing
+
+from config import PORT
+
+bind = f"0.0.0.0:{PORT}"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+worker_class = "gthread"
+preload_app = False
+timeout = 30
+
+# 워커들은 master 의 환경변수를 물려받음 → wsgi.py 가 prefork 모드로 앱을 만듦
+os.environ["BIBLE_PREFORK"] = "1"
+
+
+def on_starting(server):
+    from config import DB_PATH, TOTAL_DAYS
+
+    from db.maintenance import migrate_database
+
+    for migration in migrate_database(DB_PATH, TOTAL_DAYS):
+        server.log.info(
+            "Applied migration version:%s, name:%s", migration.version, migration.name
+        )
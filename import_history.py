@@ -0,0 +1,268 @@
+# import_history.py
+"""
+카톡 대화 내보내기(.txt)나 JSONL({"sender", "msg"} 한 줄에 하나)을 읽어서
+기록 메시지만 DB 에 넣는 커맨드. 새 방 붙이거나 서버 죽었다 살렸을 때 씀.
+
+    python import_history.py chat.txt
+    python import_history.py messages.jsonl --chunk-size 1000
+    python import_history.py chat.txt --restart      # 체크포인트 무시하고 처음부터
+
+파일은 한 줄씩 흘려보내고 chunk-size 개씩 트랜잭션 하나로 넣어서 파일이 커도
+메모리는 그대로. chunk 하나 commit 할 때마다 <파일>.checkpoint 에 어디까지 읽었는지
+적어두고, 다시 돌리면 거기서부터 이어감.
+(commit 직후 체크포인트 쓰기 전에 죽으면 그 chunk 는 한 번 더 들어가는데,
+이미 있는 일차는 중복으로 무시되고 raw_messages 만 한 번 더 쌓임)
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import logging
+import argparse
+
+from typing import IO, Iterable, Iterator
+
+from entities import Errors
+from entities import MessageKind
+
+from usecase import MessageHandler
+from usecase import MessageClassifier
+
+# (메시지, 이 메시지 다음 바이트 위치) 를 흘려보냄. 위치는 체크포인트에 적힘
+Message = dict[str, str]
+Positioned = tuple[Message, int]
+
+# PC: [홍길동] [오후 3:45] 1일차 완료
+_PC_LINE = re.compile(r"^\[(?P<sender>[^\]]+)\] \[오[전후] \d{1,2}:\d{2}\] (?P<msg>.*)$")
+# 안드로이드: 2024년 3월 5일 오후 3:45, 홍길동 : 1일차 완료
+# iOS: 2024. 3. 5. 오후 3:45, 홍길동 : 1일차 완료
+_MOBILE_LINE = re.compile(
+    r"^\d{4}(?:년 \d{1,2}월 \d{1,2}일|\. \d{1,2}\. \d{1,2}\.) 오[전후] \d{1,2}:\d{2}"
+    r", (?P<sender>.+?) : (?P<msg>.*)$"
+)
+# 날짜 구분선, 입장/퇴장 같은 시스템 메시지. 메시지는 아니지만 앞 메시지를 끝냄
+_BOUNDARY = re.compile(
+    r"^(?:-+ \d{4}년 .* -+"
+    r"|\d{4}년 \d{1,2}월 \d{1,2}일 \S+요일"
+    r"|\d{4}(?:년 \d{1,2}월 \d{1,2}일|\. \d{1,2}\. \d{1,2}\.) 오[전후] \d{1,2}:\d{2}[:,] .*)$"
+)
+
+
+def read_lines(f: IO[bytes], offset: int = 0) -> Iterator[tuple[str, int, int]]:
+    """
+    바이너리 파일에서 (줄, 줄 시작 위치, 줄 끝 위치) 를 하나씩.
+    위치를 정확히 알아야 해서 텍스트 모드 대신 직접 디코딩함.
+    """
+    f.seek(offset)
+    pos = offset
+    for raw in f:
+        start, pos = pos, pos + len(raw)
+        line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+        if start == 0:
+            line = line.lstrip("\ufeff")
+        yield line, start, pos
+
+
+def parse_jsonl(lines: Iterable[tuple[str, int, int]]) -> Iterator[Positioned]:
+    for line, _, end in lines:
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(data, dict) and data.get("msg"):
+            yield {"sender": str(data.get("sender", "")), "msg": str(data["msg"])}, end
+
+
+def parse_kakao(lines: Iterable[tuple[str, int, int]]) -> Iterator[Positioned]:
+    """
+    카톡 내보내기 txt. 헤더 없는 줄은 앞 메시지에 이어 붙임 (여러 줄 메시지).
+    메시지 하나는 다음 메시지/구분선이 나와야 끝난 걸 알 수 있어서,
+    위치는 그 다음 줄 시작으로 적음 (이어서 읽을 때 거기서 시작).
+    """
+    current: Message | None = None
+    end = 0
+    for line, start, end in lines:
+        m = _PC_LINE.match(line) or _MOBILE_LINE.match(line)
+        if m is None and _BOUNDARY.match(line) is None:
+            if current is not None:
+                current["msg"] += "\n" + line
+            continue
+
+        if current is not None:
+            yield current, start
+        current = (
+            {"sender": m.group("sender"), "msg": m.group("msg")} if m else None
+        )
+
+    # 마지막 메시지는 파일 끝에서 끝남
+    if current is not None:
+        yield current, end
+
+
+def chunked(
+    messages: Iterable[Positioned], size: int
+) -> Iterator[tuple[list[Message], int]]:
+    chunk: list[Message] = []
+    offset = -1
+    for message, offset in messages:
+        chunk.append(message)
+        if len(chunk) >= size:
+            yield chunk, offset
+            chunk = []
+    if chunk:
+        yield chunk, offset
+
+
+class ImportFailed(RuntimeError):
+    """chunk 기록이 DB 에서 실패함. 체크포인트는 그 chunk 앞에 그대로 있음"""
+
+
+def load_checkpoint(path: str, source: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            checkpoint = json.load(f)
+    except FileNotFoundError:
+        return {"source": source, "offset": 0, "messages": 0, "records": 0}
+
+    if checkpoint.get("source") != source:
+        raise SystemExit(
+            f"{path} belongs to {checkpoint.get('source')!r}, not {source!r}"
+            " (use --restart or --checkpoint)"
+        )
+    return checkpoint
+
+
+def save_checkpoint(path: str, checkpoint: dict) -> None:
+    # 쓰다가 죽어도 예전 체크포인트는 남게 임시 파일에 쓰고 바꿔치기
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def import_file(
+    path: str,
+    classifier: MessageClassifier,
+    handler: MessageHandler,
+    fmt: str = "auto",
+    chunk_size: int = 500,
+    checkpoint_path: str | None = None,
+    restart: bool = False,
+    progress: IO[str] | None = None,
+) -> dict:
+    """
+    path 를 처음(또는 체크포인트)부터 끝까지 넣고 체크포인트 내용을 돌려줌.
+    records 는 실제로 들어간 기록 메시지 수 (중복/날짜 오류 빼고).
+    chunk 기록이 실패하면 ImportFailed. 다시 돌리면 그 chunk 부터 이어서 함.
+    """
+    if fmt == "auto":
+        fmt = "jsonl" if path.endswith((".jsonl", ".json")) else "kakao"
+    parse = parse_jsonl if fmt == "jsonl" else parse_kakao
+
+    source = os.path.abspath(path)
+    checkpoint_path = checkpoint_path or path + ".checkpoint"
+    if restart and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    checkpoint = load_checkpoint(checkpoint_path, source)
+
+    total = os.path.getsize(path)
+    started = time.perf_counter()
+    done_before = checkpoint["messages"]
+
+    with open(path, "rb") as f:
+        lines = read_lines(f, checkpoint["offset"])
+        for chunk, offset in chunked(parse(lines), chunk_size):
+            classified = [
+                c
+                for c in classifier.classify_many(chunk)
+                if c.kind == MessageKind.RECORD
+            ]
+            results = handler.handle_many(classified)
+            # DB 가 잠겨 있었던 거면 체크포인트를 넘기지 않아야 다시 돌릴 때 이 chunk 부터 함
+            if Errors.DB_FAIL in results:
+                raise ImportFailed(
+                    f"failed to record messages before offset {offset}"
+                    f" (resume from offset {checkpoint['offset']})"
+                )
+
+            checkpoint["offset"] = offset
+            checkpoint["messages"] += len(chunk)
+            checkpoint["records"] += sum(1 for r in results if r == Errors.SUCCESS)
+            save_checkpoint(checkpoint_path, checkpoint)
+
+            if progress is not None:
+                elapsed = time.perf_counter() - started
+                rate = (checkpoint["messages"] - done_before) / max(elapsed, 1e-9)
+                progress.write(
+                    f"\r{offset * 100 / max(total, 1):5.1f}%  "
+                    f"{checkpoint['messages']} messages  "
+                    f"{checkpoint['records']} records  {rate:,.0f} msg/s"
+                )
+                progress.flush()
+
+    if progress is not None:
+        progress.write("\n")
+    return checkpoint
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(prog="python import_history.py")
+    ap.add_argument("path", help="카톡 내보내기 .txt 또는 .jsonl")
+    ap.add_argument("--format", choices=["auto", "kakao", "jsonl"], default="auto")
+    ap.add_argument("--chunk-size", type=int, default=500)
+    ap.add_argument("--checkpoint", help="체크포인트 파일 (기본: <path>.checkpoint)")
+    ap.add_argument("--restart", action="store_true", help="체크포인트 무시")
+    ap.add_argument("--db", help="sqlite 파일 경로 (기본: config.DB_PATH)")
+    args = ap.parse_args(argv)
+
+    import config
+    from config import DB_PATH, TOTAL_DAYS, START_DATE
+
+    from db import Repository
+    from utilities import DayParser
+    from utilities import AbsoluteDayCounter
+
+    # 서버 (build_chat_service) 랑 같은 offset 이어야 같은 일차로 기록됨
+    clock = AbsoluteDayCounter(
+        start_date=START_DATE,
+        tz_offset_hours=getattr(config, "TZ_OFFSET_HOURS", 3),
+    )
+    repo = Repository(
+        db_path=args.db or DB_PATH,
+        day_counter=clock,
+        total_days=TOTAL_DAYS,
+        logging_level=logging.WARNING,
+        storage_profile=getattr(config, "SQLITE_PROFILE", "wal"),
+        storage_layout=getattr(config, "DB_STORAGE_LAYOUT", "rows"),
+    )
+    classifier = MessageClassifier(DayParser(cache_size=1024))
+    handler = MessageHandler(repo, clock)
+
+    try:
+        checkpoint = import_file(
+            args.path,
+            classifier,
+            handler,
+            fmt=args.format,
+            chunk_size=args.chunk_size,
+            checkpoint_path=args.checkpoint,
+            restart=args.restart,
+            progress=sys.stderr,
+        )
+    except ImportFailed as e:
+        raise SystemExit(f"\nimport stopped: {e}") from None
+    finally:
+        repo.close()
+
+    print(
+        f"imported {checkpoint['messages']} messages,"
+        f" {checkpoint['records']} records posted"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import os
+import json
+import time
+import asyncio
+import threading
+
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+# app 패키지가 Flask 를 같이 import 함
+pytest.importorskip("flask")
+
+from app.asgi import create_asgi_app  # noqa: E402
+
+db_path = "./tests/db/test_asgi.db"
+
+for suffix in ("", "-wal", "-shm"):
+    try:
+        os.remove(db_path + suffix)
+    except FileNotFoundError:
+        pass
+
+settings = SimpleNamespace(
+    DB_PATH=db_path,
+    START_DATE=date.today() - timedelta(days=9),
+    TOTAL_DAYS=30,
+    LOG_LEVELS={"db": "ERROR", "msg_handler": "ERROR", "classifier": "ERROR"},
+    BATCH_MAX_BYTES=200,
+    ASGI_DB_WORKERS=1,
+)
+
+app = create_asgi_app(settings)
+
+
+async def _call(method, path, body=b"", headers=()):
+    sent = []
+    chunks = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        return chunks.pop(0) if chunks else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "headers": list(headers)}
+    await app(scope, receive, send)
+    return sent[0]["status"], sent[1]["body"]
+
+
+def call(method, path, body=b"", headers=()):
+    return asyncio.run(_call(method, path, body, headers))
+
+
+def _post(data):
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def test_message_reply_matches_flask_contract():
+    status, body = call("POST", "/", _post({"sender": "a", "msg": "1-2일차 완료"}))
+    assert (status, body) == (200, b'""\n')
+
+    status, body = call("POST", "/", _post({"sender": "a", "msg": "/진행상황"}))
+    assert status == 200
+    assert json.loads(body)["msg"][1].startswith("2/")
+    assert "진행상황".encode("utf-8") in body
+
+
+def test_batch_and_limits():
+    status, body = call(
+        "POST", "/batch", _post([{"sender": "b", "msg": "1일차 완료"}, {"msg": "hi"}])
+    )
+    assert (status, json.loads(body)) == (200, ["", ""])
+
+    assert call("POST", "/batch", b"{}")[0] == 400
+    assert call("POST", "/batch", b"[" + b" " * 300 + b"]")[0] == 413
+    big = [(b"content-length", b"10000")]
+    assert call("POST", "/batch", b"[]", headers=big)[0] == 413
+
+
+def test_routes_and_metrics():
+    assert call("GET", "/")[0] == 405
+    assert call("GET", "/nope")[0] == 404
+    status, body = call("GET", "/metrics")
+    assert status == 200
+    assert b"bible_asgi_pending_requests" in body
+
+
+def test_intake_continues_while_db_is_busy():
+    # DB 스레드가 막혀 있어도 루프는 다음 요청을 받아서 답함
+    release = threading.Event()
+    original = app.service.reply
+
+    def slow_reply(data):
+        if data.get("sender") == "slow":
+            release.wait(5)
+        return original(data)
+
+    async def scenario():
+        app.service.reply = slow_reply
+        app.max_pending = 1
+        try:
+            slow = asyncio.create_task(
+                _call("POST", "/", _post({"sender": "slow", "msg": "hi"}))
+            )
+            await asyncio.sleep(0.05)
+            started = time.perf_counter()
+            busy = await _call("POST", "/", _post({"sender": "fast", "msg": "hi"}))
+            elapsed = time.perf_counter() - started
+            release.set()
+            return busy, elapsed, await slow
+        finally:
+            app.service.reply = original
+            app.max_pending = 256
+
+    busy, elapsed, slow = asyncio.run(scenario())
+    assert busy[0] == 503
+    assert elapsed < 1
+    assert slow == (200, b'""\n')
@@ -0,0 +1,159 @@
+import os
+import json
+
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from usecase import build_chat_service
+
+db_path = "./tests/db/test_chat_service.db"
+
+for suffix in ("", "-wal", "-shm"):
+    try:
+        os.remove(db_path + suffix)
+    except FileNotFoundError:
+        pass
+
+settings = SimpleNamespace(
+    DB_PATH=db_path,
+    # 오늘이 10일차
+    START_DATE=date.today() - timedelta(days=9),
+    TOTAL_DAYS=30,
+    LOG_LEVELS={"db": "ERROR", "msg_handler": "ERROR", "classifier": "ERROR"},
+    BATCH_MAX_MESSAGES=3,
+    BATCH_MAX_BYTES=200,
+    PLANS={
+        "nt90": {"START_DATE": date.today() - timedelta(days=200), "TOTAL_DAYS": 90}
+    },
+)
+
+service = build_chat_service(settings)
+
+
+def test_reply_record_and_progress():
+    assert service.reply({"sender": "one", "msg": "1-3일차 완료"}) == ""
+    reply = service.reply({"sender": "one", "msg": "/진행상황"})
+    assert reply["msg"][0] == "one님의 진행상황"
+    assert reply["msg"][1].startswith("3/")
+
+
+def test_reply_many_keeps_order():
+    replies = service.reply_many(
+        [
+            {"sender": "many", "msg": "1일차 완료"},
+            {"sender": "many", "msg": "/진행상황"},
+            {"sender": "many", "msg": "안녕하세요"},
+        ]
+    )
+    assert replies[0] == ""
+    assert replies[1]["msg"][1].startswith("1/")
+    assert replies[2] == ""
+
+
+def _deliveries():
+    with service.repo._get_connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM deliveries").fetchone()[0]
+
+
+def test_duplicate_delivery_gets_first_reply():
+    data = {"sender": "dup", "msg": "1일차 완료", "delivery_id": "d-1"}
+    first = service.reply(data)
+    assert service.reply(data) == first
+    # 메모리에 없어도 (다른 워커/재시작) 테이블에서 걸러져서 한 번만 기록
+    service.dedup._recent.clear()
+    assert service.reply_many([data, {**data, "msg": "2일차 완료"}])[0] == ""
+    reply = service.reply({"sender": "dup", "msg": "/진행상황"})
+    assert reply["msg"][1].startswith("1/")
+
+
+def test_only_records_write_delivery_keys():
+    before = _deliveries()
+    for i in range(20):
+        service.reply({"sender": "chat", "msg": "안녕하세요", "delivery_id": f"n-{i}"})
+        service.reply({"sender": "chat", "msg": "/진행상황", "delivery_id": f"p-{i}"})
+    service.reply_many(
+        [{"sender": "chat", "msg": "ㅎㅎ", "delivery_id": f"b-{i}"} for i in range(3)]
+    )
+    assert _deliveries() == before
+
+    # 명령은 재전송이어도 지금 상태로 다시 답함
+    command = {"sender": "chat", "msg": "/진행상황", "delivery_id": "p-x"}
+    service.reply(command)
+    service.reply({"sender": "chat", "msg": "1일차 완료"})
+    assert service.reply(command)["msg"][1].startswith("1/")
+
+
+def test_delivery_not_claimed_when_processing_raises(monkeypatch):
+    def boom(*args):
+        raise RuntimeError("boom")
+
+    one = {"sender": "crash", "msg": "1일차 완료", "delivery_id": "c-1"}
+    many = [
+        {"sender": "crash", "msg": "2일차 완료", "delivery_id": "c-2"},
+        {"sender": "crash", "msg": "3일차 완료", "delivery_id": "c-3"},
+    ]
+    with monkeypatch.context() as m:
+        m.setattr(service.handler, "handle_message", boom)
+        m.setattr(service.handler, "handle_many", boom)
+        with pytest.raises(RuntimeError):
+            service.reply(one)
+        with pytest.raises(RuntimeError):
+            service.reply_many(many)
+
+    # 재전송은 처음 온 것처럼 처리돼서 기록이 남음
+    service.reply(one)
+    service.reply_many(many)
+    reply = service.reply({"sender": "crash", "msg": "/진행상황"})
+    assert reply["msg"][1].startswith("3/")
+
+
+def test_failed_record_does_not_keep_delivery_key(monkeypatch):
+    store = service.repo._plan(1)[2]
+
+    def broken(*args):
+        raise RuntimeError("disk")
+
+    data = {"sender": "atomic", "msg": "1일차 완료", "delivery_id": "a-1"}
+    before = _deliveries()
+    with monkeypatch.context() as m:
+        m.setattr(store, "insert_days", broken)
+        assert service.reply(data) == ""
+    # 기록이랑 같이 rollback 돼서 재전송이 기록됨
+    assert _deliveries() == before
+    service.reply(data)
+    reply = service.reply({"sender": "atomic", "msg": "/진행상황"})
+    assert reply["msg"][1].startswith("1/")
+
+
+def test_parse_batch_rejections():
+    assert service.parse_batch(b"[]") == ([], None)
+    assert service.parse_batch(b"{}")[1][0] == 400
+    assert service.parse_batch(b"not json")[1][0] == 400
+    too_many = json.dumps([{"msg": "a"}] * 4).encode()
+    assert service.parse_batch(too_many)[1][0] == 413
+    assert service.parse_batch(b"[" + b" " * 300 + b"]")[1][0] == 413
+    # msg 가 없거나 문자열이 아니면 처리 전에 400
+    assert service.parse_batch(b'[{"sender": "a"}]')[1][0] == 400
+    assert service.parse_batch(b'[{"msg": "hi"}, {"msg": 5}]')[1] == (
+        400,
+        {"error": "message 1 needs string msg/sender"},
+    )
+    assert service.parse_batch(b'[{"sender": 1, "msg": "hi"}]')[1][0] == 400
+
+
+def test_metrics_text_has_stage_timings():
+    service.reply({"sender": "m", "msg": "1일차 완료"})
+    text = service.metrics_text()
+    assert 'bible_stage_seconds_count{stage="handle"}' in text
+    assert 'bible_cache_hits{cache="progress"}' in text
+
+
+def test_plan_in_payload():
+    service.reply({"sender": "plan", "msg": "1-2일차 완료", "plan": "nt90"})
+    reply = service.reply({"sender": "plan", "msg": "/진행상황", "plan": "nt90"})
+    assert reply["msg"][1].startswith("2/90 ")
+    assert service.reply({"sender": "plan", "msg": "/진행상황"})["msg"][1].startswith("0/")
+    assert service.reply({"sender": "plan", "msg": "/진행상황", "plan": "nope"}) == ""
+    assert service.metrics.counter_value("outcomes_total", outcome="UNKNOWN_PLAN") == 1
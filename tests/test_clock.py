@@ -0,0 +1,56 @@
+from datetime import date, datetime, timedelta, timezone
+
+from utilities import AbsoluteDayCounter
+
+MSK = timezone(timedelta(hours=3))
+
+
+class FakeTime:
+    def __init__(self, moment: datetime):
+        self.now = moment.timestamp()
+
+    def __call__(self):
+        return self.now
+
+
+def test_current_day_counts_from_start_date():
+    fake = FakeTime(datetime(2025, 1, 10, 12, 0, tzinfo=MSK))
+    counter = AbsoluteDayCounter(date(2025, 1, 1), tz_offset_hours=3, now=fake)
+
+    assert counter.current_day() == 10
+
+
+def test_day_changes_exactly_at_local_midnight():
+    fake = FakeTime(datetime(2025, 1, 1, 23, 59, 59, tzinfo=MSK))
+    counter = AbsoluteDayCounter(date(2025, 1, 1), tz_offset_hours=3, now=fake)
+    rolled = []
+    counter.on_rollover(rolled.append)
+
+    assert counter.current_day() == 1
+    assert counter.next_rollover() == datetime(2025, 1, 2, tzinfo=MSK).timestamp()
+
+    fake.now += 0.5
+    assert counter.current_day() == 1
+    assert rolled == []
+
+    fake.now += 0.5
+    assert counter.current_day() == 2
+    assert rolled == [2]
+
+    # UTC 기준으로는 아직 1월 1일 21시
+    assert datetime.fromtimestamp(fake.now, timezone.utc).day == 1
+
+
+def test_rollover_hook_fires_once_per_day():
+    fake = FakeTime(datetime(2025, 1, 1, 8, 0, tzinfo=MSK))
+    counter = AbsoluteDayCounter(date(2025, 1, 1), tz_offset_hours=3, now=fake)
+    rolled = []
+    counter.on_rollover(rolled.append)
+
+    for _ in range(3):
+        counter.current_day()
+        fake.now += timedelta(days=1).total_seconds()
+        counter.current_day()
+        counter.current_day()
+
+    assert rolled == [2, 3, 4]
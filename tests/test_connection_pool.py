@@ -0,0 +1,102 @@
+import os
+import sqlite3
+import threading
+
+import pytest
+
+from db import ConnectionPool
+
+db_path = "./tests/db/test_connection_pool.db"
+
+try:
+    os.remove(db_path)
+except FileNotFoundError:
+    pass
+
+
+def test_connection_is_reused():
+    pool = ConnectionPool(db_path, max_size=2)
+
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+
+    assert first is second
+    assert pool.idle_count() == 1
+    pool.close()
+
+
+def test_pool_is_bounded():
+    pool = ConnectionPool(db_path, max_size=1, timeout=0.05)
+
+    conn = pool.acquire()
+    with pytest.raises(sqlite3.OperationalError):
+        pool.acquire()
+
+    pool.release(conn)
+    pool.release(pool.acquire())
+    pool.close()
+
+
+def test_broken_connection_is_replaced():
+    pool = ConnectionPool(db_path, max_size=1, health_check_interval=0)
+
+    with pool.connection() as conn:
+        pass
+    conn.close()
+
+    with pool.connection() as fresh:
+        assert fresh is not conn
+        assert fresh.execute("SELECT 1").fetchone()[0] == 1
+    pool.close()
+
+
+def test_uncommitted_transaction_is_rolled_back_on_release():
+    pool = ConnectionPool(db_path, max_size=1)
+
+    with pool.connection() as conn:
+        with conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS t(x INTEGER)")
+        conn.execute("INSERT INTO t(x) VALUES (1)")
+
+    with pool.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    pool.close()
+
+
+def test_close_discards_connections_in_use():
+    pool = ConnectionPool(db_path, max_size=2)
+
+    conn = pool.acquire()
+    pool.close()
+    pool.release(conn)
+
+    assert pool.idle_count() == 0
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+    with pytest.raises(sqlite3.ProgrammingError):
+        pool.acquire()
+
+
+def test_threads_share_pool():
+    pool = ConnectionPool(db_path, max_size=2)
+    errors = []
+
+    def work():
+        try:
+            for _ in range(50):
+                with pool.connection() as conn:
+                    conn.execute("SELECT 1").fetchone()
+        except Exception as e:  # pragma: no cover
+            errors.append(e)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert pool.idle_count() <= 2
+    pool.close()
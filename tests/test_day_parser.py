@@ -66,3 +66,19 @@ test = {
 @pytest.mark.parametrize("test,expected", test_case.items())
 def test_descrete_with_continues(test, expected):
     assert parser.parse(test) == expected
+
+
+# 카톡 여러 줄 메시지: 숫자 목록/일차 는 줄을 넘어가도 되고, 완료 앞 텍스트만 한 줄
+test_case = {
+    "1,\n2 완료": [1, 2],
+    "3\n일차 완료": [3],
+    "1 -\n 3 완료": [1, 2, 3],
+    "1,\n2,\n3일차 완료": [1, 2, 3],
+    "1\n완료": [],
+    "1,\n완료": [],
+}
+
+
+@pytest.mark.parametrize("test,expected", test_case.items())
+def test_across_lines(test, expected):
+    assert parser.parse(test) == expected
@@ -0,0 +1,60 @@
+import re
+
+from utilities import DayParser
+from utilities.day_parser import DayParseRule, _handle_single
+
+parser = DayParser(cache_size=2)
+
+
+def test_cache_hits_on_repeated_message():
+    parser.clear_cache()
+    before = parser.cache_stats()
+
+    assert parser.parse("1일차 완료") == [1]
+    assert parser.parse("1일차 완료") == [1]
+
+    stats = parser.cache_stats()
+    assert stats["hits"] - before["hits"] == 1
+    assert stats["misses"] - before["misses"] == 1
+    assert stats["size"] == 1
+
+
+def test_cached_result_is_a_copy():
+    parser.clear_cache()
+    days = parser.parse("1-3일차 완료")
+    days.append(99)
+
+    assert parser.parse("1-3일차 완료") == [1, 2, 3]
+
+
+def test_cache_is_bounded():
+    parser.clear_cache()
+    for text in ("1일차 완료", "2일차 완료", "3일차 완료"):
+        parser.parse(text)
+
+    assert parser.cache_stats()["size"] == 2
+
+
+def test_chatter_and_long_text_skip_cache():
+    small = DayParser(cache_size=8, cache_max_len=20)
+
+    assert small.parse("안녕하세요") == []
+    assert small.parse("1일차 완료.\n창세기 1장\n[1]태초에 하나님이 천지를") == [1]
+    assert small.cache_stats()["size"] == 0
+
+
+def test_cache_off_by_default():
+    assert DayParser().cache_stats() is None
+
+
+def test_custom_rules_use_their_own_cache():
+    custom = DayParser(
+        rules=[DayParseRule("done", re.compile(r"(\d+)\s*done"), _handle_single)],
+        cache_size=8,
+    )
+
+    assert custom.parse("4 done") == [4]
+    assert custom.parse("4 done") == [4]
+    assert custom.parse("4일차 완료") == []
+    assert parser.parse("4 done") == []
+    assert custom.cache_stats()["hits"] == 1
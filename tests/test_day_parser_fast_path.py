@@ -0,0 +1,127 @@
+import re
+import random
+
+import pytest
+
+from utilities import DayParser
+from utilities.day_parser import DayParseRule
+from utilities.day_parser import _handle_list, _handle_mixed
+from utilities.day_parser import _handle_range, _handle_single
+
+# 처음 코드의 기본 룰 4개를 그대로 얼려둔 것. _default_rules 를 고쳐도 이건 안 바뀜.
+# 바꾼 건 mixed 의 목록 반복 *? -> * 하나 (lazy 면 첫 항목만 잡혀서 생긴 버그 수정)
+BASELINE_RULES = [
+    DayParseRule(
+        "mixed_days_complete",
+        re.compile(
+            r"((?:\d+(?:\s*[-~]\s*\d+)?)(?:\s*,\s*\d+(?:\s*[-~]\s*\d+)?)*)"
+            r"(?:\s*일차)?(?:[^\n\r]*?)(?:완료|클리어)"
+        ),
+        _handle_mixed,
+    ),
+    DayParseRule(
+        "list_days_complete",
+        re.compile(
+            r"(?:^|\s)(\d+(?:\s*,\s*\d+)*)"
+            r"(?:\s*일차)?(?:[^\n\r]*?)(?:완료|클리어)"
+        ),
+        _handle_list,
+    ),
+    DayParseRule(
+        "range_day_complete",
+        re.compile(r"(\d+)\s*[-~]\s*(\d+)(?:\s*일차)?(?:[^\n\r]*?)(?:완료|클리어)"),
+        _handle_range,
+    ),
+    DayParseRule(
+        "single_day_complete",
+        re.compile(r"(\d+)(?:\s*일차)?(?:[^\n\r]*?)(?:완료|클리어)"),
+        _handle_single,
+    ),
+]
+
+# 빠른 경로(기본 룰) vs 처음 룰을 순서대로 다 돌리는 예전 방식
+fast = DayParser()
+reference = DayParser(rules=BASELINE_RULES)
+# 지금 기본 룰도 처음 룰이랑 같아야 함 (커스텀 룰 경로로 돌림)
+current = DayParser(rules=DayParser._default_rules())
+
+corpus = [
+    # tests/test_day_parser.py 에 있는 케이스들
+    "1-3일차 완료",
+    "1~5일차 완료",
+    "1-7 일차 완료",
+    "1,3,4일차 완료",
+    "2,5,6,7 일차 완료",
+    "3일차 완료",
+    "1일차 통독 완료",
+    "1일차 성경읽기 완료",
+    "성경읽기 1일차 완료",
+    "1일차 완료했습니다",
+    "1일차 완료.\n창세가 1장\n[1]하나님께서 천지를 창조하시니라",
+    "1일차 통독 클리어",
+    "1일차 성경읽기 클리어",
+    "성경읽기 1일차 클리어",
+    "1일차 클리어했습니다",
+    "1,3,4일차 클리어",
+    "2,5,6,7 일차 클리어",
+    "3일차 클리어",
+    "332, 334-339, 341일차 완료!",
+    "1-3, 5일차 완료",
+    # 걸러져야 하는 일반 대화
+    "",
+    "안녕하세요",
+    "오늘 3시에 만나요",
+    "완료!",
+    "다들 완료하셨나요?",
+    "1\n완료",
+    "1,\n2 완료",
+    "1 -\n 3 완료",
+    "3\n일차 완료",
+    "오늘 232일차 완료했습니다",
+    "2024년 3월 5일 12일차 완료",
+    "١٢일차 완료",
+    "10-2일차 완료",
+    "1, 2, 일차 완료",
+    "1 - 일차 완료",
+    "/진행상황 1일차 완료",
+]
+
+
+@pytest.mark.parametrize("text", corpus)
+def test_fast_path_matches_rule_chain(text):
+    assert fast.parse(text) == reference.parse(text)
+    assert current.parse(text) == reference.parse(text)
+
+
+def test_fast_path_matches_rule_chain_random():
+    rng = random.Random(42)
+    alphabet = [
+        *["1", "2", "12", ",", "-", "~", " ", "\n", "\r", "\t"],
+        *["일차", "일", "완료", "클리어", "가"],
+    ]
+    for _ in range(5000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+        expected = reference.parse(text)
+        # 빠른 경로는 max_days 넘는 것, 너무 긴 숫자는 버림 (test_max_days_cap)
+        if len(expected) > fast.max_days or any(d >= 10**6 for d in expected):
+            expected = []
+        assert fast.parse(text) == expected, text
+        assert current.parse(text) == reference.parse(text), text
+
+
+def test_max_days_cap():
+    assert fast.parse("1-99999999일차 완료") == []
+    assert fast.parse("1-10000일차 완료") == list(range(1, 10001))
+    assert DayParser(max_days=4).parse("1-3, 5-6일차 완료") == []
+    assert DayParser(max_days=4).parse("1-3, 5일차 완료") == [1, 2, 3, 5]
+
+
+def test_custom_rules_skip_fast_path():
+    import re
+
+    from utilities.day_parser import DayParseRule, _handle_single
+
+    parser = DayParser(
+        rules=[DayParseRule("done", re.compile(r"(\d+)\s*done"), _handle_single)]
+    )
+    assert parser.parse("4 done") == [4]
@@ -0,0 +1,70 @@
+import random
+import time
+
+from utilities import DayParser
+
+# 입력이 4배 길어질 때 parse 시간이 몇 배까지 늘어도 되는지.
+# 선형이면 4배 근처, 예전 mixed 정규식은 숫자/쉼표 줄에서 세제곱이라 수십 배.
+MAX_GROWTH = 10
+# 이보다 짧게 끝나면 타이머 잡음이라 비율 안 봄
+FLOOR = 0.002
+
+parser = DayParser()
+
+
+def _best(text: str, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parser.parse(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# n 을 받아서 길이가 n 에 비례하는 최악 입력을 만드는 함수들
+adversarial = {
+    "comma_flood": lambda n: "1," * n + "일차 완료",
+    "digit_space_flood": lambda n: "1 " * n + "완료",
+    "range_flood": lambda n: "1-2~" * n + "완료",
+    "scripture_then_keyword": lambda n: "창 1:1, 2, 3 " * n + "\n3일차 완료",
+    "keyword_then_scripture": lambda n: "3일차 완료\n" + "1, 2 -" * n,
+    "whitespace_run": lambda n: "1" + " " * n + "x완료",
+    "many_lines": lambda n: "1,\n" * n + "완료",
+}
+
+
+def _growth(make, n: int) -> float:
+    small = _best(make(n))
+    large = _best(make(n * 4))
+    if large < FLOOR:
+        return 1.0
+    return large / max(small, FLOOR / 4)
+
+
+def test_adversarial_inputs_scale_linearly():
+    n = 4000
+    for name, make in adversarial.items():
+        # 공유 CI 에서 한 번 튀는 건 봐줌. 진짜 초선형이면 세 번 다 걸림
+        growths = []
+        for _ in range(3):
+            growths.append(_growth(make, n))
+            if growths[-1] < MAX_GROWTH:
+                break
+        assert min(growths) < MAX_GROWTH, (name, growths)
+
+
+def test_random_long_inputs_finish_quickly():
+    rng = random.Random(7)
+    alphabet = ["1", "23", ",", " ", "-", "~", "\n", "일차", "완료", "클리어", "장"]
+    for _ in range(20):
+        text = "".join(rng.choice(alphabet) for _ in range(20000))
+        assert _best(text, repeat=1) < 0.5, text[:80]
+
+
+def test_huge_numbers_are_not_records():
+    # int() 자릿수 제한(4300) 넘는 숫자도 예외 없이 기록 아님으로
+    assert parser.parse("1" * 5000 + "일차 완료") == []
+    assert parser.parse("1-" + "2" * 5000 + "일차 완료") == []
+    assert parser.parse("3, " + "9" * 5000 + "일차 완료") == []
+    assert parser.parse("1234567일차 완료") == []
+    assert parser.parse("365일차 완료") == [365]
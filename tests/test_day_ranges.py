@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from usecase import Formatter
+from utilities import missing_spans, expand_spans, compress_spans, spans_of
+
+formatter = Formatter()
+
+
+def _reference_missing(done, max_day):
+    done = set(done)
+    return [d for d in range(1, max_day + 1) if d not in done]
+
+
+test_case = [
+    ([], 4),
+    ([1, 2, 3, 4], 4),
+    ([2], 4),
+    ([1, 2], 4),
+    ([1, 3], 4),
+    ([4], 4),
+    ([1, 1, 2, 5, 9], 8),
+    ([3, 4, 5, 10], 12),
+    ([], 0),
+]
+
+
+@pytest.mark.parametrize("done,max_day", test_case)
+def test_missing_spans_match_reference(done, max_day):
+    spans = missing_spans(sorted(done), max_day)
+    missing = _reference_missing(done, max_day)
+
+    assert expand_spans(spans) == missing
+    assert compress_spans(spans) == formatter._compress_day_list(missing)
+
+
+def test_missing_spans_random():
+    rng = random.Random(1234)
+    for _ in range(500):
+        max_day = rng.randint(0, 60)
+        done = sorted(rng.sample(range(1, 70), rng.randint(0, 50)))
+        spans = missing_spans(done, max_day)
+        missing = _reference_missing(done, max_day)
+
+        assert expand_spans(spans) == missing
+        assert spans_of(missing) == spans
+        assert compress_spans(spans) == formatter._compress_day_list(missing)
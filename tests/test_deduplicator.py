@@ -0,0 +1,123 @@
+import os
+import logging
+
+from db import Repository
+
+from entities import Errors
+
+from usecase import DeliveryDeduplicator
+
+
+class MockClock:
+    def __init__(self, current_day_return):
+        self._day = current_day_return
+
+    def current_day(self):
+        return self._day
+
+
+class FakeTime:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+db_path = "./tests/db/test_deduplicator.db"
+
+try:
+    os.remove(db_path)
+except FileNotFoundError:
+    pass
+
+repo = Repository(
+    db_path, day_counter=MockClock(10), logger_stream=False, logging_level=logging.INFO
+)
+
+
+def _count():
+    with repo._get_connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM deliveries").fetchone()[0]
+
+
+def test_key_for():
+    assert DeliveryDeduplicator.key_for({"delivery_id": "abc"}) == "id:abc"
+    assert DeliveryDeduplicator.key_for({"sender": "a", "msg": "1일차 완료"}) is None
+
+    a = DeliveryDeduplicator.key_for({"sender": "a", "msg": "hi", "timestamp": 1})
+    b = DeliveryDeduplicator.key_for({"sender": "a", "msg": "hi", "timestamp": 2})
+    assert a.startswith("h:") and a != b
+
+
+def test_duplicate_answered_from_memory():
+    dedup = DeliveryDeduplicator(repo, now=FakeTime(1000.0))
+
+    assert dedup.seen("id:mem") is False
+    dedup.finish("id:mem", None, {"msg": ["ok"]})
+
+    assert dedup.seen("id:mem") is True
+    assert dedup.reply_for("id:mem") == {"msg": ["ok"]}
+
+
+def test_duplicate_caught_by_table_after_restart():
+    first = DeliveryDeduplicator(repo, now=FakeTime(1000.0))
+    delivery = first.delivery("id:restart")
+    result = repo.post_progress_many("restart", "1일차 완료", [1], delivery=delivery)
+    assert result.status == Errors.SUCCESS
+
+    # 메모리는 비어있는 새 프로세스: 기록하는 트랜잭션에서 걸러짐
+    second = DeliveryDeduplicator(repo, now=FakeTime(1001.0))
+    assert second.seen("id:restart") is False
+    again = repo.post_progress_many(
+        "restart", "1일차 완료", [1], delivery=second.delivery("id:restart")
+    )
+    assert again.redelivered and again.status == Errors.DUPLICATE_DELIVERY
+    assert second.reply_for("id:restart") == ""
+
+
+def test_key_rolls_back_with_failed_record():
+    dedup = DeliveryDeduplicator(repo, now=FakeTime(1000.0))
+    before = _count()
+
+    # 같은 트랜잭션의 기록이 터지면 key 도 같이 rollback
+    result = repo.post_progress_batch(
+        [("fail", "1일차 완료", [1]), ("fail", "완료", [None])],
+        deliveries=[dedup.delivery("id:fail-1"), dedup.delivery("id:fail-2")],
+    )
+    assert result == Errors.DB_FAIL
+    assert _count() == before
+
+    dedup.finish("id:fail-1", Errors.DB_FAIL, "")
+    assert dedup.seen("id:fail-1") is False
+
+
+def test_duplicate_key_in_one_batch():
+    dedup = DeliveryDeduplicator(repo, now=FakeTime(1000.0))
+    results = repo.post_progress_batch(
+        [("twice", "1일차 완료", [1]), ("twice", "1일차 완료", [1])],
+        deliveries=[dedup.delivery("id:twice"), dedup.delivery("id:twice")],
+    )
+    assert [r.status for r in results] == [
+        Errors.SUCCESS,
+        Errors.DUPLICATE_DELIVERY,
+    ]
+    assert repo.get_progress("twice").completed_count == 1
+
+
+def test_ttl_sweep():
+    fake = FakeTime(5000.0)
+    dedup = DeliveryDeduplicator(repo, ttl=100, sweep_interval=50, now=fake)
+    repo.post_progress_many("old", "1일차 완료", [1], delivery=dedup.delivery("id:old"))
+    dedup.finish("id:old", Errors.SUCCESS, "")
+    before = _count()
+
+    fake.now += 200
+    # 첫 seen 에서 sweep 돌고, 메모리 항목도 ttl 지나서 다시 처리됨
+    assert dedup.seen("id:new") is False
+    assert _count() < before
+    assert dedup.seen("id:old") is False
+    again = repo.post_progress_many(
+        "old", "2일차 완료", [2], delivery=dedup.delivery("id:old")
+    )
+    assert again.status == Errors.SUCCESS
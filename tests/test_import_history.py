@@ -0,0 +1,169 @@
+import io
+import os
+import json
+import logging
+
+import pytest
+
+from db import Repository
+
+from usecase import MessageHandler
+from usecase import MessageClassifier
+
+from utilities import DayParser
+
+from entities import Errors
+
+from import_history import import_file, parse_jsonl, parse_kakao, read_lines
+from import_history import ImportFailed
+
+
+class MockClock:
+    def __init__(self, current_day_return):
+        self._day = current_day_return
+
+    def current_day(self):
+        return self._day
+
+
+db_path = "./tests/db/test_import_history.db"
+chat_path = "./tests/db/test_import_history.txt"
+jsonl_path = "./tests/db/test_import_history.jsonl"
+
+for path in (db_path, chat_path + ".checkpoint", jsonl_path + ".checkpoint"):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+clock = MockClock(current_day_return=30)
+
+repo = Repository(
+    db_path, day_counter=clock, logger_stream=False, logging_level=logging.INFO
+)
+
+message_handler = MessageHandler(repo, clock)
+classifier = MessageClassifier(DayParser())
+
+chat = """\ufeff성경읽기 님과 카카오톡 대화
+저장한 날짜 : 2025-01-10 09:00:00
+
+--------------- 2025년 1월 1일 수요일 ---------------
+[홍길동] [오전 7:01] 1일차 완료
+[김철수] [오전 7:30] 안녕하세요
+[김철수] [오후 9:12] 1-2일차 완료.
+창세기 1장
+[1]태초에 하나님이 천지를 창조하시니라
+2025년 1월 2일 오후 3:45, 이영희 : 3일차 클리어
+2025. 1. 3. 오전 8:00, 홍길동 : /진행상황
+2025년 1월 3일 오전 8:01: 박민수님이 들어왔습니다.
+[홍길동] [오전 8:02] 2, 3일차 완료
+"""
+
+
+def _lines(text):
+    return read_lines(io.BytesIO(text.encode("utf-8")))
+
+
+def test_parse_kakao_joins_multiline_messages():
+    messages = [m for m, _ in parse_kakao(_lines(chat))]
+
+    assert [m["sender"] for m in messages] == [
+        "홍길동",
+        "김철수",
+        "김철수",
+        "이영희",
+        "홍길동",
+        "홍길동",
+    ]
+    assert messages[2]["msg"].splitlines() == [
+        "1-2일차 완료.",
+        "창세기 1장",
+        "[1]태초에 하나님이 천지를 창조하시니라",
+    ]
+
+
+def test_parse_kakao_offsets_resume_at_next_message():
+    data = chat.encode("utf-8")
+    for message, offset in parse_kakao(read_lines(io.BytesIO(data))):
+        rest = list(parse_kakao(read_lines(io.BytesIO(data), offset)))
+        if rest:
+            assert rest[0][0] != message
+
+
+def test_parse_jsonl_skips_bad_lines():
+    text = '{"sender": "a", "msg": "1일차 완료"}\nnot json\n\n{"sender": "b"}\n'
+    assert [m for m, _ in parse_jsonl(_lines(text))] == [
+        {"sender": "a", "msg": "1일차 완료"}
+    ]
+
+
+def test_import_kakao_export_in_chunks():
+    with open(chat_path, "w", encoding="utf-8") as f:
+        f.write(chat)
+
+    checkpoint = import_file(chat_path, classifier, message_handler, chunk_size=2)
+
+    assert checkpoint["messages"] == 6
+    # 홍길동 1, 김철수 1-2, 이영희 3, 홍길동 2-3
+    assert checkpoint["records"] == 4
+    assert checkpoint["offset"] == os.path.getsize(chat_path)
+    assert repo.get_progress("홍길동").completed_count == 3
+
+    # 다시 돌리면 체크포인트 뒤로 읽을 게 없음
+    again = import_file(chat_path, classifier, message_handler, chunk_size=2)
+    assert again["messages"] == 6
+    assert again["records"] == 4
+
+
+def test_import_jsonl_resumes_from_checkpoint():
+    rows = [{"sender": "jsonl", "msg": f"{d}일차 완료"} for d in range(1, 21)]
+    with open(jsonl_path, "w", encoding="utf-8") as f:
+        for row in rows[:10]:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    first = import_file(jsonl_path, classifier, message_handler, chunk_size=4)
+    assert first["messages"] == 10
+
+    with open(jsonl_path, "a", encoding="utf-8") as f:
+        for row in rows[10:]:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    second = import_file(jsonl_path, classifier, message_handler, chunk_size=4)
+    assert second["messages"] == 20
+    assert second["records"] == 20
+    assert repo.get_progress("jsonl").completed_count == 20
+
+
+def test_failed_chunk_keeps_checkpoint():
+    path = jsonl_path.replace(".jsonl", "_fail.jsonl")
+    for p in (path, path + ".checkpoint"):
+        try:
+            os.remove(p)
+        except FileNotFoundError:
+            pass
+    with open(path, "w", encoding="utf-8") as f:
+        for d in range(1, 9):
+            f.write(json.dumps({"sender": "fail", "msg": f"{d}일차 완료"}) + "\n")
+
+    class LockedHandler:
+        # 두 번째 chunk 에서 "database is locked" 난 것처럼
+        calls = 0
+
+        def handle_many(self, items):
+            LockedHandler.calls += 1
+            if LockedHandler.calls == 2:
+                return [Errors.DB_FAIL for _ in items]
+            return message_handler.handle_many(items)
+
+    with pytest.raises(ImportFailed):
+        import_file(path, classifier, LockedHandler(), chunk_size=4)
+
+    with open(path + ".checkpoint", encoding="utf-8") as f:
+        assert json.load(f)["messages"] == 4
+
+    # 이어서 돌리면 실패한 chunk 부터 다시 넣음
+    resumed = import_file(path, classifier, message_handler, chunk_size=4)
+    assert resumed["messages"] == 8
+    assert resumed["records"] == 8
+    assert repo.get_progress("fail").completed_count == 8
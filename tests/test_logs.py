@@ -0,0 +1,85 @@
+import logging
+import threading
+
+from utilities import configure_logging, set_logger, shutdown_logging
+from utilities.logs import SamplingFilter, _settings
+
+
+def _configure(tmp_path, **kwargs):
+    before = dict(_settings.__dict__)
+    configure_logging(log_dir=str(tmp_path), **kwargs)
+    return before
+
+
+def test_log_written_by_listener_thread(tmp_path):
+    before = _configure(tmp_path)
+    try:
+        writers = []
+
+        class Spy(logging.Handler):
+            def emit(self, record):
+                writers.append(threading.current_thread())
+
+        logger = set_logger("logs_thread", s=False, level=logging.INFO)
+        logger.addHandler(Spy())  # 비교용: 로거에 바로 붙인 건 요청 스레드에서 돔
+        logger.info("hello %s", "world")
+        logger.debug("not written")
+        shutdown_logging()
+
+        text = (tmp_path / "logs_thread.log").read_text(encoding="utf-8")
+        assert "hello world" in text
+        assert "not written" not in text
+        assert writers == [threading.current_thread()]
+    finally:
+        configure_logging(**before)
+
+
+def test_configured_level_overrides_code_level(tmp_path):
+    before = _configure(tmp_path, levels={"logs_level": "DEBUG"})
+    try:
+        logger = set_logger("logs_level", s=False, level=logging.WARNING)
+        assert logger.isEnabledFor(logging.DEBUG)
+
+        configure_logging(levels={"logs_level": "ERROR"})
+        assert not logger.isEnabledFor(logging.WARNING)
+    finally:
+        shutdown_logging()
+        configure_logging(**before)
+
+
+def test_rotation(tmp_path):
+    before = _configure(tmp_path, max_bytes=1000, backup_count=2)
+    try:
+        logger = set_logger("logs_rotate", s=False, level=logging.INFO)
+        for i in range(200):
+            logger.info("line %s %s", i, "x" * 40)
+        shutdown_logging()
+
+        files = sorted(p.name for p in tmp_path.iterdir())
+        assert files == ["logs_rotate.log", "logs_rotate.log.1", "logs_rotate.log.2"]
+    finally:
+        configure_logging(**before)
+
+
+def test_sampling_keeps_every_nth_debug_line():
+    f = SamplingFilter(0.25)
+    debug = logging.LogRecord("x", logging.DEBUG, "", 0, "m", None, None)
+    warning = logging.LogRecord("x", logging.WARNING, "", 0, "m", None, None)
+
+    assert [f.filter(debug) for _ in range(8)].count(True) == 2
+    assert all(f.filter(warning) for _ in range(8))
+
+
+def test_sampling_from_config(tmp_path):
+    before = _configure(tmp_path, sample_rates={"logs_sampled": 0.1})
+    try:
+        logger = set_logger("logs_sampled", s=False, level=logging.DEBUG)
+        for i in range(100):
+            logger.debug("debug %s", i)
+        logger.error("kept")
+        shutdown_logging()
+
+        lines = (tmp_path / "logs_sampled.log").read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 11
+    finally:
+        configure_logging(**before)
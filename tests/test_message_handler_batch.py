@@ -0,0 +1,84 @@
+import os
+import logging
+
+from db import Repository
+
+from usecase import MessageHandler
+from usecase import MessageClassifier
+
+from entities import Errors
+from entities import MessageKind
+from entities import ProgressSummary
+
+from utilities import DayParser
+
+
+class MockClock:
+    def __init__(self, current_day_return):
+        self._day = current_day_return
+
+    def current_day(self):
+        return self._day
+
+
+db_path = "./tests/db/test_message_handler_batch.db"
+
+try:
+    os.remove(db_path)
+except FileNotFoundError:
+    pass
+
+clock = MockClock(current_day_return=10)
+
+repo = Repository(
+    db_path, day_counter=clock, logger_stream=False, logging_level=logging.INFO
+)
+
+message_handler = MessageHandler(repo, clock)
+classifier = MessageClassifier(DayParser())
+
+
+def test_classify_many_keeps_order():
+    results = classifier.classify_many(
+        [
+            {"sender": "a", "msg": "1일차 완료"},
+            {"sender": "b", "msg": "/진행상황"},
+            {"sender": "c", "msg": "안녕하세요"},
+        ]
+    )
+
+    assert [r.kind for r in results] == [
+        MessageKind.RECORD,
+        MessageKind.COMMAND,
+        MessageKind.NOOP,
+    ]
+    assert results[0].days == [1]
+
+
+def test_handle_many_matches_one_by_one():
+    raws = [
+        {"sender": "h1", "msg": "1-3일차 완료"},
+        {"sender": "h2", "msg": "1일차 완료"},
+        {"sender": "h1", "msg": "3일차 완료"},
+        {"sender": "h2", "msg": "99일차 완료"},
+        {"sender": "h1", "msg": "/진행상황"},
+        {"sender": "h1", "msg": "4일차 완료"},
+        {"sender": "h3", "msg": "안녕하세요"},
+    ]
+    results = message_handler.handle_many(classifier.classify_many(raws))
+
+    assert results[:4] == [
+        Errors.SUCCESS,
+        Errors.SUCCESS,
+        Errors.DB_DUPLICATE_DAY,
+        Errors.DATE_ERROR,
+    ]
+    # 명령 앞의 기록은 이미 들어가 있음
+    assert isinstance(results[4], ProgressSummary)
+    assert results[4].completed_count == 3
+    assert results[5:] == [Errors.SUCCESS, Errors.TYPE_ERROR]
+    assert repo.get_progress("h1").completed_count == 4
+
+
+def test_handle_many_empty():
+    assert message_handler.handle_many([]) == []
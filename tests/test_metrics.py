@@ -0,0 +1,89 @@
+import os
+import logging
+
+from db import Repository
+
+from utilities import Metrics
+
+
+class MockClock:
+    def __init__(self, current_day_return):
+        self._day = current_day_return
+
+    def current_day(self):
+        return self._day
+
+
+db_path = "./tests/db/test_metrics.db"
+
+try:
+    os.remove(db_path)
+except FileNotFoundError:
+    pass
+
+
+def test_render_prometheus_text():
+    metrics = Metrics(buckets=(0.001, 0.01))
+    metrics.inc("messages_total", kind="RECORD")
+    metrics.inc("messages_total", kind="RECORD")
+    metrics.inc("messages_total", 2000000, kind="NOOP")
+    metrics.set_gauge("cache_size", 3, cache="parse")
+    metrics.observe("stage_seconds", 0.0005, stage="classify")
+    metrics.observe("stage_seconds", 0.005, stage="classify")
+    metrics.observe("stage_seconds", 0.5, stage="classify")
+
+    lines = metrics.render().splitlines()
+
+    assert "# TYPE bible_messages_total counter" in lines
+    assert 'bible_messages_total{kind="RECORD"} 2' in lines
+    assert 'bible_messages_total{kind="NOOP"} 2000000' in lines
+    assert 'bible_cache_size{cache="parse"} 3' in lines
+    assert "# TYPE bible_stage_seconds histogram" in lines
+    assert 'bible_stage_seconds_bucket{stage="classify",le="0.001"} 1' in lines
+    assert 'bible_stage_seconds_bucket{stage="classify",le="0.01"} 2' in lines
+    assert 'bible_stage_seconds_bucket{stage="classify",le="+Inf"} 3' in lines
+    assert 'bible_stage_seconds_count{stage="classify"} 3' in lines
+
+
+def test_label_values_escaped():
+    metrics = Metrics()
+    metrics.inc("x_total", sender='a"b\nc')
+
+    assert 'bible_x_total{sender="a\\"b\\nc"} 1' in metrics.render()
+
+
+def test_disabled_metrics_record_nothing():
+    metrics = Metrics(enabled=False)
+    with metrics.timer("stage_seconds", stage="classify"):
+        pass
+    metrics.inc("messages_total", kind="RECORD")
+
+    assert metrics.render() == "\n"
+
+
+def test_timer_records_even_on_exception():
+    metrics = Metrics()
+    try:
+        with metrics.timer("stage_seconds", stage="handle"):
+            raise ValueError
+    except ValueError:
+        pass
+
+    assert metrics.histogram_count("stage_seconds", stage="handle") == 1
+
+
+def test_repository_query_timings():
+    metrics = Metrics()
+    repo = Repository(
+        db_path,
+        day_counter=MockClock(10),
+        logging_level=logging.INFO,
+        metrics=metrics,
+    )
+    repo.post_progress("m1", "1일차 완료", 1)
+    repo.get_progress("m1")
+    repo.get_all_progresses()
+    repo.close()
+
+    for op in ("post_progress", "get_progress", "get_all_progresses"):
+        assert metrics.histogram_count("db_query_seconds", op=op) == 1
@@ -0,0 +1,141 @@
+import os
+import logging
+
+from datetime import date, timedelta
+
+from db import Repository
+
+from usecase import MessageHandler
+from usecase import MessageClassifier
+
+from entities import Errors
+
+from utilities import DayParser
+
+
+class MockClock:
+    def __init__(self, current_day_return):
+        self._day = current_day_return
+
+    def current_day(self):
+        return self._day
+
+
+db_path = "./tests/db/test_plans.db"
+
+for suffix in ("", "-wal", "-shm"):
+    try:
+        os.remove(db_path + suffix)
+    except FileNotFoundError:
+        pass
+
+clock = MockClock(current_day_return=300)
+
+repo = Repository(
+    db_path, day_counter=clock, logger_stream=False, logging_level=logging.INFO
+)
+
+# 200일 전에 시작한 90일짜리 계획 → 이미 끝나서 max_day 는 90
+nt = repo.add_plan("nt90", date.today() - timedelta(days=200), 90)
+# 아직 진행 중인 2년짜리
+two_years = repo.add_plan("two_years", date.today() - timedelta(days=30), 730)
+
+handler = MessageHandler(repo, clock)
+classifier = MessageClassifier(DayParser())
+
+
+def test_plans_listed_and_resolved():
+    names = [p.name for p in repo.plans()]
+    assert names == ["default", "nt90", "two_years"]
+    assert repo.plan_id("nt90") == nt.id
+    assert repo.plan_id(str(nt.id)) == nt.id
+    assert repo.plan_id("nope") is None
+    assert repo.plan_id(99) is None
+
+
+def test_same_sender_progress_is_separate_per_plan():
+    assert repo.post_progress("kim", "1일차 완료", 1) == Errors.SUCCESS
+    assert repo.post_progress("kim", "1일차 완료", 1, plan_id=nt.id) == Errors.SUCCESS
+    assert (
+        repo.post_progress("kim", "1일차 완료", 1, plan_id=nt.id)
+        == Errors.DB_DUPLICATE_DAY
+    )
+
+    summary = repo.get_progress("kim", plan_id=nt.id)
+    assert summary.completed_count == 1
+    assert summary.max_day == 90
+    assert summary.missing_days == list(range(2, 91))
+    assert repo.get_progress("kim").max_day == 300
+
+
+def test_day_counter_per_plan():
+    counter = repo.day_counter_for(two_years.id)
+    assert counter is repo.day_counter_for(two_years.id)
+    assert 30 <= repo.max_day(two_years.id) <= 32
+    assert repo.day_counter_for() is clock
+
+
+def test_all_progresses_only_for_that_plan():
+    repo.post_progress("lee", "1-3일차 완료", 3, plan_id=two_years.id)
+    senders = [p.sender for p in repo.get_all_progresses(plan_id=two_years.id)]
+    assert senders == ["lee"]
+    assert "lee" not in [p.sender for p in repo.get_all_progresses()]
+
+
+def test_unknown_plan():
+    assert repo.post_progress("kim", "1일차 완료", 1, plan_id=99) == Errors.UNKNOWN_PLAN
+    assert repo.get_progress("kim", plan_id=99) == Errors.UNKNOWN_PLAN
+    assert repo.get_all_progresses(plan_id=99) == Errors.UNKNOWN_PLAN
+
+
+def test_handler_checks_days_against_plan_length():
+    record = classifier.classify({"sender": "park", "msg": "95일차 완료"})
+    assert handler.handle_message(record, nt.id) == Errors.DATE_ERROR
+    assert handler.handle_message(record) == Errors.SUCCESS
+    assert handler.handle_many([record], plan_id=99) == [Errors.UNKNOWN_PLAN]
+
+
+def test_plan_queries_use_the_index():
+    with repo._get_connection() as conn:
+        rows = conn.execute(
+            """
+            EXPLAIN QUERY PLAN
+            SELECT day FROM progress WHERE plan_id = ? AND sender_id = ? ORDER BY day
+            """,
+            (nt.id, repo.sender_id("kim")),
+        ).fetchall()
+    detail = " ".join(r[-1] for r in rows)
+    assert "USING COVERING INDEX" in detail
+    assert "TEMP B-TREE" not in detail
+
+
+def test_plan_not_started_yet():
+    tomorrow = repo.add_plan("tomorrow", date.today() + timedelta(days=1), 30)
+    later = repo.add_plan("later", date.today() + timedelta(days=10), 30)
+
+    for plan in (tomorrow, later):
+        assert repo.max_day(plan.id) == 0
+        assert repo.get_progress("kim", plan_id=plan.id) == Errors.DATE_ERROR
+        assert repo.get_all_progresses(plan_id=plan.id) == Errors.DATE_ERROR
+        record = classifier.classify({"sender": "kim", "msg": "1일차 완료"})
+        assert handler.handle_message(record, plan.id) == Errors.DATE_ERROR
+
+
+def test_reopen_with_same_plans_does_not_write():
+    import sqlite3
+
+    # 다른 커넥션이 write lock 을 잡고 있어도 열리고 PLANS 도 맞출 수 있어야 함
+    locker = sqlite3.connect(db_path, isolation_level=None)
+    locker.execute("BEGIN IMMEDIATE")
+    try:
+        again = Repository(
+            db_path,
+            day_counter=clock,
+            logging_level=logging.INFO,
+            storage_profile={"busy_timeout": 0},
+        )
+        assert again.add_plan("nt90", nt.start_date, 90) == nt
+        again.close()
+    finally:
+        locker.execute("ROLLBACK")
+        locker.close()
@@ -0,0 +1,142 @@
+import os
+import logging
+
+import pytest
+
+from db import Repository
+from db.connection import ConnectionPool
+from db.maintenance import migrate_database
+from db.writer import GroupCommitWriter
+
+from utilities import configure_logging, set_logger, shutdown_logging
+from utilities.logs import _settings
+
+from entities import Errors
+
+
+class MockClock:
+    def __init__(self, current_day_return):
+        self._day = current_day_return
+
+    def current_day(self):
+        return self._day
+
+
+db_path = "./tests/db/test_prefork.db"
+
+for suffix in ("", "-wal", "-shm"):
+    try:
+        os.remove(db_path + suffix)
+    except FileNotFoundError:
+        pass
+
+clock = MockClock(current_day_return=10)
+
+
+def _in_child(fn):
+    """fn 을 fork 된 자식에서 돌리고 결과(bool)를 돌려받음"""
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        try:
+            ok = bool(fn())
+        except BaseException:
+            ok = False
+        os.write(write_fd, b"1" if ok else b"0")
+        os._exit(0)
+
+    os.close(write_fd)
+    result = os.read(read_fd, 1)
+    os.close(read_fd)
+    os.waitpid(pid, 0)
+    return result == b"1"
+
+
+def test_pool_opens_new_connections_after_fork():
+    pool = ConnectionPool(db_path, max_size=1)
+    with pool.connection() as conn:
+        parent_conn = conn
+    # 부모에서 빌려간 채로 fork 돼도 자식 슬롯은 비어 있어야 함
+    borrowed = pool.acquire()
+
+    def child():
+        with pool.connection() as conn:
+            return conn is not parent_conn and conn.execute("SELECT 1").fetchone()
+
+    assert _in_child(child)
+    pool.release(borrowed)
+    assert pool.idle_count() == 1
+    pool.close()
+
+
+def test_writer_restarts_thread_after_fork():
+    pool = ConnectionPool(db_path)
+    writer = GroupCommitWriter(pool.dedicated)
+    assert writer.submit(lambda cursor: 1).result(timeout=5) == 1
+
+    def child():
+        return writer.submit(lambda cursor: 2).result(timeout=5) == 2
+
+    assert _in_child(child)
+    writer.close()
+    pool.close()
+
+
+def test_logs_written_from_child(tmp_path):
+    before = dict(_settings.__dict__)
+    configure_logging(log_dir=str(tmp_path))
+    try:
+        logger = set_logger("prefork_child", s=False, level=logging.INFO)
+        logger.info("from parent")
+
+        def child():
+            logger.info("from child")
+            shutdown_logging()
+            return True
+
+        assert _in_child(child)
+        shutdown_logging()
+
+        text = (tmp_path / "prefork_child.log").read_text(encoding="utf-8")
+        assert "from parent" in text
+        assert "from child" in text
+    finally:
+        configure_logging(**before)
+
+
+def test_run_migrations_false_needs_migrated_db():
+    fresh = "./tests/db/test_prefork_fresh.db"
+    try:
+        os.remove(fresh)
+    except FileNotFoundError:
+        pass
+
+    with pytest.raises(RuntimeError):
+        Repository(fresh, day_counter=clock, run_migrations=False)
+
+    assert migrate_database(fresh, total_days=10)
+    assert migrate_database(fresh, total_days=10) == []
+    repo = Repository(fresh, day_counter=clock, run_migrations=False)
+    assert repo.post_progress("a", "1일차 완료", 1) == Errors.SUCCESS
+    repo.close()
+
+
+def test_multiprocess_cache_sees_other_writers():
+    # 다른 워커 = 같은 DB 를 쓰는 다른 Repository
+    reader = Repository(db_path, day_counter=clock, multiprocess=True)
+    other = Repository(db_path, day_counter=clock)
+
+    assert reader.get_progress("shared").completed_count == 0
+    assert reader.get_progress("shared").completed_count == 0
+    assert reader.cache_stats()["hits"] == 1
+
+    other.post_progress("shared", "1일차 완료", 1)
+    assert reader.get_progress("shared").completed_count == 1
+
+    # 아무도 안 썼으면 캐시 그대로
+    reader.get_progress("shared")
+    assert reader.cache_stats()["hits"] == 2
+
+    reader.close()
+    other.close()
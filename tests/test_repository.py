@@ -0,0 +1,385 @@
+import os
+import logging
+
+from db import Repository
+
+from entities import Errors
+from entities import RecordResult
+
+
+class MockClock:
+    def __init__(self, current_day_return):
+        self._day = current_day_return
+
+    def current_day(self):
+        return self._day
+
+
+db_path = "./tests/db/test_repository.db"
+
+try:
+    os.remove(db_path)
+except FileNotFoundError:
+    pass
+
+clock = MockClock(current_day_return=300)
+
+repo = Repository(
+    db_path, day_counter=clock, logger_stream=False, logging_level=logging.INFO
+)
+
+
+def _count(sql, *args):
+    with repo._get_connection() as conn:
+        return conn.execute(sql, args).fetchone()[0]
+
+
+def _count_by_name(table, name_cond, *args):
+    # 행에는 sender id 만 있어서 이름(별칭)으로 셀 때는 sender_aliases 를 거침
+    return _count(
+        f"""
+        SELECT COUNT(*) FROM {table} WHERE sender_id IN (
+            SELECT sender_id FROM sender_aliases WHERE name {name_cond}
+        )
+        """,
+        *args,
+    )
+
+
+def test_post_progress_many_stores_raw_once():
+    result = repo.post_progress_many("many1", "1-300일차 완료", list(range(1, 301)))
+
+    assert isinstance(result, RecordResult)
+    assert result.inserted_count == 300
+    assert result.duplicate_count == 0
+    assert _count_by_name("raw_messages", "= ?", "many1") == 1
+    assert _count_by_name("progress", "= ?", "many1") == 300
+
+
+def test_post_progress_many_reports_duplicates_per_day():
+    repo.post_progress_many("many2", "2,3일차 완료", [2, 3])
+    result = repo.post_progress_many("many2", "1-4, 4일차 완료", [1, 2, 3, 4, 4])
+
+    assert result.statuses == [
+        Errors.SUCCESS,
+        Errors.DB_DUPLICATE_DAY,
+        Errors.DB_DUPLICATE_DAY,
+        Errors.SUCCESS,
+        Errors.DB_DUPLICATE_DAY,
+    ]
+    assert result.inserted_count == 2
+    assert result.duplicate_count == 3
+    assert _count_by_name("progress", "= ?", "many2") == 4
+
+
+def test_post_progress_single_day():
+    assert repo.post_progress("single", "1일차 완료", 1) == Errors.SUCCESS
+    assert repo.post_progress("single", "1일차 완료", 1) == Errors.DB_DUPLICATE_DAY
+
+
+def test_write_behind_group_commit():
+    import threading
+
+    wb_repo = Repository(
+        db_path,
+        day_counter=clock,
+        logger_stream=False,
+        logging_level=logging.INFO,
+        write_behind=True,
+        write_max_delay=0.01,
+    )
+    results = {}
+
+    def record(i):
+        results[i] = wb_repo.post_progress_many(f"wb{i % 4}", "완료", [i // 4 + 1])
+
+    threads = [threading.Thread(target=record, args=(i,)) for i in range(40)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert all(r.status == Errors.SUCCESS for r in results.values())
+    assert _count_by_name("progress", "LIKE 'wb%'") == 40
+
+    # 이미 있는 일차는 writer 를 거쳐도 중복으로 나옴
+    assert wb_repo.post_progress("wb0", "완료", 1) == Errors.DB_DUPLICATE_DAY
+
+
+def test_write_behind_close_flushes_queue():
+    wb_repo = Repository(
+        db_path,
+        day_counter=clock,
+        logger_stream=False,
+        logging_level=logging.INFO,
+        write_behind=True,
+        write_max_delay=0.05,
+    )
+    futures = [wb_repo.submit_progress("flush", "완료", [d]) for d in range(1, 21)]
+    wb_repo.close()
+
+    assert all(f.done() for f in futures)
+    assert _count_by_name("progress", "= ?", "flush") == 20
+
+
+def test_storage_profile_applied_to_connections():
+    from db import get_profile
+
+    wal_repo = Repository(
+        "./tests/db/test_repository_wal.db",
+        day_counter=clock,
+        logging_level=logging.INFO,
+        storage_profile={"base": "wal", "cache_size": -2000},
+    )
+    with wal_repo._get_connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -2000
+    wal_repo.close()
+
+    assert get_profile(None) == get_profile("default")
+
+
+def test_migrations_run_once():
+    from db import LATEST_VERSION, migrate
+
+    with repo._get_connection() as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == LATEST_VERSION
+        # reading_plan 은 legacy 라 새 DB 에선 비어 있음
+        assert conn.execute("SELECT COUNT(*) FROM reading_plan").fetchone()[0] == 0
+    with repo._pool.connection() as conn:
+        assert migrate(conn, total_days=365) == []
+
+
+def test_migrations_adopt_legacy_database():
+    import sqlite3
+
+    legacy_path = "./tests/db/test_repository_legacy.db"
+    try:
+        os.remove(legacy_path)
+    except FileNotFoundError:
+        pass
+
+    # user_version 도입 전에 만들어진 DB
+    conn = sqlite3.connect(legacy_path)
+    conn.execute(
+        """
+        CREATE TABLE progress(
+            id      INTEGER PRIMARY KEY AUTOINCREMENT,
+            sender  TEXT NOT NULL,
+            day     INTEGER NOT NULL,
+            msg_id  INTEGER,
+            time    TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(sender, day)
+        )
+        """
+    )
+    conn.execute("INSERT INTO progress(sender, day) VALUES ('legacy', 1)")
+    conn.commit()
+    conn.close()
+
+    legacy = Repository(legacy_path, day_counter=clock, logging_level=logging.INFO)
+    summary = legacy.get_progress("legacy")
+    legacy.close()
+
+    assert summary.completed_count == 1
+    assert summary.missing_days == list(range(2, 301))
+
+
+bitmap_path = "./tests/db/test_repository_bitmap.db"
+
+try:
+    os.remove(bitmap_path)
+except FileNotFoundError:
+    pass
+
+bitmap_repo = Repository(
+    bitmap_path,
+    day_counter=clock,
+    logging_level=logging.INFO,
+    storage_layout="bitmap",
+)
+
+
+def test_bitmap_layout_matches_rows_layout():
+    records = [
+        ("bm1", [1, 2, 3]),
+        ("bm1", [3, 4, 4, 200]),
+        ("bm2", [5]),
+        ("bm2", list(range(10, 300))),
+    ]
+    for sender, days in records:
+        rows_result = repo.post_progress_many(sender, "완료", days)
+        bitmap_result = bitmap_repo.post_progress_many(sender, "완료", days)
+        assert rows_result.statuses == bitmap_result.statuses
+
+    for sender in ("bm1", "bm2", "nobody"):
+        assert repo.get_progress(sender) == bitmap_repo.get_progress(sender)
+
+    rows_all = [p for p in repo.get_all_progresses() if p.sender.startswith("bm")]
+    assert rows_all == bitmap_repo.get_all_progresses()
+
+
+def test_convert_rows_to_bitmap():
+    from db.maintenance import main
+
+    main(["--db", db_path, "to-bitmap"])
+    main(["--db", db_path, "to-bitmap"])  # 두 번 돌려도 같음
+
+    converted = Repository(
+        db_path, day_counter=clock, logging_level=logging.INFO, storage_layout="bitmap"
+    )
+    assert converted.get_all_progresses() == repo.get_all_progresses()
+    for summary in repo.get_all_progresses():
+        assert converted.get_progress(summary.sender) == repo.get_progress(
+            summary.sender
+        )
+    converted.close()
+
+
+def test_sender_stats_follow_writes():
+    repo.post_progress_many("stats1", "1-3일차 완료", [1, 2, 3])
+    repo.post_progress_many("stats1", "3, 7일차 완료", [3, 7])
+
+    with repo._get_connection() as conn:
+        row = conn.execute(
+            "SELECT completed_count, last_day FROM sender_stats WHERE sender_id = ?",
+            (repo.sender_id("stats1"),),
+        ).fetchone()
+    assert tuple(row) == (4, 7)
+
+    assert repo.verify_sender_stats() == []
+    assert bitmap_repo.verify_sender_stats() == []
+
+
+def test_sender_stats_rebuild_repairs_drift():
+    with repo._get_connection() as conn:
+        conn.execute(
+            "UPDATE sender_stats SET completed_count = 999 WHERE sender_id = ?",
+            (repo.sender_id("stats1"),),
+        )
+        conn.execute(
+            "DELETE FROM sender_stats WHERE sender_id = ?", (repo.sender_id("many1"),)
+        )
+
+    drifts = repo.verify_sender_stats()
+    assert [d.sender for d in drifts] == ["many1", "stats1"]
+    assert drifts[0].actual is None
+
+    repo.rebuild_sender_stats()
+    assert repo.verify_sender_stats() == []
+
+
+def test_progress_cache_hits_and_invalidates_on_write():
+    cached_repo = Repository(
+        db_path, day_counter=clock, logging_level=logging.INFO, cache_size=2
+    )
+    first = cached_repo.get_progress("cache1")
+    assert cached_repo.get_progress("cache1") is first
+    assert cached_repo.cache_stats()["hits"] == 1
+
+    cached_repo.post_progress("cache1", "1일차 완료", 1)
+    after_write = cached_repo.get_progress("cache1")
+    assert after_write.completed_count == first.completed_count + 1
+
+    # 날이 바뀌면 예전 값은 안 씀
+    clock._day += 1
+    try:
+        assert cached_repo.get_progress("cache1").max_day == after_write.max_day + 1
+    finally:
+        clock._day -= 1
+
+    # maxsize 넘으면 제일 오래된 것부터 밀려남
+    # (기록 없는 이름은 한 칸을 같이 써서 기록을 하나씩 넣어둠)
+    cached_repo.post_progress("cache2", "1일차 완료", 1)
+    cached_repo.post_progress("cache3", "1일차 완료", 1)
+    cached_repo.get_progress("cache2")
+    cached_repo.get_progress("cache3")
+    stats = cached_repo.cache_stats()
+    assert stats["size"] == 2
+    assert stats["misses"] == 5
+    cached_repo.close()
+
+
+def test_progress_cache_counts_from_many_threads():
+    import threading
+
+    from db import ProgressCache
+    from entities import ProgressSummary
+
+    cache = ProgressCache(maxsize=4)
+    cache.put((1, 1), 10, ProgressSummary("t", 0, 10, []), cache.generation)
+
+    def read():
+        for i in range(2000):
+            cache.get((1, 1), 10 + i % 2)
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = cache.stats()
+    assert stats["hits"] == stats["misses"] == 8 * 1000
+
+
+def test_progress_cache_invalidated_by_write_behind():
+    wb_repo = Repository(
+        db_path, day_counter=clock, logging_level=logging.INFO, write_behind=True
+    )
+    before = wb_repo.get_progress("cache_wb")
+    wb_repo.post_progress("cache_wb", "2일차 완료", 2)
+    assert wb_repo.get_progress("cache_wb").completed_count == (
+        before.completed_count + 1
+    )
+    wb_repo.close()
+
+
+def test_post_progress_batch_single_transaction():
+    records = [
+        ("batch1", "1-3일차 완료", [1, 2, 3]),
+        ("batch2", "1일차 완료", [1]),
+        ("batch1", "3, 4일차 완료", [3, 4]),
+        ("batch2", "1일차 완료", [1]),
+    ]
+    results = repo.post_progress_batch(records)
+
+    assert [r.sender for r in results] == ["batch1", "batch2", "batch1", "batch2"]
+    assert [r.status for r in results] == [
+        Errors.SUCCESS,
+        Errors.SUCCESS,
+        Errors.SUCCESS,
+        Errors.DB_DUPLICATE_DAY,
+    ]
+    assert results[2].statuses == [Errors.DB_DUPLICATE_DAY, Errors.SUCCESS]
+    assert _count_by_name("raw_messages", "LIKE 'batch%'") == 4
+    assert repo.verify_sender_stats() == []
+
+    assert repo.post_progress_batch([]) == []
+
+
+def test_post_progress_batch_rolls_back_on_failure():
+    result = repo.post_progress_batch(
+        [("batch3", "1일차 완료", [1]), ("batch3", "완료", [None])]
+    )
+
+    assert result == Errors.DB_FAIL
+    assert _count_by_name("raw_messages", "= 'batch3'") == 0
+
+
+def test_post_progress_batch_write_behind_bitmap():
+    wb_repo = Repository(
+        bitmap_path,
+        day_counter=clock,
+        logging_level=logging.INFO,
+        storage_layout="bitmap",
+        write_behind=True,
+    )
+    results = wb_repo.post_progress_batch(
+        [("batch4", "완료", [1, 2]), ("batch4", "완료", [2, 3])]
+    )
+    wb_repo.close()
+
+    assert [r.inserted_count for r in results] == [2, 1]
+    assert bitmap_repo.get_progress("batch4").completed_count == 3
@@ -0,0 +1,143 @@
+import os
+import shutil
+import threading
+
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from usecase import Room, RoomRegistry, UnknownRoomError
+from usecase import build_chat_service
+
+room_dir = "./tests/db/rooms"
+db_path = "./tests/db/test_rooms.db"
+
+shutil.rmtree(room_dir, ignore_errors=True)
+for suffix in ("", "-wal", "-shm"):
+    try:
+        os.remove(db_path + suffix)
+    except FileNotFoundError:
+        pass
+
+
+class FakeRepo:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def _registry(max_open=2, known=("a", "b", "c")):
+    opened = []
+
+    def open_room(room_id):
+        if room_id not in known:
+            raise UnknownRoomError(room_id)
+        if room_id == "broken":
+            raise KeyError("START_DATE")
+        opened.append(room_id)
+        return Room(room_id, FakeRepo(), clock=None, handler=None)
+
+    return RoomRegistry(open_room, max_open=max_open), opened
+
+
+def test_rooms_open_lazily_and_evict_lru():
+    registry, opened = _registry()
+    assert opened == []
+
+    with registry.room("a") as a:
+        pass
+    with registry.room("b"):
+        pass
+    with registry.room("a"):
+        pass
+    with registry.room("c"):
+        pass
+
+    # b 가 제일 오래 안 써서 밀려남
+    assert opened == ["a", "b", "c"]
+    assert registry.open_rooms() == ["a", "c"]
+    assert not a.repo.closed
+    assert registry.stats()["evictions"] == 1
+
+
+def test_evicted_room_closes_after_last_user():
+    registry, _ = _registry(max_open=1)
+    with registry.room("a") as a:
+        with registry.room("b"):
+            assert a.evicted
+            assert not a.repo.closed
+    assert a.repo.closed
+
+
+def test_unknown_room():
+    registry, _ = _registry()
+    with pytest.raises(UnknownRoomError):
+        with registry.room("zzz"):
+            pass
+
+
+def test_open_errors_are_not_unknown_room():
+    # 설정이 깨진 방은 모르는 방으로 삼키지 않고 그대로 올라감
+    registry, _ = _registry(known=("a", "broken"))
+    with pytest.raises(KeyError):
+        with registry.room("broken"):
+            pass
+    assert registry.open_rooms() == []
+    # 실패한 방도 다음에 다시 열어볼 수 있음
+    assert registry._opening == {}
+
+
+def test_same_room_opened_once_under_concurrency():
+    registry, opened = _registry()
+    barrier = threading.Barrier(8)
+
+    def use():
+        barrier.wait()
+        with registry.room("a"):
+            pass
+
+    threads = [threading.Thread(target=use) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert opened == ["a"]
+
+
+def test_service_routes_rooms_to_their_own_db():
+    settings = SimpleNamespace(
+        DB_PATH=db_path,
+        START_DATE=date.today() - timedelta(days=9),
+        TOTAL_DAYS=30,
+        LOG_LEVELS={"db": "ERROR", "msg_handler": "ERROR", "classifier": "ERROR"},
+        ROOM_DB_DIR=room_dir,
+        ROOMS={
+            "moscow": {},
+            # 이 방은 5일 늦게 시작
+            "spb": {"START_DATE": date.today() - timedelta(days=4)},
+        },
+        ROOMS_MAX_OPEN=1,
+    )
+    service = build_chat_service(settings)
+
+    service.reply({"sender": "kim", "msg": "1일차 완료", "room": "moscow"})
+    replies = service.reply_many(
+        [
+            {"sender": "kim", "msg": "/진행상황", "room": "moscow"},
+            {"sender": "kim", "msg": "/진행상황", "room": "spb"},
+            {"sender": "kim", "msg": "/진행상황"},
+            {"sender": "kim", "msg": "/진행상황", "room": "nowhere"},
+        ]
+    )
+
+    assert replies[0]["msg"][1].startswith("1/")
+    assert replies[1]["msg"][1].startswith("0/")
+    assert replies[2]["msg"][1].startswith("0/")
+    assert replies[3] == ""
+    assert os.path.exists(os.path.join(room_dir, "moscow.db"))
+    assert os.path.exists(os.path.join(room_dir, "spb.db"))
+    assert service.rooms.stats()["open"] == 1
+    assert service.metrics.counter_value("unknown_rooms_total") == 1
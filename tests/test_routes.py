@@ -0,0 +1,72 @@
+import os
+import json
+
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("flask")
+
+from app import create_flask_app  # noqa: E402
+
+db_path = "./tests/db/test_routes.db"
+
+for suffix in ("", "-wal", "-shm"):
+    try:
+        os.remove(db_path + suffix)
+    except FileNotFoundError:
+        pass
+
+settings = SimpleNamespace(
+    DB_PATH=db_path,
+    # 오늘이 10일차
+    START_DATE=date.today() - timedelta(days=9),
+    TOTAL_DAYS=30,
+    LOG_LEVELS={"db": "ERROR", "msg_handler": "ERROR", "classifier": "ERROR"},
+    BATCH_MAX_MESSAGES=3,
+    BATCH_MAX_BYTES=300,
+)
+
+client = create_flask_app(settings).test_client()
+
+
+def _batch(data):
+    return client.post("/batch", data=json.dumps(data, ensure_ascii=False))
+
+
+def test_batch_replies_in_order():
+    res = _batch(
+        [
+            {"sender": "r1", "msg": "1-3일차 완료"},
+            {"sender": "r1", "msg": "/진행상황"},
+            {"sender": "r1", "msg": "안녕"},
+        ]
+    )
+    assert res.status_code == 200
+    replies = res.get_json()
+    assert replies[0] == "" and replies[2] == ""
+    assert replies[1]["msg"][0] == "r1님의 진행상황"
+    assert replies[1]["msg"][1].startswith("3/")
+
+
+def test_batch_limits():
+    assert _batch([{"msg": "a"}] * 4).status_code == 413
+    assert client.post("/batch", data=b"[" + b" " * 400 + b"]").status_code == 413
+    # Content-Length 만 보고 본문 읽기 전에 거름
+    # (headers= 로 주면 test client 가 실제 길이로 덮어써서 environ 으로 넣음)
+    res = client.post(
+        "/batch", data=b"[]", environ_overrides={"CONTENT_LENGTH": "10000"}
+    )
+    assert res.status_code == 413
+
+
+def test_batch_bad_items():
+    assert client.post("/batch", data=b"{}").status_code == 400
+    assert client.post("/batch", data=b"not json").status_code == 400
+    assert _batch([{"sender": "r2"}]).status_code == 400
+    assert _batch([{"sender": "r2", "msg": 5}]).status_code == 400
+    assert _batch([{"sender": ["r2"], "msg": "1일차 완료"}]).status_code == 400
+    # 거절된 batch 는 아무것도 기록 안 함
+    res = client.post("/", json={"sender": "r2", "msg": "/진행상황"})
+    assert res.get_json()["msg"][1].startswith("0/")
@@ -0,0 +1,178 @@
+import os
+import sqlite3
+import logging
+
+from db import Repository
+from db.migrations import MIGRATIONS
+
+from entities import Errors
+
+
+class MockClock:
+    def __init__(self, current_day_return):
+        self._day = current_day_return
+
+    def current_day(self):
+        return self._day
+
+
+def _fresh(path):
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.remove(path + suffix)
+        except FileNotFoundError:
+            pass
+    return path
+
+
+db_path = _fresh("./tests/db/test_senders.db")
+
+clock = MockClock(current_day_return=300)
+
+repo = Repository(
+    db_path, day_counter=clock, logger_stream=False, logging_level=logging.INFO
+)
+bitmap_repo = Repository(
+    _fresh("./tests/db/test_senders_bitmap.db"),
+    day_counter=clock,
+    logging_level=logging.INFO,
+    storage_layout="bitmap",
+)
+
+
+def test_rename_keeps_history():
+    for r in (repo, bitmap_repo):
+        r.post_progress_many("양", "1-3일차 완료", [1, 2, 3])
+        assert r.rename_sender("양", "양2") == Errors.SUCCESS
+
+        # 새 이름으로 이어서 기록하고, 예전 이름으로 와도 같은 사람
+        assert r.post_progress("양2", "3일차 완료", 3) == Errors.DB_DUPLICATE_DAY
+        assert r.post_progress("양2", "4일차 완료", 4) == Errors.SUCCESS
+        assert r.post_progress("양", "5일차 완료", 5) == Errors.SUCCESS
+
+        assert r.get_progress("양2").completed_count == 5
+        assert r.sender_id("양") == r.sender_id("양2")
+
+        # /집계 에는 지금 이름 하나로만 나옴
+        names = [p.sender for p in r.get_all_progresses()]
+        assert "양2" in names and "양" not in names
+        assert r.verify_sender_stats() == []
+
+
+def test_cache_follows_sender_across_names():
+    # 캐시가 켜진 상태에서 예전 이름으로 기록해도 새 이름 /진행상황 이 바로 바뀜
+    repo.post_progress("han", "1일차 완료", 1)
+    assert repo.rename_sender("han", "han2") == Errors.SUCCESS
+
+    assert repo.get_progress("han2").completed_count == 1
+    assert repo.get_progress("han2").completed_count == 1
+    assert repo.post_progress("han", "2일차 완료", 2) == Errors.SUCCESS
+    assert repo.get_progress("han2").completed_count == 2
+
+    # 같은 칸을 예전 이름으로 읽어도 요청한 이름으로 나옴
+    assert repo.get_progress("han").sender == "han"
+    assert repo.get_progress("han2").sender == "han2"
+
+
+def test_cache_drops_empty_summary_on_first_record():
+    assert repo.get_progress("newbie").completed_count == 0
+    assert repo.get_progress("nobody2").sender == "nobody2"
+    assert repo.post_progress("newbie", "1일차 완료", 1) == Errors.SUCCESS
+    assert repo.get_progress("newbie").completed_count == 1
+    assert repo.get_progress("nobody2").completed_count == 0
+
+
+def test_rename_errors():
+    repo.post_progress("choi", "1일차 완료", 1)
+    repo.post_progress("lee", "1일차 완료", 1)
+
+    assert repo.rename_sender("nobody", "choi2") == Errors.UNKNOWN_SENDER
+    assert repo.rename_sender("choi", "lee") == Errors.DUPLICATE_SENDER
+    # 예전 이름으로 되돌리는 건 표시 이름만 바뀜
+    assert repo.rename_sender("choi", "choi2") == Errors.SUCCESS
+    assert repo.rename_sender("choi2", "choi") == Errors.SUCCESS
+    assert "choi" in [p.sender for p in repo.get_all_progresses()]
+
+
+def test_rolled_back_sender_is_not_cached():
+    result = repo.post_progress_batch(
+        [("ghost", "1일차 완료", [1]), ("ghost", "완료", [None])]
+    )
+    assert result == Errors.DB_FAIL
+    assert "ghost" not in repo._sender_ids
+    assert repo.sender_id("ghost") is None
+
+    assert repo.post_progress("ghost", "1일차 완료", 1) == Errors.SUCCESS
+    assert repo._sender_ids["ghost"] == repo.sender_id("ghost")
+
+
+def test_progress_index_uses_integer_sender():
+    with repo._get_connection() as conn:
+        rows = conn.execute(
+            """
+            EXPLAIN QUERY PLAN
+            SELECT day FROM progress WHERE plan_id = 1 AND sender_id = ? ORDER BY day
+            """,
+            (repo.sender_id("lee"),),
+        ).fetchall()
+    detail = " ".join(r[-1] for r in rows)
+    assert "USING COVERING INDEX" in detail
+
+
+def test_migration_moves_names_to_ids():
+    path = _fresh("./tests/db/test_senders_v5.db")
+
+    # senders 도입 전(version 5) DB 에 이름으로 기록해둠
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    for migration in MIGRATIONS[:5]:
+        migration.apply(cursor, 300)
+    cursor.execute("PRAGMA user_version = 5")
+    cursor.execute("INSERT INTO raw_messages(sender, msg) VALUES ('kim', '1,2일차')")
+    cursor.executemany(
+        "INSERT INTO progress(sender, day, msg_id) VALUES (?,?,1)",
+        [("kim", 1), ("kim", 2), ("park", 7)],
+    )
+    cursor.execute(
+        """
+        INSERT INTO sender_stats(plan_id, sender, completed_count, last_day)
+        VALUES (1, 'kim', 2, 2), (1, 'park', 1, 7)
+        """
+    )
+    cursor.execute(
+        "INSERT INTO progress_bitmap(sender, plan_id, bits) VALUES ('bm', 1, X'05')"
+    )
+    conn.commit()
+    conn.close()
+
+    migrated = Repository(path, day_counter=clock, logging_level=logging.INFO)
+    assert migrated.get_progress("kim").completed_count == 2
+    assert [(p.sender, p.completed_count) for p in migrated.get_all_progresses()] == [
+        ("kim", 2),
+        ("park", 1),
+    ]
+    assert migrated.verify_sender_stats() == []
+    assert migrated.post_progress("kim", "2일차 완료", 2) == Errors.DB_DUPLICATE_DAY
+
+    with migrated._get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM senders").fetchone()[0] == 3
+        assert conn.execute(
+            "SELECT sender_id FROM raw_messages WHERE id = 1"
+        ).fetchone()[0] == migrated.sender_id("kim")
+    migrated.close()
+
+    bitmap = Repository(
+        path, day_counter=clock, logging_level=logging.INFO, storage_layout="bitmap"
+    )
+    assert bitmap.get_progress("bm").completed_count == 2
+    bitmap.close()
+
+
+def test_rename_from_maintenance_command():
+    from db.maintenance import main
+
+    repo.post_progress("jung", "1일차 완료", 1)
+    main(["--db", db_path, "rename-sender", "jung", "jung2"])
+
+    assert repo.sender_id("jung2") == repo.sender_id("jung")
+    assert repo.get_progress("jung2").completed_count == 1
@@ -1,3 +1,6 @@
 from .message_handler import MessageHandler
 from .classifier import MessageClassifier
 from .formatter import Formatter
+from .deduplicator import DeliveryDeduplicator
+from .rooms import Room, RoomRegistry, UnknownRoomError
+from .chat_service import ChatService, build_chat_service
@@ -0,0 +1,410 @@
+# usecase/chat_service.py
+
+import os
+import json
+import time
+import atexit
+import logging
+
+from typing import Any, Dict
+
+from entities import Errors
+from entities import ClassificationResult
+from entities import MessageKind
+
+from db.repository import Repository
+from db.progress_store import DEFAULT_PLAN_ID
+
+from utilities import DayParser
+from utilities import AbsoluteDayCounter
+from utilities import configure_logging
+from utilities import Metrics
+
+from .formatter import Formatter
+from .message_handler import MessageHandler
+from .classifier import MessageClassifier
+from .deduplicator import DeliveryDeduplicator
+from .rooms import Room, RoomRegistry, UnknownRoomError
+
+# 거절할 때 (status, {"error": ...})
+Rejection = tuple[int, Dict[str, str]]
+
+
+class ChatService:
+    """
+    웹 프레임워크랑 상관없는 요청 처리 흐름 (분류 → 재전송 거르기 → 처리 → 답장).
+    Flask 라우트 (app/routes.py) 랑 ASGI 앱 (app/asgi.py) 이 같이 씀.
+    - reply(data): POST / 하나
+    - reply_many(messages): POST /batch, 답장은 같은 순서로
+    - parse_batch(body): /batch 본문 검사. 안 되면 (None, (status, {"error"}))
+    - metrics_text(): /metrics 본문, 꺼져 있으면 None
+    메시지에 "room" 이 있고 rooms 가 있으면 그 방의 DB/일차로 처리하고,
+    없으면 기본 방 (handler/dedup) 으로. 모르는 방이면 빈 답장.
+    "plan" (계획 이름이나 id) 이 있으면 그 계획에 기록/조회. 없으면 기본 계획.
+    """
+
+    def __init__(
+        self,
+        classifier: MessageClassifier,
+        handler: MessageHandler,
+        formatter: Formatter,
+        metrics: Metrics | None = None,
+        dedup: DeliveryDeduplicator | None = None,
+        batch_max_messages: int = 500,
+        batch_max_bytes: int = 1024 * 1024,
+        rooms: RoomRegistry | None = None,
+    ) -> None:
+        self.classifier = classifier
+        self.handler = handler
+        self.formatter = formatter
+        self.metrics: Metrics = metrics or Metrics(enabled=False)
+        self.dedup = dedup
+        self.batch_max_messages = batch_max_messages
+        self.batch_max_bytes = batch_max_bytes
+        self.rooms = rooms
+
+    @property
+    def repo(self) -> Repository:
+        return self.handler.repo
+
+    def _count(self, message: ClassificationResult, progress: Any) -> None:
+        self.metrics.inc("messages_total", kind=message.kind.name)
+        outcome = progress.name if isinstance(progress, Errors) else "REPLY"
+        self.metrics.inc("outcomes_total", outcome=outcome)
+
+    def _room_id(self, data: Dict[str, Any]) -> str | None:
+        room_id = data.get("room") if self.rooms is not None else None
+        return str(room_id) if room_id else None
+
+    def _unknown_room(self, room_id: str) -> str:
+        self.metrics.inc("unknown_rooms_total")
+        self.rooms.logger.warning("Unknown room:%s", room_id)
+        return ""
+
+    @staticmethod
+    def _plan_ref(data: Dict[str, Any]) -> str | None:
+        plan = data.get("plan")
+        return str(plan) if plan else None
+
+    @staticmethod
+    def _plan_id(handler: MessageHandler, plan_ref: str | None) -> int | None:
+        if plan_ref is None:
+            return DEFAULT_PLAN_ID
+        return handler.repo.plan_id(plan_ref)
+
+    def reply(self, data: Dict[str, Any]) -> Any:
+        room_id = self._room_id(data)
+        if room_id is None:
+            return self._reply(self.handler, self.dedup, data)
+
+        try:
+            with self.rooms.room(room_id) as room:
+                return self._reply(room.handler, room.dedup, data)
+        except UnknownRoomError:
+            return self._unknown_room(room_id)
+
+    def _reply(
+        self,
+        handler: MessageHandler,
+        dedup: DeliveryDeduplicator | None,
+        data: Dict[str, Any],
+    ) -> Any:
+        metrics = self.metrics
+
+        with metrics.timer("stage_seconds", stage="classify"):
+            message = self.classifier.classify(data)
+
+        # 릴레이가 다시 보낸 기록이면 기록 안 하고 예전 답장 그대로.
+        # key 는 기록이랑 같은 트랜잭션에서 deliveries 에 들어감
+        key = None
+        delivery = None
+        if dedup is not None and message.kind == MessageKind.RECORD:
+            key = dedup.key_for(data)
+        if key is not None:
+            with metrics.timer("stage_seconds", stage="dedup"):
+                seen = dedup.seen(key)
+            if seen:
+                metrics.inc("duplicate_deliveries_total")
+                return dedup.reply_for(key)
+            delivery = dedup.delivery(key)
+
+        with metrics.timer("stage_seconds", stage="handle"):
+            plan_id = self._plan_id(handler, self._plan_ref(data))
+            if plan_id is None:
+                progress = Errors.UNKNOWN_PLAN
+            else:
+                progress = handler.handle_message(message, plan_id, delivery)
+        if progress == Errors.DUPLICATE_DELIVERY:
+            metrics.inc("duplicate_deliveries_total")
+            return dedup.reply_for(key)
+
+        with metrics.timer("stage_seconds", stage="format"):
+            reply = self.formatter.send_to_kakao_api(progress)
+        if dedup is not None:
+            dedup.finish(key, progress, reply)
+        self._count(message, progress)
+        return reply
+
+    def parse_batch(self, body: bytes) -> tuple[list | None, Rejection | None]:
+        if len(body) > self.batch_max_bytes:
+            return None, self.too_large()
+
+        try:
+            data = json.loads(body)
+        except ValueError:
+            data = None
+        if not isinstance(data, list) or not all(isinstance(m, dict) for m in data):
+            return None, (400, {"error": "expected a JSON array of messages"})
+        # 하나라도 이상하면 classify 에서 터져서 전부 500 이 되니까 미리 거름
+        for i, m in enumerate(data):
+            if not isinstance(m.get("msg"), str) or not isinstance(
+                m.get("sender", ""), str
+            ):
+                return None, (400, {"error": f"message {i} needs string msg/sender"})
+
+        if len(data) > self.batch_max_messages:
+            limit = self.batch_max_messages
+            return None, (413, {"error": f"more than {limit} messages"})
+        return data, None
+
+    def too_large(self) -> Rejection:
+        return 413, {"error": f"payload larger than {self.batch_max_bytes} bytes"}
+
+    def reply_many(self, data: list[Dict[str, Any]]) -> list:
+        """
+        기록은 (방, 계획) 마다 트랜잭션 하나로 들어감 (중간에 명령이 있으면 그 앞에서
+        한 번 끊김). 섞여 있으면 나눠서 처리하고 답장은 원래 순서대로.
+        """
+        groups: dict[tuple[str | None, str | None], list[int]] = {}
+        for i, m in enumerate(data):
+            groups.setdefault((self._room_id(m), self._plan_ref(m)), []).append(i)
+
+        if list(groups) == [(None, None)]:
+            return self._reply_many(self.handler, self.dedup, data, None)
+
+        replies: list = [None] * len(data)
+        for (room_id, plan_ref), indices in groups.items():
+            subset = [data[i] for i in indices]
+            if room_id is None:
+                answers = self._reply_many(self.handler, self.dedup, subset, plan_ref)
+            else:
+                try:
+                    with self.rooms.room(room_id) as room:
+                        answers = self._reply_many(
+                            room.handler, room.dedup, subset, plan_ref
+                        )
+                except UnknownRoomError:
+                    answers = [self._unknown_room(room_id)] * len(subset)
+            for i, answer in zip(indices, answers):
+                replies[i] = answer
+        return replies
+
+    def _reply_many(
+        self,
+        handler: MessageHandler,
+        dedup: DeliveryDeduplicator | None,
+        data: list[Dict[str, Any]],
+        plan_ref: str | None,
+    ) -> list:
+        metrics = self.metrics
+
+        with metrics.timer("stage_seconds", stage="classify_many"):
+            classified = self.classifier.classify_many(data)
+
+        # 기록 메시지만 재전송을 거름 (_reply 참고)
+        keys = [
+            dedup.key_for(m)
+            if dedup is not None and message.kind == MessageKind.RECORD
+            else None
+            for m, message in zip(data, classified)
+        ]
+        with metrics.timer("stage_seconds", stage="dedup"):
+            fresh = [i for i, k in enumerate(keys) if k is None or not dedup.seen(k)]
+        messages = [classified[i] for i in fresh]
+        deliveries = [
+            dedup.delivery(keys[i]) if keys[i] is not None else None for i in fresh
+        ]
+
+        with metrics.timer("stage_seconds", stage="handle_many"):
+            plan_id = self._plan_id(handler, plan_ref)
+            if plan_id is None:
+                progresses = [Errors.UNKNOWN_PLAN] * len(messages)
+            else:
+                progresses = handler.handle_many(messages, plan_id, deliveries)
+
+        replies: list = [None] * len(data)
+        duplicates = len(data) - len(fresh)
+        start = time.perf_counter()
+        for i, message, progress in zip(fresh, messages, progresses):
+            if progress == Errors.DUPLICATE_DELIVERY:
+                duplicates += 1
+                continue
+            reply = self.formatter.send_to_kakao_api(progress)
+            replies[i] = reply
+            if dedup is not None:
+                dedup.finish(keys[i], progress, reply)
+            self._count(message, progress)
+        metrics.observe(
+            "stage_seconds", time.perf_counter() - start, stage="format_many"
+        )
+        metrics.inc("duplicate_deliveries_total", duplicates)
+
+        # 재전송된 건 (같은 batch 안에서 두 번 온 것도) 처리한 쪽 답장을 그대로
+        for i, reply in enumerate(replies):
+            if reply is None:
+                replies[i] = dedup.reply_for(keys[i])
+        return replies
+
+    def metrics_text(self) -> str | None:
+        """Prometheus text. METRICS_ENABLED=False 면 None"""
+        if not self.metrics.enabled:
+            return None
+
+        # 캐시들은 긁어갈 때 값만 옮겨둠
+        caches = {
+            "progress": self.repo.cache_stats(),
+            "parse": self.classifier.parser.cache_stats(),
+        }
+        if self.rooms is not None:
+            caches["rooms"] = self.rooms.stats()
+        for cache, stats in caches.items():
+            for field, value in (stats or {}).items():
+                self.metrics.set_gauge(f"cache_{field}", value, cache=cache)
+        return self.metrics.render()
+
+
+def _open_room(
+    settings,
+    room_id: str,
+    db_path: str,
+    start_date,
+    total_days: int,
+    tz_offset_hours: int,
+    pool_size: int,
+    metrics: Metrics,
+    prefork: bool,
+    run_migrations: bool,
+) -> Room:
+    clock = AbsoluteDayCounter(start_date=start_date, tz_offset_hours=tz_offset_hours)
+
+    repo = Repository(
+        db_path=db_path,
+        day_counter=clock,
+        total_days=total_days,
+        logger_stream=True,
+        logging_level=logging.WARNING,
+        pool_size=pool_size,
+        write_behind=getattr(settings, "DB_WRITE_BEHIND", False),
+        storage_profile=getattr(settings, "SQLITE_PROFILE", "wal"),
+        storage_layout=getattr(settings, "DB_STORAGE_LAYOUT", "rows"),
+        cache_size=getattr(settings, "PROGRESS_CACHE_SIZE", 1024),
+        metrics=metrics,
+        multiprocess=prefork,
+        run_migrations=run_migrations,
+    )
+
+    # 릴레이 재전송 거르기. delivery_id 나 timestamp 가 같이 와야 동작함
+    dedup = None
+    if getattr(settings, "DEDUP_ENABLED", True):
+        dedup = DeliveryDeduplicator(
+            repo,
+            ttl=getattr(settings, "DEDUP_TTL", 24 * 60 * 60),
+            memory_size=getattr(settings, "DEDUP_MEMORY_SIZE", 4096),
+        )
+
+    # {"nt90": {"START_DATE": ..., "TOTAL_DAYS": 90}} 같은 추가 계획. 이름으로 맞춰둠
+    for name, plan in getattr(settings, "PLANS", {}).items():
+        repo.add_plan(
+            name,
+            plan["START_DATE"],
+            plan["TOTAL_DAYS"],
+            plan.get("TZ_OFFSET_HOURS", tz_offset_hours),
+        )
+
+    return Room(room_id, repo, clock, MessageHandler(repo, clock), dedup)
+
+
+def build_chat_service(settings=None, prefork: bool = False) -> ChatService:
+    """
+    settings: DB_PATH, START_DATE, TOTAL_DAYS 같은 값을 속성으로 가진 객체.
+    안 넘기면 config.py. 벤치마크/테스트에선 SimpleNamespace 를 넘김.
+    prefork: gunicorn 워커처럼 여러 프로세스가 같은 DB 를 쓸 때.
+    마이그레이션은 master 가 이미 돌렸다고 보고, /진행상황 캐시는 다른 워커가
+    쓴 것도 보고 비움. 커넥션/writer/로그 스레드는 fork 뒤에 워커마다 따로 뜸.
+    ROOMS 가 있으면 방마다 DB 를 따로 열어두는 RoomRegistry 도 만듦.
+    """
+    if settings is None:
+        import config as settings
+
+    # 로거 만들기 전에. 파일/콘솔 쓰기는 로거마다 뜨는 listener 스레드가 함
+    configure_logging(
+        levels=getattr(settings, "LOG_LEVELS", {}),
+        sample_rates=getattr(settings, "LOG_SAMPLE_RATES", {}),
+        max_bytes=getattr(settings, "LOG_MAX_BYTES", 10 * 1024 * 1024),
+        backup_count=getattr(settings, "LOG_BACKUP_COUNT", 5),
+    )
+
+    # 단계별 시간/카운터. GET /metrics 로 긁어감
+    metrics = Metrics(enabled=getattr(settings, "METRICS_ENABLED", True))
+
+    tz_offset_hours = getattr(settings, "TZ_OFFSET_HOURS", 3)
+    default = _open_room(
+        settings,
+        "",
+        settings.DB_PATH,
+        settings.START_DATE,
+        settings.TOTAL_DAYS,
+        tz_offset_hours,
+        getattr(settings, "DB_POOL_SIZE", 4),
+        metrics,
+        prefork,
+        run_migrations=not prefork,
+    )
+    atexit.register(default.close)
+
+    # {"room-id": {"DB_PATH": ..., "START_DATE": ..., "TOTAL_DAYS": ...}}
+    # 빠진 값은 위 설정을 씀. DB_PATH 가 없으면 ROOM_DB_DIR/<room-id>.db
+    rooms = None
+    room_settings = getattr(settings, "ROOMS", None)
+    if room_settings:
+        room_dir = getattr(settings, "ROOM_DB_DIR", "./rooms")
+
+        def open_room(room_id: str) -> Room:
+            # 설정이나 Repository 안에서 난 KeyError 랑 안 섞이게 여기서만 판단
+            if room_id not in room_settings:
+                raise UnknownRoomError(room_id)
+            conf = room_settings[room_id]
+            db_path = conf.get("DB_PATH") or os.path.join(room_dir, f"{room_id}.db")
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+            return _open_room(
+                settings,
+                room_id,
+                db_path,
+                conf.get("START_DATE", settings.START_DATE),
+                conf.get("TOTAL_DAYS", settings.TOTAL_DAYS),
+                conf.get("TZ_OFFSET_HOURS", tz_offset_hours),
+                getattr(settings, "ROOM_POOL_SIZE", 2),
+                metrics,
+                prefork,
+                # 방 DB 는 처음 열 때 마이그레이션 (BEGIN IMMEDIATE 라 워커끼리 안전)
+                run_migrations=True,
+            )
+
+        max_open = getattr(settings, "ROOMS_MAX_OPEN", 16)
+        rooms = RoomRegistry(open_room, max_open=max_open)
+        atexit.register(rooms.close)
+
+    parser = DayParser(cache_size=getattr(settings, "PARSE_CACHE_SIZE", 1024))
+    classifier = MessageClassifier(parser)
+
+    return ChatService(
+        classifier,
+        default.handler,
+        Formatter(),
+        metrics=metrics,
+        dedup=default.dedup,
+        # POST /batch 한 번에 받을 수 있는 크기
+        batch_max_messages=getattr(settings, "BATCH_MAX_MESSAGES", 500),
+        batch_max_bytes=getattr(settings, "BATCH_MAX_BYTES", 1024 * 1024),
+        rooms=rooms,
+    )
@@ -2,7 +2,7 @@
 
 import logging
 
-from typing import Dict
+from typing import Dict, Iterable, List
 
 from entities import ClassificationResult
 from entities import MessageKind
@@ -22,7 +22,8 @@ class MessageClassifier:
 
     def __init__(self, parser: DayParser) -> None:
         self.parser: DayParser = parser
-        self.logger: logging = set_logger("classifier", s=True, level=logging.DEBUG)
+        # 일반 대화마다 찍히는 debug 로그는 config.LOG_LEVELS 로 켤 때만
+        self.logger: logging = set_logger("classifier", s=True, level=logging.INFO)
 
     def classify(self, raw: Dict[str, str]) -> ClassificationResult:
         """
@@ -59,3 +60,12 @@ class MessageClassifier:
             sender=sender,
             raw=raw["msg"],
         )
+
+    def classify_many(
+        self, raws: Iterable[Dict[str, str]]
+    ) -> List[ClassificationResult]:
+        """
+        classify 를 여러 개 한 번에. 결과는 넣은 순서대로.
+        MessageHandler.handle_many 랑 같이 씀.
+        """
+        return [self.classify(raw) for raw in raws]
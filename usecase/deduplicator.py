@@ -0,0 +1,110 @@
+# usecase/deduplicator.py
+
+import time
+import hashlib
+import logging
+
+from typing import Any, Callable, Dict
+
+from entities import Errors
+
+from db.repository import Repository
+from db.deliveries import Delivery
+
+from utilities import LRUCache
+from utilities import set_logger
+
+
+class DeliveryDeduplicator:
+    """
+    릴레이가 같은 기록 메시지를 다시 보냈을 때 한 번만 기록하게 해주는 클래스.
+    기록 메시지만 거름 (명령/잡담은 다시 처리해도 쓰는 게 없음).
+    - key: raw 에 delivery_id 가 있으면 그거, 없으면 (sender, msg, timestamp) 해시.
+      둘 다 없으면 None (같은 사람이 같은 말을 두 번 할 수도 있으니 안 거름)
+    - 최근 key 는 메모리 LRU 에서 바로 걸러내고 답장도 같이 들고 있음 (seen)
+    - 메모리에 없으면 delivery(key) 를 기록할 때 같이 넘겨서, progress 랑 같은
+      트랜잭션에서 deliveries 테이블에 넣음 (서버 재시작/여러 프로세스 대비).
+      기록이 rollback 되면 key 도 같이 사라지니까 따로 풀어줄 필요 없음
+    - ttl 초 지난 key 는 sweep_interval 마다 테이블에서 지움
+    """
+
+    def __init__(
+        self,
+        repo: Repository,
+        ttl: float = 24 * 60 * 60,
+        memory_size: int = 4096,
+        sweep_interval: float = 60 * 60,
+        now: Callable[[], float] = time.time,
+    ) -> None:
+        self.repo: Repository = repo
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self._now = now
+        # key -> (처리한 시각, 답장)
+        self._recent = LRUCache(memory_size)
+        self._next_sweep = now() + sweep_interval
+        self.logger: logging.Logger = set_logger(
+            "deduplicator", s=True, level=logging.WARNING
+        )
+
+    @staticmethod
+    def key_for(raw: Dict[str, Any]) -> str | None:
+        delivery_id = raw.get("delivery_id")
+        if delivery_id:
+            return f"id:{delivery_id}"
+
+        timestamp = raw.get("timestamp")
+        if timestamp is None:
+            return None
+
+        digest = hashlib.sha256(
+            "\x1f".join(
+                [str(raw.get("sender", "")), str(raw.get("msg", "")), str(timestamp)]
+            ).encode("utf-8")
+        ).hexdigest()
+        return f"h:{digest}"
+
+    def seen(self, key: str) -> bool:
+        """메모리에 최근 처리한 key 가 있으면 True (DB 는 안 봄)"""
+        now = self._now()
+        if now >= self._next_sweep:
+            self.sweep(now)
+
+        entry = self._recent.get(key)
+        if entry is not None and now - entry[0] < self.ttl:
+            self.logger.info("Duplicated delivery ignored key:%s", key)
+            return True
+        return False
+
+    def delivery(self, key: str) -> Delivery:
+        """기록할 때 같이 넘길 (key, 받은 시각)"""
+        return key, self._now()
+
+    def reply_for(self, key: str) -> Any:
+        """처음 처리할 때 remember 해둔 답장. 메모리에 없으면 빈 답장"""
+        entry = self._recent.get(key)
+        if entry is None:
+            return ""
+        return entry[1]
+
+    def remember(self, key: str, reply: Any) -> None:
+        self._recent.put(key, (self._now(), reply))
+
+    def finish(self, key: str | None, progress: Any, reply: Any) -> None:
+        """
+        handle_message 결과를 보고 답장을 기억해둠.
+        DB_FAIL 이면 key 도 rollback 됐으니 기억 안 함 (재전송을 다시 처리하게).
+        DUPLICATE_DELIVERY 면 처음 처리한 쪽 답장을 그대로 둠.
+        """
+        if key is None:
+            return
+        if progress not in (Errors.DB_FAIL, Errors.DUPLICATE_DELIVERY):
+            self.remember(key, reply)
+
+    def sweep(self, now: float | None = None) -> None:
+        now = self._now() if now is None else now
+        self._next_sweep = now + self.sweep_interval
+        self.repo.sweep_deliveries(now - self.ttl)
+
+    def stats(self) -> dict[str, int]:
+        return self._recent.stats()
@@ -50,13 +50,23 @@ class Formatter:
                 parts.append(f"{s}-{e}")
         return "[" + ", ".join(parts) + "]"
 
+    def send_to_kakao_api(
+        self, progress: list[ProgressSummary] | ProgressSummary | Errors
+    ) -> dict[str, list[str]]:
+        """handle_message 결과 하나를 모양에 맞는 쪽으로 넘김"""
+        if isinstance(progress, list):
+            return self.send_to_kakao_api_all_senders(progress)
+        return self.send_to_kakao_api_one_sender(progress)
+
     def send_to_kakao_api_one_sender(
         self, msg: ProgressSummary | Errors
     ) -> dict[str, list[str]]:
         if isinstance(msg, Errors):
             return ""
 
-        days = self._compress_day_list(msg.missing_days)
+        days = msg.missing_ranges
+        if days is None:
+            days = self._compress_day_list(msg.missing_days)
         percentage = round(msg.completed_count / msg.max_day * 100, 1)
 
         out_info = [
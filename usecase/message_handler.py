@@ -2,6 +2,8 @@
 
 import logging
 
+from typing import Iterable
+
 from utilities import set_logger
 from utilities import is_valid_command
 from utilities import AbsoluteDayCounter
@@ -13,6 +15,8 @@ from entities import ProgressSummary
 from entities import ClassificationResult
 
 from db.repository import Repository
+from db.deliveries import Delivery
+from db.progress_store import DEFAULT_PLAN_ID
 
 
 class MessageHandler:
@@ -23,7 +27,18 @@ class MessageHandler:
             "msg_handler", s=True, level=logging.WARNING
         )
 
-    def handle_record_message(self, data: ClassificationResult) -> Errors:
+    def _current_day(self, plan_id: int) -> int | None:
+        """그 계획의 오늘 일차. 없는 계획이면 None"""
+        if plan_id == DEFAULT_PLAN_ID:
+            return self.clock.current_day()
+        if not self.repo.has_plan(plan_id):
+            return None
+        return self.repo.max_day(plan_id)
+
+    def _check_record(
+        self, data: ClassificationResult, current_day: int
+    ) -> Errors | None:
+        """기록 메시지로 못 쓰면 그 Errors, 괜찮으면 None"""
         if data.kind != MessageKind.RECORD:
             self.logger.error(
                 "The message must have the MessageKind.RECORD type, got {%s}", data.kind
@@ -34,23 +49,37 @@ class MessageHandler:
             self.logger.warning("The days is empty")
             return Errors.DATE_ERROR
 
-        if max(data.days) > self.clock.current_day() or min(data.days) <= 0:
+        if max(data.days) > current_day or min(data.days) <= 0:
             self.logger.warning("The day <= 0 or day > current day")
             return Errors.DATE_ERROR
 
-        for (
-            day
-        ) in data.days:  # days는 무조건 명시적으로 [몇일차, 몇일차, 몇일차] 로 들어옴
-            status = self.repo.post_progress(data.sender, data.raw, day)
-            if status == Errors.DB_DUPLICATE_DAY:
-                continue
-            if status != Errors.SUCCESS:
-                return status
+        return None
+
+    def handle_record_message(
+        self,
+        data: ClassificationResult,
+        plan_id: int = DEFAULT_PLAN_ID,
+        delivery: Delivery | None = None,
+    ) -> Errors:
+        current_day = self._current_day(plan_id)
+        if current_day is None:
+            return Errors.UNKNOWN_PLAN
+
+        error = self._check_record(data, current_day)
+        if error is not None:
+            return error
+
+        # raw 메시지 1번 + 모든 일차 (+ delivery key) 를 트랜잭션 하나로 기록
+        result = self.repo.post_progress_many(
+            data.sender, data.raw, data.days, plan_id, delivery
+        )
+        if isinstance(result, Errors):
+            return result
 
-        return status
+        return result.status
 
     def handle_command_message(
-        self, data: ClassificationResult
+        self, data: ClassificationResult, plan_id: int = DEFAULT_PLAN_ID
     ) -> Errors | ProgressSummary:
         if data.kind != MessageKind.COMMAND:
             self.logger.error(
@@ -65,19 +94,79 @@ class MessageHandler:
 
         cmd = Commands(data.command.lstrip("/"))
         if cmd == Commands.PROGRESS_ONE:
-            return self.repo.get_progress(sender=data.sender)
+            return self.repo.get_progress(sender=data.sender, plan_id=plan_id)
 
         if cmd == Commands.PROGRESS_ALL:
-            return self.repo.get_all_progresses()
+            return self.repo.get_all_progresses(plan_id=plan_id)
 
-    def handle_message(self, data: ClassificationResult) -> Errors | ProgressSummary:
+    def handle_message(
+        self,
+        data: ClassificationResult,
+        plan_id: int = DEFAULT_PLAN_ID,
+        delivery: Delivery | None = None,
+    ) -> Errors | ProgressSummary:
+        """
+        plan_id: 어느 읽기 계획에 기록/조회할지 (기본: 1번, config 의 계획)
+        delivery: 재전송 거르기용 (key, 받은 시각). 기록 메시지에만 씀.
+        이미 기록된 key 면 Errors.DUPLICATE_DELIVERY
+        """
         if data.kind == MessageKind.RECORD:
-            result = self.handle_record_message(data)
+            result = self.handle_record_message(data, plan_id, delivery)
         elif data.kind == MessageKind.COMMAND:
-            result = self.handle_command_message(data)
+            result = self.handle_command_message(data, plan_id)
         else:
             if data.kind != MessageKind.NOOP:
                 self.logger.error("The message kind %s could not be solved", data.kind)
             result = Errors.TYPE_ERROR
 
         return result
+
+    def handle_many(
+        self,
+        items: Iterable[ClassificationResult],
+        plan_id: int = DEFAULT_PLAN_ID,
+        deliveries: Iterable[Delivery | None] | None = None,
+    ) -> list[Errors | ProgressSummary]:
+        """
+        handle_message 를 여러 개 한 번에. 결과는 넣은 순서대로.
+        - 기록 메시지는 모아뒀다가 repo.post_progress_batch 로 한 트랜잭션에 기록
+        - 명령 메시지가 나오면 그 앞까지 모은 기록을 먼저 넣고 처리해서,
+          하나씩 보냈을 때랑 같은 결과가 나옴
+        - deliveries 는 items 랑 같은 순서의 delivery (handle_message 참고)
+        """
+        results: list[Errors | ProgressSummary | None] = []
+        pending: list[tuple[int, ClassificationResult, Delivery | None]] = []
+        current_day = self._current_day(plan_id)
+        if current_day is None:
+            return [Errors.UNKNOWN_PLAN for _ in items]
+
+        def flush() -> None:
+            if not pending:
+                return
+            posted = self.repo.post_progress_batch(
+                ((data.sender, data.raw, data.days) for _, data, _ in pending),
+                plan_id,
+                [delivery for _, _, delivery in pending],
+            )
+            for n, (i, _, _) in enumerate(pending):
+                results[i] = posted if isinstance(posted, Errors) else posted[n].status
+            pending.clear()
+
+        items = list(items)
+        deliveries = [None] * len(items) if deliveries is None else list(deliveries)
+        for data, delivery in zip(items, deliveries):
+            results.append(None)
+            if data.kind == MessageKind.RECORD:
+                error = self._check_record(data, current_day)
+                if error is not None:
+                    results[-1] = error
+                else:
+                    pending.append((len(results) - 1, data, delivery))
+            elif data.kind == MessageKind.COMMAND:
+                flush()
+                results[-1] = self.handle_command_message(data, plan_id)
+            else:
+                results[-1] = self.handle_message(data, plan_id)
+
+        flush()
+        return results
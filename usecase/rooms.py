@@ -0,0 +1,161 @@
+# usecase/rooms.py
+
+import logging
+import threading
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from db.repository import Repository
+
+from utilities import AbsoluteDayCounter
+from utilities import set_logger
+
+from .message_handler import MessageHandler
+from .deduplicator import DeliveryDeduplicator
+
+
+class UnknownRoomError(LookupError):
+    """ROOMS 설정에 없는 방"""
+
+
+class Room:
+    """
+    단톡방 하나 몫. 방마다 sqlite 파일, 일차 계산기, 재전송 기록이 따로 있음.
+    users / evicted 는 RoomRegistry 가 관리함.
+    """
+
+    def __init__(
+        self,
+        room_id: str,
+        repo: Repository,
+        clock: AbsoluteDayCounter,
+        handler: MessageHandler,
+        dedup: DeliveryDeduplicator | None = None,
+    ) -> None:
+        self.room_id = room_id
+        self.repo = repo
+        self.clock = clock
+        self.handler = handler
+        self.dedup = dedup
+        self.users = 0
+        self.evicted = False
+
+    def close(self) -> None:
+        self.repo.close()
+
+
+class RoomRegistry:
+    """
+    room_id -> Room 을 필요할 때 열고 최근에 쓴 max_open 개만 열어두는 LRU.
+    - open_room(room_id): Room 을 만드는 함수. 모르는 방이면 UnknownRoomError
+      (그 밖의 예외는 그대로 올라감)
+    - with registry.room(room_id) as room: ... 으로 빌려 씀
+    - 밀려난 방은 빌려 쓰는 요청이 다 끝난 다음에 close (커넥션/writer 정리)
+    - 방 여는 동안(마이그레이션 등)은 그 방만 기다리고 다른 방은 안 막힘
+    """
+
+    def __init__(self, open_room: Callable[[str], Room], max_open: int = 16) -> None:
+        if max_open < 1:
+            raise ValueError(f"max_open must be >= 1, got {max_open}")
+
+        self._open_room = open_room
+        self.max_open = max_open
+        self.opened = 0
+        self.evictions = 0
+        self._rooms: OrderedDict[str, Room] = OrderedDict()
+        self._opening: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.logger: logging.Logger = set_logger(
+            "rooms", s=True, level=logging.WARNING
+        )
+
+    def _hit(self, room_id: str) -> Room | None:
+        # self._lock 잡고 부를 것
+        room = self._rooms.get(room_id)
+        if room is not None:
+            self._rooms.move_to_end(room_id)
+            room.users += 1
+        return room
+
+    def _acquire(self, room_id: str) -> Room:
+        with self._lock:
+            room = self._hit(room_id)
+            if room is not None:
+                return room
+            opening = self._opening.setdefault(room_id, threading.Lock())
+
+        # 같은 방을 동시에 두 번 열지 않게 방마다 따로 잠금
+        with opening:
+            with self._lock:
+                room = self._hit(room_id)
+                if room is not None:
+                    return room
+
+            try:
+                room = self._open_room(room_id)
+            except BaseException:
+                with self._lock:
+                    self._opening.pop(room_id, None)
+                raise
+
+            to_close = []
+            # _rooms 에 넣는 거랑 _opening 에서 빼는 걸 한 번에 해야
+            # 그 사이에 들어온 요청이 같은 방을 또 열지 않음
+            with self._lock:
+                room.users += 1
+                self._rooms[room_id] = room
+                self._opening.pop(room_id, None)
+                self.opened += 1
+                while len(self._rooms) > self.max_open:
+                    _, old = self._rooms.popitem(last=False)
+                    old.evicted = True
+                    self.evictions += 1
+                    if old.users == 0:
+                        to_close.append(old)
+
+        self.logger.info("Opened room:%s", room_id)
+        for old in to_close:
+            self.logger.info("Closed room:%s", old.room_id)
+            old.close()
+        return room
+
+    def _release(self, room: Room) -> None:
+        with self._lock:
+            room.users -= 1
+            close = room.evicted and room.users == 0
+        if close:
+            room.close()
+
+    @contextmanager
+    def room(self, room_id: str) -> Iterator[Room]:
+        room = self._acquire(room_id)
+        try:
+            yield room
+        finally:
+            self._release(room)
+
+    def open_rooms(self) -> list[str]:
+        with self._lock:
+            return list(self._rooms)
+
+    def close(self) -> None:
+        """서버 내려갈 때. 열려 있는 방 전부 닫음"""
+        with self._lock:
+            rooms = list(self._rooms.values())
+            self._rooms.clear()
+            for room in rooms:
+                room.evicted = True
+        for room in rooms:
+            if room.users == 0:
+                room.close()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "open": len(self._rooms),
+                "maxsize": self.max_open,
+                "opened": self.opened,
+                "evictions": self.evictions,
+            }
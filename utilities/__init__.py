@@ -1,6 +1,13 @@
 from .utils import set_logger
+from .logs import configure_logging, shutdown_logging
 from .utils import is_valid_command
 
 from .clock import AbsoluteDayCounter
 
 from .day_parser import DayParser
+
+from .day_ranges import missing_spans, expand_spans, compress_spans, spans_of
+
+from .lru import LRUCache
+
+from .metrics import Metrics
@@ -1,23 +1,74 @@
+import time
+import threading
 from datetime import datetime, date, timezone, timedelta
+from typing import Callable
+
+RolloverHook = Callable[[int], None]
 
 
 class AbsoluteDayCounter:
-    def __init__(self, start_date: date, tz_offset_hours: int = 9):
+    def __init__(
+        self,
+        start_date: date,
+        tz_offset_hours: int = 9,
+        now: Callable[[], float] = time.time,
+    ):
         """
         start_date: 기준 시작일 (예: date(2025, 1, 1))
         tz_offset_hours: 한국은 UTC+9, 러시아는 UTC+3 등
+        now: 현재 시각(epoch 초)을 돌려주는 함수. 테스트에서 바꿔 끼울 수 있음
         """
         self.start_date = start_date
         self.tz = timezone(timedelta(hours=tz_offset_hours))
+        self._now = now
+
+        # 오늘 일차랑 다음 자정(epoch 초)을 들고 있다가 자정 지나기 전엔 비교만 함
+        self._day = 0
+        self._next_rollover = float("-inf")
+        self._hooks: list[RolloverHook] = []
+        self._lock = threading.Lock()
 
     def _today(self) -> date:
         """온라인 절대 날짜 (UTC 기반 + 오프셋 반영)"""
-        return datetime.now(self.tz).date()
+        return datetime.fromtimestamp(self._now(), self.tz).date()
+
+    def on_rollover(self, hook: RolloverHook) -> None:
+        """
+        자정이 지나서 일차가 바뀌면 hook(새 일차) 를 부름. 캐시 비우기 같은 데 씀.
+        """
+        self._hooks.append(hook)
+
+    def _refresh(self, now: float) -> int:
+        with self._lock:
+            if now < self._next_rollover:
+                return self._day
+
+            today = datetime.fromtimestamp(now, self.tz).date()
+            next_midnight = datetime.combine(
+                today + timedelta(days=1), datetime.min.time(), tzinfo=self.tz
+            )
+            previous = self._day
+            self._day = (today - self.start_date).days + 1
+            self._next_rollover = next_midnight.timestamp()
+            day = self._day
+
+        # 처음 계산할 땐 안 부름
+        if previous and previous != day:
+            for hook in self._hooks:
+                hook(day)
+        return day
 
     def current_day(self) -> int:
         """
         오늘이 시작일부터 몇 번째 날인지 계산
         Day 1 = start_date
         """
-        delta = self._today() - self.start_date
-        return delta.days + 1  # 첫 날을 1로 두기 위해 +1
+        now = self._now()
+        if now < self._next_rollover:
+            return self._day
+        return self._refresh(now)
+
+    def next_rollover(self) -> float:
+        """다음 자정 (epoch 초)"""
+        self.current_day()
+        return self._next_rollover
@@ -3,12 +3,31 @@
 from __future__ import annotations
 
 import re
+import bisect
 from dataclasses import dataclass
 from typing import Callable, List, Pattern, Match
 
+from .lru import LRUCache
+
 DayList = List[int]
 ParseFn = Callable[[Match[str]], DayList]
 
+# 기본 룰은 전부 완료/클리어 중 하나 + 숫자가 있어야 매칭됨
+_DIGIT = re.compile(r"\d")
+
+# 토크나이저용 조각들. 기본 룰 mixed 의 목록 부분을 토막 하나씩 그대로 옮긴 거라
+# 한 번 match 할 때 되돌아갈 일이 없음
+_FIRST_ITEM = re.compile(r"(\d+)(?:\s*[-~]\s*(\d+))?")
+_NEXT_ITEM = re.compile(r"\s*,\s*(\d+)(?:\s*[-~]\s*(\d+))?")
+_SPACES = re.compile(r"\s*")
+# 완료 앞의 [^\n\r]*? 는 이 두 글자에서 끊김
+_LINE_BREAK = re.compile(r"[\r\n]")
+_KEYWORDS = ("완료", "클리어")
+
+# 일차 숫자는 길어야 6자리. 이보다 긴 숫자는 기록이 아님
+# (그리고 int() 는 4300 자리 넘으면 ValueError)
+_MAX_DAY_DIGITS = 6
+
 
 @dataclass(frozen=True)
 class DayParseRule:
@@ -50,6 +69,90 @@ def _handle_list(match: Match[str]) -> DayList:
     return result
 
 
+class _Lines:
+    """
+    "pos 부터 줄이 끝나기 전에 완료/클리어 가 있나" 를 줄마다 한 번만 찾아서 답해줌.
+    줄 끝 위치는 처음에 한 번 다 모아두고 bisect.
+    """
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.ends = [m.start() for m in _LINE_BREAK.finditer(text)]
+        self.ends.append(len(text))
+        # 줄 번호 -> 그 줄의 마지막 키워드 시작 위치 (없으면 -1)
+        self._last: dict[int, int] = {}
+
+    def keyword_after(self, pos: int) -> bool:
+        line = bisect.bisect_left(self.ends, pos)
+        last = self._last.get(line)
+        if last is None:
+            start = self.ends[line - 1] + 1 if line else 0
+            end = self.ends[line]
+            last = max(self.text.rfind(k, start, end) for k in _KEYWORDS)
+            self._last[line] = last
+        return last >= pos
+
+
+def _scan_days(text: str, max_days: int) -> DayList:
+    """
+    기본 룰(mixed_days_complete)이랑 같은 결과를 정규식 백트래킹 없이 내는 토크나이저.
+    - 숫자에서 시작해서 "N", "N-M", "N~M" 을 쉼표로 이어진 만큼 읽음 (줄바꿈 넘어도 됨)
+    - 거기서 끝난 위치 뒤 같은 줄에 완료/클리어 가 있거나,
+      공백 + "일차" 뒤 같은 줄에 있으면 그 목록이 답
+    - 아니면 다음 숫자부터 다시. 목록 안의 숫자에서 시작해도 끝나는 자리가 같아서
+      (마지막 구간의 끝 숫자만 빼고) 건너뜀
+    - 결과가 max_days 개를 넘으면 (1-99999999 같은 거) 기록이 아닌 걸로 보고 []
+    - _MAX_DAY_DIGITS 자리 넘는 숫자가 나와도 []
+    모든 글자를 상수 번만 보므로 입력 길이에 선형 (줄 찾기만 log).
+    """
+    lines = _Lines(text)
+    pos = 0
+    while True:
+        digit = _DIGIT.search(text, pos)
+        if digit is None:
+            return []
+
+        items = [_FIRST_ITEM.match(text, digit.start())]
+        while True:
+            item = _NEXT_ITEM.match(text, items[-1].end())
+            if item is None:
+                break
+            items.append(item)
+        end = items[-1].end()
+
+        found = lines.keyword_after(end)
+        if not found:
+            after = _SPACES.match(text, end).end()
+            found = text.startswith("일차", after) and lines.keyword_after(after + 2)
+        if found:
+            return _items_to_days(items, max_days)
+
+        # "1-2-3" 처럼 마지막 구간 끝 숫자에서 시작하면 더 길게 읽힐 수 있음
+        last = items[-1]
+        if last.group(2) is not None:
+            pos = last.start(2)
+        else:
+            pos = end
+
+
+def _items_to_days(items: list[Match[str]], max_days: int) -> DayList:
+    result: DayList = []
+    for item in items:
+        first, second = item.group(1), item.group(2)
+        if len(first) > _MAX_DAY_DIGITS or (
+            second is not None and len(second) > _MAX_DAY_DIGITS
+        ):
+            return []
+        start = int(first)
+        end = int(second) if second is not None else start
+        if start > end:
+            start, end = end, start
+        if len(result) + (end - start + 1) > max_days:
+            return []
+        result.extend(range(start, end + 1))
+    return result
+
+
 def _handle_mixed(match: Match[str]) -> DayList:
     """
     "332, 334-339, 341" / "1-3, 5" 같이
@@ -89,16 +192,73 @@ class DayParser:
     [N, ..., M] 리스트로 반환하는 파서.
     """
 
-    def __init__(self, rules: List[DayParseRule] | None = None) -> None:
+    def __init__(
+        self,
+        rules: List[DayParseRule] | None = None,
+        max_days: int = 10000,
+        cache_size: int = 0,
+        cache_max_len: int = 256,
+    ) -> None:
+        """
+        cache_size: 0 보다 크면 parse 결과를 메시지 텍스트 기준 LRU 에 들고 있음.
+            "1일차 완료" 같은 게 하루에 수백 번 들어오니까.
+            룰은 parser 마다 고정이라 캐시도 parser 마다 따로 둠.
+        cache_max_len: 이보다 긴 텍스트는 캐시 안 함 (붙여넣은 본문 같은 거)
+        """
         # 사용자가 커스텀 룰을 넣을 수도 있고,
         # 안 넣으면 기본 룰을 사용.
         self._rules: List[DayParseRule] = rules or self._default_rules()
+        # 기본 룰일 때만 빠른 경로를 씀. 커스텀 룰은 뭘 요구할지 모르니 그대로.
+        self._fast = not rules
+        # 메시지 하나에서 나올 수 있는 최대 일차 수 (빠른 경로에서만)
+        self.max_days = max_days
+
+        self._cache = LRUCache(cache_size) if cache_size > 0 else None
+        self.cache_max_len = cache_max_len
 
     def parse(self, text: str) -> DayList:
         """
         매칭되면 해당 룰의 handler 결과를 리턴,
         아무 것도 매칭 안 되면 [] 리턴.
+
+        기본 룰이면 빠른 경로:
+        1) 완료/클리어 가 없거나 숫자가 없으면 바로 [] (단톡 대부분이 여기서 끝남)
+        2) 기본 룰 4개 중 mixed 가 나머지 셋이 매칭하는 건 전부 매칭하고 맨 앞에 있어서,
+           룰 순서대로 돌린 결과는 항상 mixed 결과랑 같음. 그 mixed 를 정규식 대신
+           _scan_days 로 돌려서, 숫자랑 쉼표만 잔뜩 붙여넣은 메시지에도 선형 시간.
+        cache_size 를 줬으면 그 다음에 캐시를 봄.
         """
+        if self._fast:
+            # 단톡 대부분은 여기서 끝나니까 캐시 보기 전에 먼저 거름
+            if "완료" not in text and "클리어" not in text:
+                return []
+            if _DIGIT.search(text) is None:
+                return []
+
+        if self._cache is None or len(text) > self.cache_max_len:
+            return self._parse_uncached(text)
+
+        days = self._cache.get(text)
+        if days is None:
+            days = tuple(self._parse_uncached(text))
+            self._cache.put(text, days)
+        # 받은 쪽에서 리스트를 고쳐도 캐시는 그대로
+        return list(days)
+
+    def _parse_uncached(self, text: str) -> DayList:
+        if self._fast:
+            return _scan_days(text, self.max_days)
+        return self._parse_rules(text)
+
+    def cache_stats(self) -> dict[str, int] | None:
+        """캐시 안 쓰면 None"""
+        return self._cache.stats() if self._cache is not None else None
+
+    def clear_cache(self) -> None:
+        if self._cache is not None:
+            self._cache.clear()
+
+    def _parse_rules(self, text: str) -> DayList:
         for rule in self._rules:
             m = rule.pattern.search(text)
             if m:
@@ -112,13 +272,17 @@ class DayParser:
         여기만 수정하면 패턴을 쉽게 추가/변경 가능.
         - 완료/클리어 둘 다 허용
         - '일차'와 완료 단어 사이에 임의 텍스트 허용
+        - 숫자 목록이랑 일차 앞 공백은 줄바꿈을 넘어도 됨. 완료 앞 텍스트만 한 줄 안
+        - 바꾸면 빠른 경로(_scan_days)도 같이 고치고
+          tests/test_day_parser_fast_path.py 로 결과가 같은지 확인할 것
+        기본 DayParser 는 이 정규식들을 직접 돌리지 않음 (parse 참고).
         """
         return [
             # 혼합 패턴: 332, 334-339, 341(일차) 완료 / 1-3, 5(일차) 완료 등
             DayParseRule(
                 name="mixed_days_complete",
                 pattern=re.compile(
-                    r"((?:\d+(?:\s*[-~]\s*\d+)?)(?:\s*,\s*\d+(?:\s*[-~]\s*\d+)?)*?)"
+                    r"((?:\d+(?:\s*[-~]\s*\d+)?)(?:\s*,\s*\d+(?:\s*[-~]\s*\d+)?)*)"
                     r"(?:\s*일차)?(?:[^\n\r]*?)(?:완료|클리어)"
                 ),
                 handler=_handle_mixed,
@@ -0,0 +1,60 @@
+# utilities/day_ranges.py
+
+from typing import Iterable
+
+DaySpan = tuple[int, int]
+
+
+def missing_spans(done_days: Iterable[int], max_day: int) -> list[DaySpan]:
+    """
+    오름차순으로 정렬된 완료 일차들과 1..max_day 를 한 번 훑어서(sorted-merge)
+    빠진 구간들을 [(시작, 끝), ...] 으로 돌려줌. 중복이나 범위 밖 일차는 무시.
+    """
+    spans: list[DaySpan] = []
+    expected = 1
+
+    for day in done_days:
+        if day > max_day:
+            break
+        if day < expected:
+            continue
+        if day > expected:
+            spans.append((expected, day - 1))
+        expected = day + 1
+
+    if expected <= max_day:
+        spans.append((expected, max_day))
+
+    return spans
+
+
+def expand_spans(spans: Iterable[DaySpan]) -> list[int]:
+    days: list[int] = []
+    for start, end in spans:
+        days.extend(range(start, end + 1))
+    return days
+
+
+def compress_spans(spans: list[DaySpan]) -> list[tuple[int, ...]]:
+    """
+    Formatter 가 쓰는 모양으로 바꿈: 한 일차짜리는 (d,), 구간은 (시작, 끝).
+    빠진 날이 전부 합쳐 3개 미만이면 구간이어도 하나씩 풀어서 (d,) 로.
+    """
+    total = sum(end - start + 1 for start, end in spans)
+    if total < 3:
+        return [(d,) for d in expand_spans(spans)]
+
+    return [(start,) if start == end else (start, end) for start, end in spans]
+
+
+def spans_of(days: Iterable[int]) -> list[DaySpan]:
+    """
+    일차 리스트(순서/중복 상관없음)를 연속 구간들로 묶음.
+    """
+    spans: list[DaySpan] = []
+    for day in sorted(set(days)):
+        if spans and day == spans[-1][1] + 1:
+            spans[-1] = (spans[-1][0], day)
+        else:
+            spans.append((day, day))
+    return spans
@@ -0,0 +1,176 @@
+# utilities/logs.py
+
+import os
+import queue
+import atexit
+import logging
+import threading
+
+from dataclasses import dataclass, field
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+_FORMAT = "%(asctime)s\t%(levelname)-8s\t%(name)-12s\t%(message)s"
+
+
+@dataclass
+class LogSettings:
+    """
+    configure_logging 으로 바꾸는 전역 설정. set_logger 가 로거 만들 때 읽음.
+    - levels: {"classifier": "DEBUG", "db": logging.INFO} 처럼 로거별 레벨.
+      있으면 코드에서 넘긴 level 보다 우선
+    - sample_rates: {"classifier": 0.01} 이면 classifier 의 DEBUG 로그는 100개 중 1개만
+    - max_bytes / backup_count: 로그 파일이 max_bytes 넘으면 .1, .2 ... 로 돌림
+    - queue_size: 로그 큐 크기. 꽉 차면 기다리지 않고 버림 (dropped 로 셈)
+    """
+
+    log_dir: str = "./logs"
+    levels: dict[str, int | str] = field(default_factory=dict)
+    sample_rates: dict[str, float] = field(default_factory=dict)
+    max_bytes: int = 10 * 1024 * 1024
+    backup_count: int = 5
+    queue_size: int = 10000
+
+
+_settings = LogSettings()
+_listeners: dict[str, QueueListener] = {}
+_lock = threading.Lock()
+
+
+def configure_logging(**kwargs) -> LogSettings:
+    """
+    LogSettings 필드를 덮어씀. 로거 만들기 전에 (create_flask_app 맨 앞에서) 부를 것.
+    이미 만들어진 로거도 레벨은 바로 바뀜.
+    """
+    global _settings
+    _settings = LogSettings(**{**_settings.__dict__, **kwargs})
+    for name, level in _settings.levels.items():
+        if name in _listeners:
+            logging.getLogger(name).setLevel(level)
+    return _settings
+
+
+class SamplingFilter(logging.Filter):
+    """
+    level 이하(기본 DEBUG) 로그는 rate 비율만 통과. 더 높은 레벨은 다 통과.
+    랜덤 대신 세어서 rate=0.01 이면 첫 줄부터 100개마다 1개.
+    """
+
+    def __init__(self, rate: float, level: int = logging.DEBUG) -> None:
+        super().__init__()
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self.level = level
+        self._count = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.level:
+            return True
+        if not self.every:
+            return False
+        self._count += 1
+        return self._count % self.every == 1 or self.every == 1
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    큐가 꽉 차면 요청 스레드를 막지 않고 그 로그는 버림.
+    같은 프로세스 안의 큐라서 record 를 pickle 할 일이 없으니, 메시지 포맷도
+    요청 스레드에서 미리 하지 않고 listener 에 그대로 넘김.
+    """
+
+    def __init__(self, q: queue.Queue) -> None:
+        super().__init__(q)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def set_logger(name: str, s: bool, level: int = logging.DEBUG) -> logging.Logger:
+    """
+    로거에는 QueueHandler 하나만 붙이고, 파일/콘솔 쓰기는 로거마다 하나씩 뜨는
+    QueueListener 스레드가 함. 요청 스레드는 큐에 넣기만 하고 바로 돌아감.
+    """
+    logger = logging.getLogger(name)
+    logger.setLevel(_settings.levels.get(name, level))
+
+    with _lock:
+        # 중복 핸들러 방지
+        if logger.handlers:
+            return logger
+
+        os.makedirs(_settings.log_dir, exist_ok=True)
+
+        # 1) FILE HANDLER (name.log, 크기 넘으면 돌림)
+        file_handler = RotatingFileHandler(
+            os.path.join(_settings.log_dir, f"{name}.log"),
+            maxBytes=_settings.max_bytes,
+            backupCount=_settings.backup_count,
+            encoding="utf-8",
+        )
+        file_handler.setFormatter(logging.Formatter(_FORMAT))
+        handlers: list[logging.Handler] = [file_handler]
+
+        # 2) STREAM HANDLER(s=True일 때만)
+        if s:
+            stream_handler = logging.StreamHandler()
+            stream_handler.setFormatter(logging.Formatter("[STDOUT] " + _FORMAT))
+            handlers.append(stream_handler)
+
+        q: queue.Queue = queue.Queue(maxsize=_settings.queue_size)
+        queue_handler = DroppingQueueHandler(q)
+        rate = _settings.sample_rates.get(name)
+        if rate is not None and rate < 1.0:
+            queue_handler.addFilter(SamplingFilter(rate))
+        logger.addHandler(queue_handler)
+
+        listener = QueueListener(q, *handlers)
+        listener.start()
+        _listeners[name] = listener
+
+        # 자녀 로거가 부모로 전달되는 것 방지 (필요하면 켜기)
+        logger.propagate = False
+
+    return logger
+
+
+def _restart_after_fork() -> None:
+    """
+    fork 된 자식에선 listener 스레드가 없어서 큐에 쌓이기만 함. 자식 쪽에
+    큐/listener 를 새로 만들어 붙임 (부모 큐에 남은 로그는 부모가 씀).
+    """
+    global _lock
+    _lock = threading.Lock()
+    for name, old in list(_listeners.items()):
+        q: queue.Queue = queue.Queue(maxsize=_settings.queue_size)
+        for handler in logging.getLogger(name).handlers:
+            if isinstance(handler, QueueHandler):
+                handler.queue = q
+        listener = QueueListener(q, *old.handlers)
+        listener.start()
+        _listeners[name] = listener
+
+
+def shutdown_logging() -> None:
+    """
+    큐에 남은 로그를 다 쓰고 listener 스레드들을 멈춤. 프로세스 끝날 때 자동으로 불림.
+    다시 set_logger 하면 새로 만듦.
+    """
+    with _lock:
+        for name, listener in list(_listeners.items()):
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+            logger = logging.getLogger(name)
+            for handler in list(logger.handlers):
+                logger.removeHandler(handler)
+        _listeners.clear()
+
+
+atexit.register(shutdown_logging)
+os.register_at_fork(after_in_child=_restart_after_fork)
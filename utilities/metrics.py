@@ -0,0 +1,200 @@
+# utilities/metrics.py
+
+import time
+import threading
+
+from bisect import bisect_left
+
+# 초 단위. 파싱은 수십 µs, DB 는 ms 단위라 둘 다 보이게
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, size: int) -> None:
+        self.counts = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+
+class _Timer:
+    # contextmanager 제너레이터보다 가벼운 with 용 객체
+    __slots__ = ("_metrics", "_name", "_key", "_start")
+
+    def __init__(self, metrics: "Metrics", name: str, key: "Labels") -> None:
+        self._metrics = metrics
+        self._name = name
+        self._key = key
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc) -> bool:
+        self._metrics._observe(self._name, self._key, time.perf_counter() - self._start)
+        return False
+
+
+class _NoopTimer:
+    # enabled=False 일 때 timer() 가 돌려주는 것. 아무것도 안 함
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+_NOOP = _NoopTimer()
+
+
+def _labels(labels: dict[str, object]) -> Labels:
+    # 라벨 하나짜리가 대부분이라 정렬은 건너뜀
+    if len(labels) == 1:
+        for k, v in labels.items():
+            return ((k, str(v)),)
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    # 큰 카운터가 1.23457e+06 처럼 잘리지 않게
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels: Labels, extra: str = "") -> str:
+    parts = [f'{k}="{_escape(v)}"' for k, v in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Metrics:
+    """
+    프로세스 안에서 세는 카운터/히스토그램 모음. GET /metrics 에서 Prometheus
+    텍스트로 내보냄.
+    - inc("messages_total", kind="RECORD")
+    - observe("stage_seconds", 0.0012, stage="classify")
+    - with timer("db_query_seconds", op="get_progress"): ...
+    - set_gauge("cache_entries", 12, cache="progress")  (마지막 값만 남음)
+    enabled=False 면 전부 바로 돌아감 (timer 는 미리 만들어둔 no-op).
+    이름 앞에는 prefix 가 붙음.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+        prefix: str = "bible_",
+    ) -> None:
+        self.enabled = enabled
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+        self._counters: dict[str, dict[Labels, float]] = {}
+        self._gauges: dict[str, dict[Labels, float]] = {}
+        self._histograms: dict[str, dict[Labels, _Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, **labels: object) -> None:
+        if not self.enabled:
+            return
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: object) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._gauges.setdefault(name, {})[_labels(labels)] = value
+
+    def observe(self, name: str, seconds: float, **labels: object) -> None:
+        if not self.enabled:
+            return
+        self._observe(name, _labels(labels), seconds)
+
+    def _observe(self, name: str, key: Labels, seconds: float) -> None:
+        # le 는 "이하" 라서 bisect_left. 마지막 칸은 +Inf
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = _Histogram(len(self.buckets) + 1)
+            hist.counts[index] += 1
+            hist.sum += seconds
+            hist.count += 1
+
+    def timer(self, name: str, **labels: object) -> _Timer | _NoopTimer:
+        """with 블록 걸린 시간을 observe. perf_counter 라 시계 바뀌어도 안전"""
+        if not self.enabled:
+            return _NOOP
+        return _Timer(self, name, _labels(labels))
+
+    def counter_value(self, name: str, **labels: object) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(_labels(labels), 0)
+
+    def histogram_count(self, name: str, **labels: object) -> int:
+        with self._lock:
+            hist = self._histograms.get(name, {}).get(_labels(labels))
+            return hist.count if hist is not None else 0
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def render(self) -> str:
+        """Prometheus text format (0.0.4)"""
+        with self._lock:
+            counters = {n: dict(s) for n, s in self._counters.items()}
+            gauges = {n: dict(s) for n, s in self._gauges.items()}
+            histograms = {
+                n: {k: (list(h.counts), h.sum, h.count) for k, h in s.items()}
+                for n, s in self._histograms.items()
+            }
+
+        lines: list[str] = []
+        for kind, series in (("counter", counters), ("gauge", gauges)):
+            for name in sorted(series):
+                full = self.prefix + name
+                lines.append(f"# TYPE {full} {kind}")
+                for labels, value in sorted(series[name].items()):
+                    lines.append(f"{full}{_format_labels(labels)} {_number(value)}")
+
+        bounds = [f"{b:g}" for b in self.buckets] + ["+Inf"]
+        for name in sorted(histograms):
+            full = self.prefix + name
+            lines.append(f"# TYPE {full} histogram")
+            for labels, (counts, total, count) in sorted(histograms[name].items()):
+                cumulative = 0
+                for bound, n in zip(bounds, counts):
+                    cumulative += n
+                    le = _format_labels(labels, f'le="{bound}"')
+                    lines.append(f"{full}_bucket{le} {cumulative}")
+                lines.append(f"{full}_sum{_format_labels(labels)} {_number(total)}")
+                lines.append(f"{full}_count{_format_labels(labels)} {count}")
+
+        return "\n".join(lines) + "\n"
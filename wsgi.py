@@ -0,0 +1,16 @@
+# wsgi.py
+"""
+운영용 WSGI 진입점.
+
+    gunicorn -c gunicorn.conf.py wsgi:app      # 리눅스, 코어 수만큼 워커
+    waitress-serve --threads 8 --port 5000 wsgi:app   # 윈도우 등 (프로세스 하나)
+
+gunicorn.conf.py 가 BIBLE_PREFORK=1 을 켜 두면 워커 여러 개가 같은 DB 를 쓰는
+모드로 만듦. 그냥 waitress 로 띄우면 server.py 랑 같은 단일 프로세스 모드.
+"""
+
+import os
+
+from app import create_flask_app
+
+app = create_flask_app(prefork=os.environ.get("BIBLE_PREFORK") == "1")